@@ -1,11 +1,17 @@
 """Agent registry for creating and managing agent instances."""
 
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
 from agents.base_agent import BaseAgent
 from agents.data_agent import DataAgent
 from agents.analyst_agent import AnalystAgent
 from agents.summarizer_agent import SummarizerAgent
 from agents.general_agent import GeneralAgent
 from agents.moldable_agent import MoldableAgent
+from agents.radiology_agent import RadiologyAgent
 
 # Agent class registry mapping names to classes
 AGENT_REGISTRY = {
@@ -14,6 +20,7 @@ AGENT_REGISTRY = {
     "SummarizerAgent": SummarizerAgent,
     "GeneralAgent": GeneralAgent,
     "MoldableAgent": MoldableAgent,
+    "RadiologyAgent": RadiologyAgent,
 }
 
 # Alias mapping for flexible agent name resolution
@@ -26,6 +33,8 @@ AGENT_ALIASES = {
     "general": "GeneralAgent",
     "moldable": "MoldableAgent",
     "adaptive": "MoldableAgent",
+    "radiology": "RadiologyAgent",
+    "radiologist": "RadiologyAgent",
 }
 
 # Agent configuration: name -> (display_name, role_description)
@@ -35,8 +44,20 @@ AGENT_CONFIG = {
     "SummarizerAgent": ("SummarizerAgent", "Summarizer"),
     "GeneralAgent": ("GeneralAgent", "Generalist"),
     "MoldableAgent": ("MoldableAgent", "Adaptive"),
+    "RadiologyAgent": ("RadiologyAgent", "Radiologist"),
 }
 
+def resolve_agent_name(agent_name: str) -> str:
+    """Map a name or alias to its registry key; raises ValueError if unknown."""
+    normalized_name = AGENT_ALIASES.get(agent_name.lower(), agent_name)
+    if normalized_name not in AGENT_REGISTRY:
+        raise ValueError(
+            f"Unknown agent name: '{agent_name}'. "
+            f"Available agents: {list(AGENT_REGISTRY.keys())}"
+        )
+    return normalized_name
+
+
 def get_agent(agent_name: str, memory):
     """Return an initialized agent instance by name.
     
@@ -51,17 +72,109 @@ def get_agent(agent_name: str, memory):
         ValueError: If agent_name is not recognized
     """
     # Normalize agent name via alias mapping
-    normalized_name = AGENT_ALIASES.get(agent_name.lower(), agent_name)
-    
+    normalized_name = resolve_agent_name(agent_name)
+
     # Get agent class and configuration
-    if normalized_name not in AGENT_REGISTRY:
-        raise ValueError(
-            f"Unknown agent name: '{agent_name}'. "
-            f"Available agents: {list(AGENT_REGISTRY.keys())}"
-        )
-    
     agent_class = AGENT_REGISTRY[normalized_name]
     display_name, role = AGENT_CONFIG[normalized_name]
     
     # Instantiate and return agent
-    return agent_class(display_name, role, memory)
\ No newline at end of file
+    return agent_class(display_name, role, memory)
+
+
+class AgentPool:
+    """Reusable agent instances keyed by normalized agent name.
+
+    Instances are created lazily, up to `size` per type (`sizes` overrides
+    it per name or alias). checkout() hands out an idle instance, preferring
+    the most recently returned one so learned state (confidence, history)
+    concentrates in as few instances as possible, and blocks while every
+    instance of that type is busy. An instance is only ever held by one
+    task at a time, so agents need no locking of their own.
+    """
+
+    def __init__(self, memory, size: int = 4, sizes: dict = None, factory=get_agent):
+        if size <= 0:
+            raise ValueError("Pool size must be > 0")
+        self.memory = memory
+        self.size = size
+        self.sizes = {resolve_agent_name(k): v for k, v in (sizes or {}).items()}
+        self.factory = factory
+        self._cond = threading.Condition()
+        self._idle = defaultdict(list)
+        self._all = defaultdict(list)
+        self._checked_out = {}
+        self._created_at = time.perf_counter()
+        self._stats = defaultdict(lambda: {"checkouts": 0, "waits": 0, "timeouts": 0, "wait_s": 0.0, "busy_s": 0.0, "peak_in_use": 0})
+
+    def capacity(self, agent_name: str) -> int:
+        return self.sizes.get(resolve_agent_name(agent_name), self.size)
+
+    def checkout(self, agent_name: str, timeout: float = None):
+        """Return an idle instance of agent_name; raises TimeoutError if none frees up in time."""
+        name = resolve_agent_name(agent_name)
+        cap = self.sizes.get(name, self.size)
+        stats = self._stats[name]
+        start = time.perf_counter()
+        waited = False
+        with self._cond:
+            while not self._idle[name] and len(self._all[name]) >= cap:
+                waited = True
+                remaining = None if timeout is None else timeout - (time.perf_counter() - start)
+                if remaining is not None and remaining <= 0:
+                    stats["timeouts"] += 1
+                    raise TimeoutError(f"No idle {name} instance within {timeout}s")
+                self._cond.wait(remaining)
+            if self._idle[name]:
+                agent = self._idle[name].pop()
+            else:
+                agent = self.factory(name, self.memory)
+                self._all[name].append(agent)
+            now = time.perf_counter()
+            self._checked_out[id(agent)] = (name, now)
+            stats["checkouts"] += 1
+            if waited:
+                stats["waits"] += 1
+                stats["wait_s"] += now - start
+            in_use = len(self._all[name]) - len(self._idle[name])
+            stats["peak_in_use"] = max(stats["peak_in_use"], in_use)
+        return agent
+
+    def checkin(self, agent):
+        with self._cond:
+            entry = self._checked_out.pop(id(agent), None)
+            if entry is None:
+                raise ValueError(f"{agent!r} is not checked out from this pool")
+            name, since = entry
+            self._stats[name]["busy_s"] += time.perf_counter() - since
+            self._idle[name].append(agent)
+            self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, agent_name: str, timeout: float = None):
+        agent = self.checkout(agent_name, timeout)
+        try:
+            yield agent
+        finally:
+            self.checkin(agent)
+
+    def instances(self, agent_name: str) -> list:
+        """All instances created for agent_name (idle or not), for inspection."""
+        with self._cond:
+            return list(self._all[resolve_agent_name(agent_name)])
+
+    def utilization(self) -> dict:
+        """Per-type counters; utilization is busy time over capacity x pool lifetime."""
+        with self._cond:
+            elapsed = time.perf_counter() - self._created_at
+            out = {}
+            for name, stats in self._stats.items():
+                cap = self.sizes.get(name, self.size)
+                out[name] = {
+                    **stats,
+                    "created": len(self._all[name]),
+                    "in_use": len(self._all[name]) - len(self._idle[name]),
+                    "capacity": cap,
+                    "utilization": stats["busy_s"] / (cap * elapsed) if elapsed > 0 else 0.0,
+                }
+            return out
@@ -1,6 +1,7 @@
 import random
 from datetime import datetime, timezone
 from agents.base_agent import BaseAgent 
+from systems.tracing import get_tracer
 
 class AnalystAgent(BaseAgent):
     "Agent specializing in reasoning, pattern detection, and insight generation."
@@ -19,7 +20,7 @@ class AnalystAgent(BaseAgent):
         status = "derived insight" if success else "inconclusive result"
         confidence_change = 0.03 if success else -0.08
 
-        self.confidence = max(0.1, min(0.1, self.confidence + confidence_change))
+        self.confidence = max(0.1, min(1.0, self.confidence + confidence_change))
         result = (
             f"{self.name} ({self.role}) {status} for task: '{task}' "
             f"[confidence={self.confidence:.2f}]"
@@ -33,7 +34,7 @@ class AnalystAgent(BaseAgent):
         })
 
         self.reflect(result)
-        print(result)
+        get_tracer().log("{}", result, name="act", agent=self.name)
         return result
 
     def mold(self, feedback):
@@ -48,4 +49,4 @@ class AnalystAgent(BaseAgent):
             update = f"[{self.name}] No change to confidence ({self.confidence:.2f}). Feedback: {feedback}"
 
         self.memory.write(self.name, update)
-        print(update)
\ No newline at end of file
+        get_tracer().log("{}", update, name="mold", agent=self.name)
\ No newline at end of file
@@ -1,10 +1,18 @@
-from datetime import datetime, timezone
+import threading
+
 
 class BaseAgent:
+    # CPU-heavy agents set this so the Orchestrator runs them in worker processes (see systems/process_agents.py)
+    cpu_bound = False
+
     def __init__(self, name, role, memory):
         self.name = name
         self.role = role
         self.memory = memory
+        # Upstream outputs for the current task ({task: result}), set by AsyncRuntime.run_dag
+        self.inputs = {}
+        # Set by AsyncRuntime when the current task times out or is cancelled; long act()s should check it
+        self.cancelled = threading.Event()
 
     def act(self, task):
         """Perform the assigned task. Override this in subclasses."""
@@ -12,12 +20,8 @@ class BaseAgent:
 
     def reflect(self, result):
         """Store the result and metadata into shared memory."""
-        entry = {
-            "agent_id": self.name,
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "content": f"[{self.role}] {result}"
-        }
-        self.memory.write(self.name, entry["content"])
+        # SharedMemory.write stamps the time itself
+        self.memory.write(self.name, f"[{self.role}] {result}")
 
     def __repr__(self):
         return f"<Agent {self.name} ({self.role})>"
\ No newline at end of file
@@ -1,6 +1,7 @@
 from sqlite3.dbapi2 import Timestamp
 import time
 from agents.base_agent import BaseAgent
+from systems.tracing import get_tracer
 from datetime import datetime, timezone
 import random
 
@@ -35,7 +36,7 @@ class DataAgent(BaseAgent):
         })
 
         self.reflect(result)
-        print(result)
+        get_tracer().log("{}", result, name="act", agent=self.name)
         return result
 
     def mold(self, feedback):
@@ -50,4 +51,4 @@ class DataAgent(BaseAgent):
             update = f"[{self.name}] No confidence change ({self.confidence:.2f}). Feedback: {feedback}"
 
         self.memory.write(self.name, update)
-        print(update)
\ No newline at end of file
+        get_tracer().log("{}", update, name="mold", agent=self.name)
\ No newline at end of file
@@ -1,4 +1,5 @@
 from agents.base_agent import BaseAgent
+from systems.tracing import get_tracer
 from datetime import datetime, timezone
 
 class MoldableAgent(BaseAgent):
@@ -42,4 +43,4 @@ class MoldableAgent(BaseAgent):
             update = f"No change to confidence ({self.confidence:.2f}). Feedback: {feedback}"
         
         self.memory.write(self.name, update)
-        print(update)
\ No newline at end of file
+        get_tracer().log("{}", update, name="mold", agent=self.name)
\ No newline at end of file
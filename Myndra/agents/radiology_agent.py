@@ -0,0 +1,43 @@
+from agents.base_agent import BaseAgent
+
+
+def default_runners():
+    """The DenseNet pipelines, imported on first use so the registry does not pull in torch."""
+    from domains.radiology_pneumonia.pipeline import predict as predict_pneumonia
+    from domains.radiology_cardiomegaly.pipeline import predict as predict_cardiomegaly
+    return {"pneumonia": predict_pneumonia, "cardiomegaly": predict_cardiomegaly}
+
+
+class RadiologyAgent(BaseAgent):
+    """Runs a radiology pipeline on one image per task.
+
+    A task is {"analysis": "pneumonia" | "cardiomegaly", "image_path": str}
+    and returns that pipeline's report dict unchanged. `runners` maps
+    analysis names to callables taking an image path; the backend passes
+    its resource-accounted runners, the default is the domain pipelines.
+    """
+
+    # torch releases the GIL inside its kernels, so threads already overlap
+    # inference; MYNDRA_CPU_AGENTS=radiology moves it to worker processes
+    cpu_bound = False
+
+    def __init__(self, name, role, memory, runners=None):
+        super().__init__(name, role, memory)
+        self._runners = runners
+
+    @property
+    def runners(self):
+        if self._runners is None:
+            self._runners = default_runners()
+        return self._runners
+
+    def act(self, task):
+        if not isinstance(task, dict):
+            raise ValueError(f"RadiologyAgent needs an {{'analysis', 'image_path'}} task, got {task!r}")
+        analysis = task["analysis"]
+        run = self.runners.get(analysis)
+        if run is None:
+            raise ValueError(f"Unknown analysis '{analysis}'. Expected one of: {sorted(self.runners)}")
+        report = run(task["image_path"])
+        self.reflect(f"{analysis}: {report.get('diagnosis', 'Unknown')} (p={report.get('probability', 0.0):.2f})")
+        return report
@@ -1,32 +1,42 @@
 from agents.base_agent import BaseAgent
-from openai import OpenAI
+from systems.llm_client import LLMDeadlineExceeded, get_llm_client
+from systems.tracing import get_tracer
 import os
 
 class SummarizerAgent(BaseAgent):
-    def __init__(self, name, role, memory, use_llm=False):
+    def __init__(self, name, role, memory, use_llm=False, llm=None, deadline_s=None):
         super().__init__(name, role, memory)
         self.use_llm = use_llm
+        self.llm = None
         if use_llm:
-            self.client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+            # Shared pooled client; None when no API key is configured
+            self.llm = llm if llm is not None else get_llm_client()
             self.model = "gpt-5-mini"
+            env_deadline = os.getenv("MYNDRA_SUMMARIZER_DEADLINE_S")
+            self.deadline_s = deadline_s if deadline_s is not None else (float(env_deadline) if env_deadline else None)
     def act(self, task_results):
         """summarizes a list of task results into key insights. Each result is a dic
         with fields:{'agent': str, 'task': str, 'output': str}"""
 
+        summary = None
         if not task_results:
             summary = "No results available for summarization."
-        elif self.use_llm:
+        elif self.llm is not None:
             prompt = (
                 "You are a summarizer agent for a multi-agent orchestration system. "
                 "Given the list of task outputs below, synthesize the main outcomes, insights, and next actions.\n\n"
                 f"Results:\n{task_results}\n\nReturn a structured summary:"
             )
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            summary = response.choices[0].message.content.strip()
-        else:
+            try:
+                summary = self.llm.complete(
+                    [{"role": "user", "content": prompt}],
+                    model=self.model,
+                    deadline_s=self.deadline_s,
+                ).strip()
+            except LLMDeadlineExceeded as e:
+                # A slow completion must not stall the orchestration; use the local summary
+                get_tracer().log("[SummarizerAgent] {}; using the local summary", e, level="warning")
+        if summary is None:
             summary = (
                 f"[SummarizerAgent] Synthesized {len(task_results)} tasks into summary.\n"
                 "All agents completed tasks successfully.\n"
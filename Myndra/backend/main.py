@@ -1,7 +1,15 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi import FastAPI, UploadFile, File, HTTPException, Query, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from backend.schemas.responses import RadiologyReport
-from backend.services.myndra_runner import run_pneumonia, run_cardiomegaly, run_dual
+from backend.services.myndra_runner import (
+    run_pneumonia, run_cardiomegaly, run_dual, run_pneumonia_batch, run_cardiomegaly_batch,
+    resource_accountant,
+)
+from backend.services.inference_queue import InferenceQueue, Priority, parse_priority
+from backend.services.case_store import CaseStore
+from backend.services.orchestrated_runner import OrchestratedRunner
+from systems.tracing import get_tracer
 import os
 import tempfile
 import shutil
@@ -9,7 +17,8 @@ import uuid
 import time
 import threading
 from datetime import datetime
-from typing import Dict, List, Any
+from functools import partial
+from typing import Dict, List, Any, Optional
 
 app = FastAPI(title="Myndra Radiology API", version="1.0.0")
 
@@ -23,8 +32,7 @@ app.add_middleware(
 )
 
 # Thread-safe storage
-cases_db: Dict[str, Dict[str, Any]] = {}
-db_lock = threading.Lock()
+case_store = CaseStore()
 
 system_metrics = {
     "total_analyses": 0,
@@ -37,6 +45,34 @@ metrics_lock = threading.Lock()
 
 start_time = time.time()
 
+# direct calls the pipelines; orchestrated runs each analysis as a RadiologyAgent plan on AsyncRuntime
+BACKEND_MODE = os.getenv("MYNDRA_BACKEND_MODE", "direct").lower()
+if BACKEND_MODE == "orchestrated":
+    runner = OrchestratedRunner.from_env()
+    run_pneumonia, run_cardiomegaly, run_dual = runner.run_pneumonia, runner.run_cardiomegaly, runner.run_dual
+elif BACKEND_MODE != "direct":
+    raise ValueError(f"Unknown MYNDRA_BACKEND_MODE '{BACKEND_MODE}'. Expected one of: direct, orchestrated")
+
+# Inference admission: STAT requests jump queued routine work, routine keeps a minimum share
+inference_queue = InferenceQueue(
+    workers=int(os.getenv("MYNDRA_INFERENCE_WORKERS", "1")),
+    routine_min_share=float(os.getenv("MYNDRA_ROUTINE_MIN_SHARE", "0.2")),
+    max_batch=int(os.getenv("MYNDRA_INFERENCE_MAX_BATCH", "1")),
+)
+if BACKEND_MODE == "orchestrated":
+    # Each queued case's task span lands in that case's trace, even inside a shared batch
+    for analysis in ("pneumonia", "cardiomegaly"):
+        inference_queue.register_batch_handler(analysis, partial(runner.run_jobs, analysis), pass_context=True)
+else:
+    inference_queue.register_batch_handler("pneumonia", run_pneumonia_batch)
+    inference_queue.register_batch_handler("cardiomegaly", run_cardiomegaly_batch)
+
+# Each analysis is one trace keyed by its case_id; /report reads it back while it is in the ring buffer
+tracer = get_tracer()
+
+# API keys whose requests default to STAT (comma-separated)
+STAT_API_KEYS = {k.strip() for k in os.getenv("MYNDRA_STAT_API_KEYS", "").split(",") if k.strip()}
+
 def _save_temp(upload: UploadFile) -> str:
     """Save uploaded file to temporary location."""
     fd, path = tempfile.mkstemp(suffix=os.path.splitext(upload.filename or '')[-1] or ".jpg")
@@ -44,18 +80,32 @@ def _save_temp(upload: UploadFile) -> str:
         shutil.copyfileobj(upload.file, f)
     return path
 
-def _store_case(case_id: str, analysis_type: str, result: Dict[str, Any], latency_ms: float):
+def _resolve_priority(priority: Optional[str], api_key: Optional[str]) -> Priority:
+    """Explicit ?priority= wins; otherwise STAT API keys map to STAT, everything else is routine."""
+    default = Priority.STAT if api_key and api_key in STAT_API_KEYS else Priority.ROUTINE
+    try:
+        return parse_priority(priority, default=default)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def _store_case(case_id: str, analysis_type: str, result: Dict[str, Any], latency_ms: float,
+                priority: Priority = Priority.ROUTINE):
     """Store case result and update metrics thread-safely."""
-    with db_lock:
-        cases_db[case_id] = {
-            "case_id": case_id,
-            "analysis_type": analysis_type,
-            "diagnosis": result.get("diagnosis", "Unknown"),
-            "probability": result.get("probability", 0.0),
-            "date": datetime.now().isoformat(),
-            "agent": "MyndraAI",  # Simplified agent name
-            "latency_ms": latency_ms
-        }
+    record = {
+        "case_id": case_id,
+        "analysis_type": analysis_type,
+        "diagnosis": result.get("diagnosis", "Unknown"),
+        "probability": result.get("probability", 0.0),
+        "date": datetime.now().isoformat(),
+        "agent": "RadiologyAgent" if BACKEND_MODE == "orchestrated" else "MyndraAI",
+        "latency_ms": latency_ms,
+        "priority": priority.value,
+    }
+    resources = result.pop("resources", None)
+    if resources:
+        record["resources"] = resources
+        resource_accountant.record(case_id, analysis_type, resources)
+    case_store.add(record)
     
     with metrics_lock:
         system_metrics["total_analyses"] += 1
@@ -80,130 +130,237 @@ async def system_status():
     system_metrics["uptime_seconds"] = int(time.time() - start_time)
     return {
         "status": "operational",
+        "mode": BACKEND_MODE,
         "metrics": system_metrics,
+        "inference_queue": inference_queue.stats(),
+        "resources": resource_accountant.summary(),
         "timestamp": datetime.utcnow().isoformat(),
     }
 
+def _case_filters(analysis_type, diagnosis, date_from, date_to) -> Dict[str, Optional[str]]:
+    return {"analysis_type": analysis_type, "diagnosis": diagnosis,
+            "date_from": date_from, "date_to": date_to}
+
 @app.get("/cases")
-async def get_cases() -> List[Dict[str, Any]]:
-    """Get all analysis cases."""
-    return list(cases_db.values())
+async def get_cases(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    analysis_type: Optional[str] = None,
+    diagnosis: Optional[str] = None,
+    date_from: Optional[str] = Query(None, description="ISO date or timestamp (inclusive)"),
+    date_to: Optional[str] = Query(None, description="ISO date or timestamp (inclusive)"),
+) -> Dict[str, Any]:
+    """Get one page of analysis cases, oldest first."""
+    if cursor is not None and not cursor.isdigit():
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return case_store.page(limit=limit, cursor=cursor,
+                           **_case_filters(analysis_type, diagnosis, date_from, date_to))
+
+@app.get("/cases/export")
+async def export_cases(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    analysis_type: Optional[str] = None,
+    diagnosis: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+):
+    """Stream all matching cases as NDJSON or CSV without materializing the full list."""
+    filters = _case_filters(analysis_type, diagnosis, date_from, date_to)
+    if format == "csv":
+        return StreamingResponse(case_store.export_csv(**filters), media_type="text/csv",
+                                 headers={"Content-Disposition": "attachment; filename=cases.csv"})
+    return StreamingResponse(case_store.export_ndjson(**filters), media_type="application/x-ndjson")
+
+@app.get("/stats")
+async def get_stats(
+    analysis_type: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+):
+    """Counts, positive rates and latency distributions per analysis type per day."""
+    return case_store.stats(analysis_type=analysis_type, date_from=date_from, date_to=date_to)
 
 @app.get("/report/{case_id}")
 async def get_report(case_id: str):
     """Get detailed report for a specific case."""
-    if case_id not in cases_db:
+    case = case_store.get(case_id)
+    if case is None:
         raise HTTPException(status_code=404, detail="Case not found")
-    
-    case = cases_db[case_id]
+
     return {
         **case,
-        "orchestrator_trace": [
-            {"step": "preprocess", "agent": "DataAgent", "status": "completed"},
-            {"step": "inference", "agent": case["agent"], "status": "completed"},
-            {"step": "postprocess", "agent": "SummarizerAgent", "status": "completed"},
-        ],
+        "orchestrator_trace": _trace_steps(case_id),
         "system_info": {
             "model": "DenseNet121",
             "framework": "torchxrayvision",
             "device": os.getenv("MYNDRA_DEVICE", "cpu"),
+            "resources": case.get("resources"),
         },
     }
 
+def _trace_steps(case_id: str) -> List[Dict[str, Any]]:
+    """The case's recorded spans in start order, timed relative to the first.
+
+    Empty once the case has been evicted from the tracer's ring buffer.
+    """
+    spans = [e for e in tracer.events(trace_id=case_id) if e["kind"] == "span"]
+    if not spans:
+        return []
+    spans.sort(key=lambda e: e["ts_ms"])
+    t0 = spans[0]["ts_ms"]
+    steps = []
+    for e in spans:
+        fields = dict(e.get("fields") or {})
+        steps.append({
+            "step": e["name"],
+            "span_id": e["span_id"],
+            "parent_id": e["parent_id"],
+            "status": fields.pop("status", "completed"),
+            "start_ms": e["ts_ms"] - t0,
+            "duration_ms": e["duration_ms"],
+            **fields,
+        })
+    return steps
+
+@app.get("/report/{case_id}/trace")
+async def get_report_trace(case_id: str):
+    """Chrome trace format (chrome://tracing, Perfetto) of one case's spans."""
+    trace = tracer.to_chrome(trace_id=case_id)
+    if not trace["traceEvents"]:
+        raise HTTPException(status_code=404, detail="No trace recorded for this case")
+    return trace
+
 @app.post("/analyze_pneumonia", response_model=RadiologyReport)
-async def analyze_pneumonia(file: UploadFile = File(...)):
+async def analyze_pneumonia(
+    file: UploadFile = File(...),
+    priority: Optional[str] = Query(None, description="stat or routine"),
+    x_api_key: Optional[str] = Header(None),
+):
     """Analyze chest X-ray for pneumonia."""
+    prio = _resolve_priority(priority, x_api_key)
     start = time.time()
-    path = _save_temp(file)
-    try:
-        system_metrics["total_analyses"] += 1
-        result = run_pneumonia(path)
-        latency_ms = (time.time() - start) * 1000
-        
-        case_id = str(uuid.uuid4())
-        result["case_id"] = case_id
-        _store_case(case_id, "pneumonia", result, latency_ms)
-        
-        system_metrics["successful_analyses"] += 1
-        # Update rolling average latency
-        total = system_metrics["total_analyses"]
-        system_metrics["avg_latency_ms"] = (
-            system_metrics["avg_latency_ms"] * (total - 1) + latency_ms
-        ) / total
-        
-        return result
-    except Exception as e:
-        system_metrics["failed_analyses"] += 1
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-    finally:
-        if os.path.exists(path):
-            os.remove(path)
+    case_id = str(uuid.uuid4())
+    with tracer.span("analyze", trace_id=case_id, analysis_type="pneumonia", priority=prio.value):
+        with tracer.span("save_upload"):
+            path = _save_temp(file)
+        try:
+            system_metrics["total_analyses"] += 1
+            with tracer.span("inference"):
+                result = await inference_queue.run(run_pneumonia, path, priority=prio, batch_key="pneumonia")
+            latency_ms = (time.time() - start) * 1000
+
+            result["case_id"] = case_id
+            with tracer.span("store_case"):
+                _store_case(case_id, "pneumonia", result, latency_ms, priority=prio)
+
+            system_metrics["successful_analyses"] += 1
+            # Update rolling average latency
+            total = system_metrics["total_analyses"]
+            system_metrics["avg_latency_ms"] = (
+                system_metrics["avg_latency_ms"] * (total - 1) + latency_ms
+            ) / total
+
+            return result
+        except Exception as e:
+            system_metrics["failed_analyses"] += 1
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
 
 @app.post("/analyze_cardiomegaly", response_model=RadiologyReport)
-async def analyze_cardiomegaly(file: UploadFile = File(...)):
+async def analyze_cardiomegaly(
+    file: UploadFile = File(...),
+    priority: Optional[str] = Query(None, description="stat or routine"),
+    x_api_key: Optional[str] = Header(None),
+):
     """Analyze chest X-ray for cardiomegaly (heart enlargement)."""
+    prio = _resolve_priority(priority, x_api_key)
     start = time.time()
-    path = _save_temp(file)
-    try:
-        system_metrics["total_analyses"] += 1
-        result = run_cardiomegaly(path)
-        latency_ms = (time.time() - start) * 1000
-        
-        case_id = str(uuid.uuid4())
-        result["case_id"] = case_id
-        _store_case(case_id, "cardiomegaly", result, latency_ms)
-        
-        system_metrics["successful_analyses"] += 1
-        total = system_metrics["total_analyses"]
-        system_metrics["avg_latency_ms"] = (
-            system_metrics["avg_latency_ms"] * (total - 1) + latency_ms
-        ) / total
-        
-        return result
-    except Exception as e:
-        system_metrics["failed_analyses"] += 1
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-    finally:
-        if os.path.exists(path):
-            os.remove(path)
+    case_id = str(uuid.uuid4())
+    with tracer.span("analyze", trace_id=case_id, analysis_type="cardiomegaly", priority=prio.value):
+        with tracer.span("save_upload"):
+            path = _save_temp(file)
+        try:
+            system_metrics["total_analyses"] += 1
+            with tracer.span("inference"):
+                result = await inference_queue.run(run_cardiomegaly, path, priority=prio, batch_key="cardiomegaly")
+            latency_ms = (time.time() - start) * 1000
+
+            result["case_id"] = case_id
+            with tracer.span("store_case"):
+                _store_case(case_id, "cardiomegaly", result, latency_ms, priority=prio)
+
+            system_metrics["successful_analyses"] += 1
+            total = system_metrics["total_analyses"]
+            system_metrics["avg_latency_ms"] = (
+                system_metrics["avg_latency_ms"] * (total - 1) + latency_ms
+            ) / total
+
+            return result
+        except Exception as e:
+            system_metrics["failed_analyses"] += 1
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
 
 @app.post("/analyze_heart", response_model=RadiologyReport)
-async def analyze_heart(file: UploadFile = File(...)):
+async def analyze_heart(
+    file: UploadFile = File(...),
+    priority: Optional[str] = Query(None, description="stat or routine"),
+    x_api_key: Optional[str] = Header(None),
+):
     """Alias for cardiomegaly analysis (for frontend compatibility)."""
-    return await analyze_cardiomegaly(file)
+    return await analyze_cardiomegaly(file, priority=priority, x_api_key=x_api_key)
 
 @app.post("/analyze_dual")
-async def analyze_dual(file: UploadFile = File(...)):
+async def analyze_dual(
+    file: UploadFile = File(...),
+    priority: Optional[str] = Query(None, description="stat or routine"),
+    x_api_key: Optional[str] = Header(None),
+):
     """Run both pneumonia and cardiomegaly analysis."""
+    prio = _resolve_priority(priority, x_api_key)
     start = time.time()
-    path = _save_temp(file)
-    try:
-        system_metrics["total_analyses"] += 1
-        result = run_dual(path)
-        latency_ms = (time.time() - start) * 1000
-        
-        case_id = str(uuid.uuid4())
-        result["case_id"] = case_id
-        # Store as dual analysis
-        cases_db[case_id] = {
-            "case_id": case_id,
-            "patient_id": f"P{len(cases_db) + 1:05d}",
-            "analysis_type": "dual",
-            "date": datetime.utcnow().isoformat(),
-            "result": result,
-            "latency_ms": latency_ms,
-        }
-        
-        system_metrics["successful_analyses"] += 1
-        total = system_metrics["total_analyses"]
-        system_metrics["avg_latency_ms"] = (
-            system_metrics["avg_latency_ms"] * (total - 1) + latency_ms
-        ) / total
-        
-        return result
-    except Exception as e:
-        system_metrics["failed_analyses"] += 1
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
-    finally:
-        if os.path.exists(path):
-            os.remove(path)
+    case_id = str(uuid.uuid4())
+    with tracer.span("analyze", trace_id=case_id, analysis_type="dual", priority=prio.value):
+        with tracer.span("save_upload"):
+            path = _save_temp(file)
+        try:
+            system_metrics["total_analyses"] += 1
+            with tracer.span("inference"):
+                result = await inference_queue.run(run_dual, path, priority=prio)
+            latency_ms = (time.time() - start) * 1000
+
+            result["case_id"] = case_id
+            with tracer.span("store_case"):
+                resources = result.pop("resources", None)
+                # Store as dual analysis
+                record = {
+                    "case_id": case_id,
+                    "patient_id": f"P{len(case_store) + 1:05d}",
+                    "analysis_type": "dual",
+                    "date": datetime.utcnow().isoformat(),
+                    "result": result,
+                    "latency_ms": latency_ms,
+                    "priority": prio.value,
+                }
+                if resources:
+                    record["resources"] = resources
+                    resource_accountant.record(case_id, "dual", resources)
+                case_store.add(record)
+
+            system_metrics["successful_analyses"] += 1
+            total = system_metrics["total_analyses"]
+            system_metrics["avg_latency_ms"] = (
+                system_metrics["avg_latency_ms"] * (total - 1) + latency_ms
+            ) / total
+
+            return result
+        except Exception as e:
+            system_metrics["failed_analyses"] += 1
+            raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        finally:
+            if os.path.exists(path):
+                os.remove(path)
@@ -0,0 +1,212 @@
+"""In-process case store with cursor pagination and incrementally maintained stats.
+
+Cases are kept in insertion order and addressed by a monotonically increasing
+sequence number, which doubles as the pagination cursor. Per-type sequence
+lists make type-filtered pages a bisect instead of a scan, and per
+(analysis_type, day) aggregates are updated as each case is added so /stats
+never walks the case list.
+"""
+
+import bisect
+import csv
+import io
+import json
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+NEGATIVE_DIAGNOSES = ("Normal", "Unknown")
+
+EXPORT_FIELDS = ("case_id", "analysis_type", "diagnosis", "probability", "date",
+                 "latency_ms", "priority", "agent")
+
+
+def _diagnoses(record: Dict[str, Any]) -> List[str]:
+    """Diagnoses carried by a case (dual cases carry one per sub-analysis)."""
+    if "diagnosis" in record:
+        return [record["diagnosis"]]
+    result = record.get("result") or {}
+    return [v["diagnosis"] for v in result.values() if isinstance(v, dict) and "diagnosis" in v]
+
+
+def _is_positive(record: Dict[str, Any]) -> bool:
+    return any(d not in NEGATIVE_DIAGNOSES for d in _diagnoses(record))
+
+
+def _flatten(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Single-row view of a case for CSV export."""
+    row = {k: record.get(k, "") for k in EXPORT_FIELDS}
+    if "diagnosis" not in record:
+        row["diagnosis"] = ";".join(_diagnoses(record))
+    return row
+
+
+class _Aggregate:
+    """Running counters for one (analysis_type, day) cell."""
+    __slots__ = ("count", "positives", "latency_sum", "latency_min", "latency_max", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.positives = 0
+        self.latency_sum = 0.0
+        self.latency_min = float("inf")
+        self.latency_max = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, positive: bool, latency_ms: float):
+        self.count += 1
+        self.positives += int(positive)
+        self.latency_sum += latency_ms
+        self.latency_min = min(self.latency_min, latency_ms)
+        self.latency_max = max(self.latency_max, latency_ms)
+        self.histogram[bisect.bisect_left(LATENCY_BUCKETS_MS, latency_ms)] += 1
+
+    def _quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile (capped at the observed max)."""
+        target = q * self.count
+        seen = 0
+        for i, n in enumerate(self.histogram):
+            seen += n
+            if n and seen >= target:
+                bound = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else self.latency_max
+                return min(bound, self.latency_max)
+        return self.latency_max
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "positives": self.positives,
+            "positive_rate": self.positives / self.count if self.count else 0.0,
+            "latency_ms": {
+                "avg": self.latency_sum / self.count if self.count else 0.0,
+                "min": self.latency_min if self.count else 0.0,
+                "max": self.latency_max,
+                "p50": self._quantile(0.50),
+                "p95": self._quantile(0.95),
+                "buckets": dict(zip([str(b) for b in LATENCY_BUCKETS_MS] + ["inf"], self.histogram)),
+            },
+        }
+
+
+class CaseStore:
+    """Thread-safe append-mostly case store."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._records: List[Dict[str, Any]] = []
+        self._seq_by_id: Dict[str, int] = {}
+        self._seqs_by_type: Dict[str, List[int]] = {}
+        self._aggregates: Dict[Tuple[str, str], _Aggregate] = {}
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __contains__(self, case_id: str) -> bool:
+        return case_id in self._seq_by_id
+
+    def add(self, record: Dict[str, Any]):
+        """Store a case record (must contain case_id, analysis_type, date, latency_ms)."""
+        with self._lock:
+            case_id = record["case_id"]
+            if case_id in self._seq_by_id:
+                # Replace in place; aggregates keep counting the first write
+                self._records[self._seq_by_id[case_id]] = record
+                return
+            seq = len(self._records)
+            self._records.append(record)
+            self._seq_by_id[case_id] = seq
+            self._seqs_by_type.setdefault(record["analysis_type"], []).append(seq)
+            key = (record["analysis_type"], str(record.get("date", ""))[:10])
+            agg = self._aggregates.get(key)
+            if agg is None:
+                agg = self._aggregates[key] = _Aggregate()
+            agg.add(_is_positive(record), float(record.get("latency_ms", 0.0)))
+
+    def get(self, case_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            seq = self._seq_by_id.get(case_id)
+            return self._records[seq] if seq is not None else None
+
+    # Querying
+
+    @staticmethod
+    def _matches(record, diagnosis, date_from, date_to) -> bool:
+        if diagnosis and diagnosis not in _diagnoses(record):
+            return False
+        date = str(record.get("date", ""))
+        # Prefix comparison lets callers pass either a day (YYYY-MM-DD) or a full timestamp
+        if date_from and date[:len(date_from)] < date_from:
+            return False
+        if date_to and date[:len(date_to)] > date_to:
+            return False
+        return True
+
+    def _scan(self, after: int, analysis_type: Optional[str], chunk: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Up to chunk (seq, record) pairs after seq `after`, optionally restricted to one type."""
+        with self._lock:
+            if analysis_type:
+                seqs = self._seqs_by_type.get(analysis_type, [])
+                start = bisect.bisect_right(seqs, after)
+                return [(s, self._records[s]) for s in seqs[start:start + chunk]]
+            start = after + 1
+            return list(enumerate(self._records[start:start + chunk], start))
+
+    def iter_cases(self, analysis_type: Optional[str] = None, diagnosis: Optional[str] = None,
+                   date_from: Optional[str] = None, date_to: Optional[str] = None,
+                   after: int = -1, chunk: int = 500) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Yield (seq, record) in insertion order, holding the lock only per chunk."""
+        while True:
+            batch = self._scan(after, analysis_type, chunk)
+            if not batch:
+                return
+            for seq, record in batch:
+                if self._matches(record, diagnosis, date_from, date_to):
+                    yield seq, record
+            after = batch[-1][0]
+
+    def page(self, limit: int = 100, cursor: Optional[str] = None, **filters) -> Dict[str, Any]:
+        """One page of matching cases plus the cursor for the next page (None when exhausted)."""
+        after = int(cursor) if cursor else -1
+        items, last = [], None
+        for seq, record in self.iter_cases(after=after, chunk=max(limit, 1), **filters):
+            if len(items) == limit:
+                return {"items": items, "next_cursor": str(last)}
+            items.append(record)
+            last = seq
+        return {"items": items, "next_cursor": None}
+
+    # Export
+
+    def export_ndjson(self, **filters) -> Iterator[str]:
+        for _, record in self.iter_cases(**filters):
+            yield json.dumps(record, default=str) + "\n"
+
+    def export_csv(self, **filters) -> Iterator[str]:
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=EXPORT_FIELDS)
+        writer.writeheader()
+        for _, record in self.iter_cases(**filters):
+            writer.writerow(_flatten(record))
+            if buf.tell() >= 64 * 1024:
+                yield buf.getvalue()
+                buf.seek(0)
+                buf.truncate()
+        yield buf.getvalue()
+
+    # Aggregates
+
+    def stats(self, analysis_type: Optional[str] = None, date_from: Optional[str] = None,
+              date_to: Optional[str] = None) -> Dict[str, Any]:
+        """Per analysis type, per day summaries from the running aggregates."""
+        with self._lock:
+            cells = [(k, a.summary()) for k, a in self._aggregates.items()]
+        out: Dict[str, Dict[str, Any]] = {}
+        for (atype, day), summary in sorted(cells):
+            if analysis_type and atype != analysis_type:
+                continue
+            if (date_from and day < date_from[:10]) or (date_to and day > date_to[:10]):
+                continue
+            out.setdefault(atype, {})[day] = summary
+        return {"total_cases": len(self), "by_type": out}
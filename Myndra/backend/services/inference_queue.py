@@ -0,0 +1,286 @@
+"""Priority-aware admission queue for radiology inference.
+
+Requests are tagged STAT or ROUTINE. Worker threads always serve queued STAT
+work first, but routine work is guaranteed a minimum share of dispatches while
+both classes are waiting, so a STAT burst can never starve it completely.
+
+Jobs that share a ``batch_key`` with a registered batch handler are pulled
+together (in the same priority order) and run through one batched call.
+Every job carries its submitter's contextvars (e.g. the open trace span): a
+job run on its own runs in them, and a handler registered with
+``pass_context=True`` receives each job's context next to its argument.
+"""
+
+import asyncio
+import contextvars
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+from enum import Enum
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+
+class Priority(str, Enum):
+    """Admission classes, highest priority first."""
+    STAT = "stat"
+    ROUTINE = "routine"
+
+
+def parse_priority(value: Optional[str], default: Priority = Priority.ROUTINE) -> Priority:
+    """Parse a priority name (case-insensitive); raises ValueError if unknown."""
+    if not value:
+        return default
+    try:
+        return Priority(value.strip().lower())
+    except ValueError:
+        choices = ", ".join(p.value for p in Priority)
+        raise ValueError(f"Unknown priority '{value}'. Expected one of: {choices}")
+
+
+class _Job:
+    __slots__ = ("fn", "arg", "priority", "batch_key", "future", "enqueued_at", "started_at", "context")
+
+    def __init__(self, fn, arg, priority, batch_key):
+        self.fn = fn
+        self.arg = arg
+        self.priority = priority
+        self.batch_key = batch_key
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+        self.started_at = 0.0
+        self.context = contextvars.copy_context()
+
+
+class _LatencyWindow:
+    """Bounded window of (wait_ms, total_ms) samples for one priority class."""
+
+    def __init__(self, size: int):
+        self.wait_ms: Deque[float] = deque(maxlen=size)
+        self.total_ms: Deque[float] = deque(maxlen=size)
+        self.completed = 0
+        self.failed = 0
+
+    @staticmethod
+    def _pct(values: List[float], q: float) -> float:
+        if not values:
+            return 0.0
+        values = sorted(values)
+        idx = min(len(values) - 1, int(round(q * (len(values) - 1))))
+        return values[idx]
+
+    def summary(self) -> Dict[str, Any]:
+        out: Dict[str, Any] = {"completed": self.completed, "failed": self.failed}
+        for name, window in (("wait_ms", self.wait_ms), ("total_ms", self.total_ms)):
+            values = list(window)
+            out[name] = {
+                "avg": sum(values) / len(values) if values else 0.0,
+                "p50": self._pct(values, 0.50),
+                "p95": self._pct(values, 0.95),
+                "p99": self._pct(values, 0.99),
+            }
+        return out
+
+
+class InferenceQueue:
+    """Two-class priority queue drained by a fixed pool of worker threads.
+
+    Args:
+        workers: Number of worker threads running inference.
+        routine_min_share: Fraction of dispatches (0..1) reserved for routine
+            work while both classes have jobs queued.
+        max_batch: Maximum number of jobs handed to a batch handler at once.
+        window: Number of latency samples kept per class.
+    """
+
+    def __init__(self, workers: int = 1, routine_min_share: float = 0.2,
+                 max_batch: int = 1, window: int = 1000):
+        if workers <= 0:
+            raise ValueError("workers must be > 0")
+        if not 0.0 <= routine_min_share <= 1.0:
+            raise ValueError("routine_min_share must be in [0, 1]")
+        if max_batch <= 0:
+            raise ValueError("max_batch must be > 0")
+        self.workers = workers
+        self.routine_min_share = routine_min_share
+        self.max_batch = max_batch
+        self._queues: Dict[Priority, Deque[_Job]] = {p: deque() for p in Priority}
+        self._batch_handlers: Dict[str, Tuple[Callable[[List[Any]], List[Any]], bool]] = {}
+        self._latency = {p: _LatencyWindow(window) for p in Priority}
+        self._routine_credit = 0.0
+        self._cond = threading.Condition()
+        self._threads: List[threading.Thread] = []
+        self._running = False
+
+    # Lifecycle
+
+    def start(self):
+        """Start worker threads (idempotent)."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._threads = [
+                threading.Thread(target=self._worker, name=f"inference-{i}", daemon=True)
+                for i in range(self.workers)
+            ]
+        for t in self._threads:
+            t.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop workers after the jobs currently running finish; still-queued jobs are cancelled."""
+        with self._cond:
+            self._running = False
+            queued = [job for q in self._queues.values() for job in q]
+            for q in self._queues.values():
+                q.clear()
+            self._cond.notify_all()
+        for job in queued:
+            # cancel() alone wakes callbacks but not concurrent.futures.wait(); the notify covers both
+            job.future.cancel()
+            job.future.set_running_or_notify_cancel()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    # Submission
+
+    def register_batch_handler(self, batch_key: str, fn: Callable[[List[Any]], List[Any]],
+                               pass_context: bool = False):
+        """Register fn(list_of_args) -> list_of_results for jobs with batch_key.
+
+        With pass_context, fn gets (arg, contextvars.Context) pairs instead, so
+        it can run each job's work in that job's submitter context; otherwise
+        it runs in the first job's context.
+        """
+        self._batch_handlers[batch_key] = (fn, pass_context)
+
+    def submit(self, fn: Callable[[Any], Any], arg: Any, priority: Priority = Priority.ROUTINE,
+               batch_key: Optional[str] = None) -> Future:
+        """Queue fn(arg) under a priority class and return a Future for its result."""
+        if not self._running:
+            self.start()
+        job = _Job(fn, arg, Priority(priority), batch_key)
+        with self._cond:
+            self._queues[job.priority].append(job)
+            self._cond.notify()
+        return job.future
+
+    async def run(self, fn: Callable[[Any], Any], arg: Any, priority: Priority = Priority.ROUTINE,
+                  batch_key: Optional[str] = None) -> Any:
+        """Awaitable wrapper around submit() for use inside the event loop."""
+        return await asyncio.wrap_future(self.submit(fn, arg, priority, batch_key))
+
+    # Scheduling
+
+    def _peek_class(self) -> Optional[Priority]:
+        """Class that should be served next; caller holds the lock."""
+        stat, routine = self._queues[Priority.STAT], self._queues[Priority.ROUTINE]
+        if not routine:
+            return Priority.STAT if stat else None
+        if not stat or self._routine_credit >= 1.0 or self.routine_min_share >= 1.0:
+            return Priority.ROUTINE
+        return Priority.STAT
+
+    def _pop(self, cls: Priority) -> _Job:
+        """Dequeue from cls and update the routine share credit."""
+        contended = bool(self._queues[Priority.STAT]) and bool(self._queues[Priority.ROUTINE])
+        if cls is Priority.STAT and contended:
+            share = self.routine_min_share
+            # After (1 - share) / share STAT dispatches, routine has earned one dispatch
+            self._routine_credit += share / (1.0 - share) if share < 1.0 else 1.0
+        elif cls is Priority.ROUTINE:
+            self._routine_credit = max(0.0, self._routine_credit - 1.0) if contended else 0.0
+        return self._queues[cls].popleft()
+
+    def _take_batch(self) -> List[_Job]:
+        """Pop the next job and, if batchable, follow-up jobs with the same key."""
+        cls = self._peek_class()
+        if cls is None:
+            return []
+        first = self._pop(cls)
+        batch = [first]
+        if first.batch_key not in self._batch_handlers:
+            return batch
+        # Keep filling in scheduling order; stop at the first job that can't share the call
+        while len(batch) < self.max_batch:
+            cls = self._peek_class()
+            if cls is None or self._queues[cls][0].batch_key != first.batch_key:
+                break
+            batch.append(self._pop(cls))
+        return batch
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                while self._running and not any(self._queues.values()):
+                    self._cond.wait()
+                if not self._running:
+                    return
+                batch = self._take_batch()
+            # Jobs whose caller went away (e.g. a client disconnect cancelled the awaiter) are dropped;
+            # the rest can no longer be cancelled, so their results always land
+            batch = [job for job in batch if job.future.set_running_or_notify_cancel()]
+            if batch:
+                self._execute(batch)
+
+    def _execute(self, batch: List[_Job]):
+        now = time.perf_counter()
+        for job in batch:
+            job.started_at = now
+        try:
+            if len(batch) > 1:
+                handler, pass_context = self._batch_handlers[batch[0].batch_key]
+                if pass_context:
+                    results = handler([(j.arg, j.context) for j in batch])
+                else:
+                    results = batch[0].context.run(handler, [j.arg for j in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError("Batch handler returned wrong number of results")
+            else:
+                results = [batch[0].context.run(batch[0].fn, batch[0].arg)]
+        except Exception as e:
+            for job in batch:
+                self._record(job, ok=False)
+                self._settle(job.future.set_exception, e)
+            return
+        for job, result in zip(batch, results):
+            self._record(job, ok=True)
+            self._settle(job.future.set_result, result)
+
+    @staticmethod
+    def _settle(setter, value):
+        # A worker must survive a future that was settled elsewhere; it would take the queue down with it
+        try:
+            setter(value)
+        except InvalidStateError:
+            pass
+
+    def _record(self, job: _Job, ok: bool):
+        done = time.perf_counter()
+        with self._cond:
+            window = self._latency[job.priority]
+            if ok:
+                window.completed += 1
+            else:
+                window.failed += 1
+            window.wait_ms.append((job.started_at - job.enqueued_at) * 1000)
+            window.total_ms.append((done - job.enqueued_at) * 1000)
+
+    # Introspection
+
+    def depth(self) -> Dict[str, int]:
+        """Number of queued (not yet started) jobs per class."""
+        with self._cond:
+            return {p.value: len(q) for p, q in self._queues.items()}
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depths plus per-class latency summaries."""
+        with self._cond:
+            return {
+                "workers": self.workers,
+                "routine_min_share": self.routine_min_share,
+                "max_batch": self.max_batch,
+                "depth": {p.value: len(q) for p, q in self._queues.items()},
+                "classes": {p.value: w.summary() for p, w in self._latency.items()},
+            }
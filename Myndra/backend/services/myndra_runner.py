@@ -1,18 +1,24 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from domains.radiology_pneumonia.pipeline import predict as predict_pneumonia
 from domains.radiology_cardiomegaly.pipeline import predict as predict_cardiomegaly
+from backend.services.resource_accounting import ResourceAccountant
+
+# Per-request resource accounting (MYNDRA_RESOURCE_ACCOUNTING=1 to enable)
+resource_accountant = ResourceAccountant.from_env()
 
 def run_pneumonia(image_path: str) -> Dict[str, Any]:
-    return predict_pneumonia(image_path)
+    return resource_accountant.measure("pneumonia", predict_pneumonia, image_path)
 
 def run_cardiomegaly(image_path: str) -> Dict[str, Any]:
-    return predict_cardiomegaly(image_path)
+    return resource_accountant.measure("cardiomegaly", predict_cardiomegaly, image_path)
 
 def run_dual(image_path: str) -> Dict[str, Any]:
     """Fan-out to both tasks and return a merged view."""
-    lung = predict_pneumonia(image_path)
-    heart = predict_cardiomegaly(image_path)
-    return {
+    return merge_dual(run_pneumonia(image_path), run_cardiomegaly(image_path))
+
+def merge_dual(lung: Dict[str, Any], heart: Dict[str, Any]) -> Dict[str, Any]:
+    """Combine a pneumonia and a cardiomegaly report into the dual-analysis result."""
+    result = {
         "pneumonia": lung,
         "cardiomegaly": heart,
         "orchestrated": {
@@ -20,3 +26,14 @@ def run_dual(image_path: str) -> Dict[str, Any]:
                        f"{heart['diagnosis']} (p={heart['probability']:.2f})"
         }
     }
+    if resource_accountant.enabled:
+        result["resources"] = {**lung.pop("resources", {}), **heart.pop("resources", {})}
+    return result
+
+def run_pneumonia_batch(image_paths: List[str]) -> List[Dict[str, Any]]:
+    """Batch entry point used by the inference queue (one result per path, same order)."""
+    return [run_pneumonia(p) for p in image_paths]
+
+def run_cardiomegaly_batch(image_paths: List[str]) -> List[Dict[str, Any]]:
+    """Batch entry point used by the inference queue (one result per path, same order)."""
+    return [run_cardiomegaly(p) for p in image_paths]
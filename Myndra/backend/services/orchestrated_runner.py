@@ -0,0 +1,185 @@
+"""Orchestrated analysis path (MYNDRA_BACKEND_MODE=orchestrated).
+
+Instead of calling the pipelines directly, each analysis runs as a plan of
+RadiologyAgent tasks on an AsyncRuntime: one task for pneumonia or
+cardiomegaly, two independent tasks for dual (so both models run at once)
+and one task per image for a queue batch (each in the context of the
+job that queued it, see run_jobs). Agents are leased from an
+AgentPool, and every task is recorded as a "task" span (agent, status,
+attempts, duration) in the trace of the case that submitted it.
+
+The run_* methods are drop-in replacements for the myndra_runner functions
+of the same name. They are called from inference queue worker threads and
+run the plan on one long-lived event loop thread (building a loop per call
+costs about as much as the rest of the orchestration). The plan runs in
+the caller's context, so its spans join the caller's open span. A task
+that fails or times out raises RuntimeError, so the endpoint reports it
+like a direct pipeline error. With a task deadline, run() also stops
+waiting once every task's deadline (plus a grace period) has passed,
+cancels the plan and raises RuntimeError, so a wedged loop cannot hold an
+inference worker forever.
+"""
+
+import asyncio
+import contextvars
+import math
+import os
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agents.agent_registry import AgentPool
+from agents.radiology_agent import RadiologyAgent
+from memory.memory_module import SharedMemory
+from systems.async_runtime import AsyncRuntime
+from backend.services.myndra_runner import run_pneumonia, run_cardiomegaly, merge_dual
+
+
+class OrchestratedRunner:
+    # Slack on top of the task deadlines for scheduling and merging the reports
+    wait_grace_s = 1.0
+
+    def __init__(self, runners: Optional[Dict[str, Callable[[str], Dict[str, Any]]]] = None,
+                 max_concurrent: int = 4, task_timeout_s: Optional[float] = None, max_retries: int = 0,
+                 memory: Optional[SharedMemory] = None):
+        # Resource-accounted pipelines by default, so /system/status stays accurate in this mode
+        self.runners = runners or {"pneumonia": run_pneumonia, "cardiomegaly": run_cardiomegaly}
+        self.memory = memory if memory is not None else SharedMemory()
+        self.runtime = AsyncRuntime(max_concurrent=max_concurrent, task_timeout_s=task_timeout_s,
+                                    max_retries=max_retries)
+        self.agents = AgentPool(self.memory, size=max_concurrent, factory=self._agent)
+        self._loop = None
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, **kwargs) -> "OrchestratedRunner":
+        """Same knobs as the Orchestrator: MYNDRA_MAX_CONCURRENT, MYNDRA_TASK_TIMEOUT_S, MYNDRA_TASK_RETRIES."""
+        timeout = os.getenv("MYNDRA_TASK_TIMEOUT_S")
+        return cls(
+            max_concurrent=int(os.getenv("MYNDRA_MAX_CONCURRENT", "4")),
+            task_timeout_s=float(timeout) if timeout else None,
+            max_retries=int(os.getenv("MYNDRA_TASK_RETRIES", "0")),
+            **kwargs,
+        )
+
+    def _agent(self, name: str, memory) -> RadiologyAgent:
+        return RadiologyAgent(name, "Radiologist", memory, runners=self.runners)
+
+    @staticmethod
+    def plan(analysis: str, image_paths: List[str],
+             contexts: Optional[List[contextvars.Context]] = None) -> List[Dict[str, Any]]:
+        """Assignments for one analysis type over some images (dual is two tasks per image).
+
+        contexts, one per image, make each image's tasks run (and trace) in that context.
+        """
+        analyses = ("pneumonia", "cardiomegaly") if analysis == "dual" else (analysis,)
+        plan = []
+        for i, path in enumerate(image_paths):
+            for a in analyses:
+                assignment = {"task": {"analysis": a, "image_path": path}, "agent": "RadiologyAgent"}
+                if contexts is not None:
+                    assignment["context"] = contexts[i]
+                plan.append(assignment)
+        return plan
+
+    async def arun(self, analysis: str, image_paths: List[str],
+                   contexts: Optional[List[contextvars.Context]] = None) -> List[Dict[str, Any]]:
+        """One report per image, in order; raises RuntimeError if any task did not succeed."""
+        results = await self.runtime.run_batch(self.plan(analysis, image_paths, contexts), self.agents)
+        reports = []
+        for r in results:
+            if r["status"] != "success":
+                raise RuntimeError(f"{r['task']['analysis']} task {r['status']}: {r['result'].get('error')}")
+            reports.append(r["result"])
+        if analysis == "dual":
+            reports = [merge_dual(reports[i], reports[i + 1]) for i in range(0, len(reports), 2)]
+        return reports
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=serve, name="myndra-orchestrated", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def wait_timeout_s(self, analysis: str, image_paths: List[str]) -> Optional[float]:
+        """How long run() waits for a plan: its tasks' deadlines in max_concurrent waves, plus grace."""
+        timeout = self.runtime.task_timeout_s
+        if timeout is None:
+            return None
+        waves = math.ceil(len(self.plan(analysis, image_paths)) / self.runtime.max_concurrent)
+        return max(1, waves) * timeout + self.wait_grace_s
+
+    def run(self, analysis: str, image_paths: List[str],
+            contexts: Optional[List[contextvars.Context]] = None) -> List[Dict[str, Any]]:
+        """Sync arun for inference queue workers; blocks until the plan has finished or its deadline passed."""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("OrchestratedRunner.run called from its own loop; await arun instead")
+        done = Future()
+        started = []
+
+        def settle(task):
+            if task.cancelled():
+                done.cancel()
+            elif task.exception() is not None:
+                done.set_exception(task.exception())
+            else:
+                done.set_result(task.result())
+
+        def cancel():
+            for task in started:
+                task.cancel()
+
+        def start():
+            task = loop.create_task(self.arun(analysis, image_paths, contexts))
+            task.add_done_callback(settle)
+            started.append(task)
+
+        # start() runs in a copy of the caller's context, and so does the task it creates
+        loop.call_soon_threadsafe(start, context=contextvars.copy_context())
+        timeout = self.wait_timeout_s(analysis, image_paths)
+        try:
+            return done.result(timeout)
+        except FutureTimeoutError:
+            # Cancelling the plan cancels its tasks, which abandon any act() still running
+            loop.call_soon_threadsafe(cancel)
+            raise RuntimeError(f"{analysis} plan did not finish within {timeout:.1f}s") from None
+
+    def close(self):
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+    def run_pneumonia(self, image_path: str) -> Dict[str, Any]:
+        return self.run("pneumonia", [image_path])[0]
+
+    def run_cardiomegaly(self, image_path: str) -> Dict[str, Any]:
+        return self.run("cardiomegaly", [image_path])[0]
+
+    def run_dual(self, image_path: str) -> Dict[str, Any]:
+        return self.run("dual", [image_path])[0]
+
+    def run_pneumonia_batch(self, image_paths: List[str]) -> List[Dict[str, Any]]:
+        return self.run("pneumonia", image_paths)
+
+    def run_cardiomegaly_batch(self, image_paths: List[str]) -> List[Dict[str, Any]]:
+        return self.run("cardiomegaly", image_paths)
+
+    def run_jobs(self, analysis: str, jobs: List[Tuple[str, contextvars.Context]]) -> List[Dict[str, Any]]:
+        """Batch handler for InferenceQueue(pass_context=True): each image's task joins its job's trace."""
+        return self.run(analysis, [path for path, _ in jobs], [context for _, context in jobs])
@@ -0,0 +1,157 @@
+"""Optional per-request resource accounting for radiology analyses.
+
+When disabled (the default) ``measure`` is a plain function call, so there is
+no overhead. When enabled each call records:
+
+- wall time and process RSS before/after, plus growth of the process peak RSS
+- the Python allocation peak via tracemalloc, for a sampled fraction of calls
+- CUDA allocator peak when the model runs on a GPU
+
+RSS and tracemalloc are process-wide, so with several inference workers the
+numbers of overlapping requests bleed into each other; tracemalloc sampling is
+serialized so at most one request is traced at a time.
+"""
+
+import os
+import random
+import resource
+import sys
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional
+
+# ru_maxrss is reported in KiB on Linux and in bytes on macOS
+_MAXRSS_TO_KB = 1.0 / 1024 if sys.platform == "darwin" else 1.0
+_PAGE_KB = os.sysconf("SC_PAGE_SIZE") / 1024 if hasattr(os, "sysconf") else 4.0
+
+
+def _current_rss_kb() -> float:
+    """Resident set size of this process in KiB (falls back to peak RSS off Linux)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGE_KB
+    except (OSError, ValueError, IndexError):
+        return _peak_rss_kb()
+
+
+def _peak_rss_kb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * _MAXRSS_TO_KB
+
+
+def _cuda_device() -> Optional[str]:
+    """Return the CUDA device in use, or None; torch is only imported if already loaded."""
+    torch = sys.modules.get("torch")
+    if torch is None or not os.getenv("MYNDRA_DEVICE", "cpu").startswith("cuda"):
+        return None
+    return os.getenv("MYNDRA_DEVICE") if torch.cuda.is_available() else None
+
+
+class ResourceAccountant:
+    """Measures pipeline calls and aggregates usage per analysis type.
+
+    Args:
+        enabled: Master switch; when False nothing is measured or stored.
+        tracemalloc_rate: Fraction of calls (0..1) traced with tracemalloc.
+        top_k: Number of heaviest cases (by RSS growth) remembered per type.
+    """
+
+    def __init__(self, enabled: bool = False, tracemalloc_rate: float = 0.0, top_k: int = 10):
+        self.enabled = enabled
+        self.tracemalloc_rate = tracemalloc_rate
+        self.top_k = top_k
+        self._trace_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._totals: Dict[str, Dict[str, Any]] = {}
+        self._heaviest: Dict[str, Deque[Dict[str, Any]]] = {}
+
+    @classmethod
+    def from_env(cls) -> "ResourceAccountant":
+        return cls(
+            enabled=os.getenv("MYNDRA_RESOURCE_ACCOUNTING", "0").lower() in ("1", "true", "yes", "on"),
+            tracemalloc_rate=float(os.getenv("MYNDRA_TRACEMALLOC_SAMPLE_RATE", "0.05")),
+        )
+
+    def measure(self, stage: str, fn: Callable[[Any], Dict[str, Any]], arg: Any) -> Dict[str, Any]:
+        """Run fn(arg); when enabled, attach usage under result["resources"][stage]."""
+        if not self.enabled:
+            return fn(arg)
+
+        traced = (
+            self.tracemalloc_rate > 0
+            and random.random() < self.tracemalloc_rate
+            and not tracemalloc.is_tracing()
+            and self._trace_lock.acquire(blocking=False)
+        )
+        cuda = _cuda_device()
+        if cuda:
+            sys.modules["torch"].cuda.reset_peak_memory_stats(cuda)
+        if traced:
+            tracemalloc.start()
+        rss_before, peak_before = _current_rss_kb(), _peak_rss_kb()
+        start = time.perf_counter()
+        try:
+            result = fn(arg)
+        finally:
+            usage: Dict[str, Any] = {
+                "wall_ms": (time.perf_counter() - start) * 1000,
+                "rss_kb_before": rss_before,
+                "rss_kb_after": _current_rss_kb(),
+                "peak_rss_delta_kb": _peak_rss_kb() - peak_before,
+            }
+            if traced:
+                usage["tracemalloc_peak_kb"] = tracemalloc.get_traced_memory()[1] / 1024
+                tracemalloc.stop()
+                self._trace_lock.release()
+            if cuda:
+                usage["torch_cuda_peak_kb"] = sys.modules["torch"].cuda.max_memory_allocated(cuda) / 1024
+
+        if isinstance(result, dict):
+            result.setdefault("resources", {})[stage] = usage
+        return result
+
+    def record(self, case_id: str, analysis_type: str, resources: Optional[Dict[str, Dict[str, Any]]]):
+        """Fold one case's per-stage usage into the per-type aggregates."""
+        if not self.enabled or not resources:
+            return
+        peak = max(u.get("peak_rss_delta_kb", 0.0) for u in resources.values())
+        rss_growth = max(u["rss_kb_after"] - u["rss_kb_before"] for u in resources.values())
+        traced = [u["tracemalloc_peak_kb"] for u in resources.values() if "tracemalloc_peak_kb" in u]
+        with self._lock:
+            t = self._totals.setdefault(analysis_type, {
+                "count": 0, "rss_growth_kb_sum": 0.0, "rss_growth_kb_max": 0.0,
+                "peak_rss_delta_kb_max": 0.0, "traced": 0, "tracemalloc_peak_kb_max": 0.0,
+            })
+            t["count"] += 1
+            t["rss_growth_kb_sum"] += rss_growth
+            t["rss_growth_kb_max"] = max(t["rss_growth_kb_max"], rss_growth)
+            t["peak_rss_delta_kb_max"] = max(t["peak_rss_delta_kb_max"], peak)
+            if traced:
+                t["traced"] += 1
+                t["tracemalloc_peak_kb_max"] = max(t["tracemalloc_peak_kb_max"], max(traced))
+            heavy = self._heaviest.setdefault(analysis_type, deque())
+            entry = {"case_id": case_id, "rss_growth_kb": rss_growth, "peak_rss_delta_kb": peak}
+            heavy.append(entry)
+            ranked = sorted(heavy, key=lambda e: (e["peak_rss_delta_kb"], e["rss_growth_kb"]), reverse=True)
+            self._heaviest[analysis_type] = deque(ranked[: self.top_k])
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregates per analysis type, including the heaviest recent cases."""
+        if not self.enabled:
+            return {"enabled": False}
+        with self._lock:
+            by_type = {}
+            for atype, t in self._totals.items():
+                by_type[atype] = {
+                    **t,
+                    "rss_growth_kb_avg": t["rss_growth_kb_sum"] / t["count"],
+                    "heaviest_cases": list(self._heaviest.get(atype, [])),
+                }
+        return {
+            "enabled": True,
+            "tracemalloc_rate": self.tracemalloc_rate,
+            "process_rss_kb": _current_rss_kb(),
+            "process_peak_rss_kb": _peak_rss_kb(),
+            "by_type": by_type,
+        }
@@ -1,7 +1,45 @@
+import argparse
+import json
+
 from orchestrator.orchestrator import Orchestrator
 from memory.memory_module import SharedMemory
+from systems.tracing import get_tracer
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Run Myndra orchestration for one goal or a batch of goals.")
+    p.add_argument("goals", nargs="*", help="Goals to run (default: a single demo goal)")
+    p.add_argument("--goals-file", type=str, help="File with one goal per line (batch mode)")
+    p.add_argument("--max-goals-in-flight", type=int, default=None)
+    p.add_argument("--quiet", action="store_true", help="Record agent/planner logs without printing them")
+    p.add_argument("--trace", type=str, help="Write the run's trace here (Chrome trace format)")
+    return p.parse_args()
+
+
+def run_batch(orch, goals, max_goals_in_flight):
+    """Stream one line per finished goal, then the batch throughput/latency report."""
+    def on_result(report):
+        if "error" in report:
+            print(f"[{report['index']}] {report['goal']} → error: {report['error']}")
+            return
+        ok = sum(1 for r in report["results"] if r.get("status") == "success")
+        print(f"[{report['index']}] {report['goal']} → {ok}/{len(report['results'])} subtasks succeeded")
+
+    batch = orch.run_batch(goals, on_result=on_result, max_goals_in_flight=max_goals_in_flight)
+    print("\nBatch Stats:")
+    print(json.dumps(batch["stats"], indent=2))
+    orch.profiler.save("results/orchestrator_batch_profile.json")
+
 
 if __name__ == "__main__":
+    args = parse_args()
+    goals = list(args.goals)
+    if args.goals_file:
+        with open(args.goals_file, encoding="utf-8") as f:
+            goals.extend(line.strip() for line in f if line.strip())
+    if args.quiet:
+        get_tracer().quiet = True
+
     print("\n========== MYNDRA ORCHESTRATION RUN ==========\n")
 
     # 1️⃣ Initialize shared memory
@@ -10,11 +48,17 @@ if __name__ == "__main__":
     # 2️⃣ Create the orchestrator (LLM planner on)
     orch = Orchestrator(None, memory, use_llm=True)
 
-    # 3️⃣ Define a high-level goal
-    goal = "Analyze performance metrics"
+    if len(goals) > 1:
+        run_batch(orch, goals, args.max_goals_in_flight)
+    else:
+        # 3️⃣ Define a high-level goal
+        goal = goals[0] if goals else "Analyze performance metrics"
+
+        # 4️⃣ Run full orchestration pipeline
+        adaptation_summary = orch.run(goal)
 
-    # 4️⃣ Run full orchestration pipeline
-    adaptation_summary = orch.run(goal)
+    if args.trace:
+        get_tracer().save_chrome(args.trace)
 
     # 5️⃣ Print memory trace
     print("\n==============================================\n")
@@ -23,4 +67,4 @@ if __name__ == "__main__":
     recent = memory.get_recent("agent:orchestrator")
     print("Recent Memory Trace (Orchestrator):")
     for item in recent[-5:]:
-        print(f"• {item['timestamp']} | {item['content']}")
\ No newline at end of file
+        print(f"• {item['timestamp']} | {item['content']}")
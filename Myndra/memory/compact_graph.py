@@ -0,0 +1,413 @@
+"""Compact, array-backed alternative to the networkx KnowledgeGraph.
+
+Same public API as KnowledgeGraph (add_node, add_edge, get_node, get_related,
+search) with a much smaller per-node footprint:
+
+- node ids are interned once to dense integer ids
+- predecessor adjacency lives in a CSR layout (offsets + source ids + edge
+  types) with an append buffer that is merged in when it grows large
+- provenance is packed into columns: agent ids and tags as 64-bit bitmasks
+  over interned vocabularies (with an overflow map past 64 entries), and
+  timestamps as epoch floats chained per node, plus per-node write count and
+  first timestamp columns; get_node exposes the same bounded provenance view
+  as KnowledgeGraph (count, first/last seen, provenance_sample recent stamps).
+  Stamps older than a node's provenance_sample newest are dead; once they
+  make up half of the chain storage it is rebuilt with only live stamps, so
+  storage stays bounded by nodes x provenance_sample
+
+Timestamps must be ISO-8601 strings (naive ones are taken as UTC); get_node
+returns them re-rendered in UTC.
+
+All columns are shared arrays (node creation appends to every one of them and
+compaction swaps the CSR wholesale), so a single re-entrant lock guards the
+public API instead of per-node shards.
+"""
+
+from array import array
+import math
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .memory_types import Defaults, EdgeType, normalize_id
+from .text_index import TrigramIndex, to_epoch
+
+_EDGE_TYPES = list(EdgeType)
+_EDGE_CODE = {t: i for i, t in enumerate(_EDGE_TYPES)}
+_MASK_BITS = 64
+_NAN = float("nan")
+
+
+class _BitsetColumn:
+    """Per-node set of interned labels stored as a uint64 bitmask column."""
+
+    def __init__(self):
+        self.labels: List[str] = []
+        self.codes: Dict[str, int] = {}
+        self.bits = array("Q")
+        self.overflow: Dict[int, Set[int]] = {}
+
+    def append_row(self):
+        self.bits.append(0)
+
+    def add(self, row: int, labels):
+        for label in labels:
+            code = self.codes.get(label)
+            if code is None:
+                code = self.codes[label] = len(self.labels)
+                self.labels.append(label)
+            if code < _MASK_BITS:
+                self.bits[row] |= 1 << code
+            else:
+                self.overflow.setdefault(row, set()).add(code)
+
+    def get(self, row: int) -> Set[str]:
+        mask = self.bits[row]
+        out = {self.labels[c] for c in range(min(_MASK_BITS, len(self.labels))) if mask >> c & 1}
+        out.update(self.labels[c] for c in self.overflow.get(row, ()))
+        return out
+
+
+class CompactKnowledgeGraph:
+    """Interned-id knowledge graph with CSR predecessor adjacency and packed provenance."""
+
+    def __init__(self, use_index=Defaults.KG_SUBSTRING_INDEX, provenance_sample=Defaults.KG_PROVENANCE_SAMPLE):
+        self.provenance_sample = provenance_sample
+        self._ids: Dict[str, int] = {}
+        self._strings: List[str] = []
+        self.index = TrigramIndex() if use_index else None
+        # Provenance columns
+        self._agents = _BitsetColumn()
+        self._tags = _BitsetColumn()
+        self._ts_head = array("l")
+        self._ts_prev = array("l")
+        self._ts_val = array("d")
+        self._count = array("l")
+        self._ts_first = array("d")  # NaN until the first timestamp
+        self._ts_dead = 0  # chained stamps past their node's provenance_sample (estimate)
+        # Predecessor CSR (covers node ids < len(_csr_off) - 1) plus append buffer
+        self._csr_off = array("l", [0])
+        self._csr_src = array("l")
+        self._csr_type = array("b")
+        self._buf: Dict[int, List[Tuple[int, int]]] = {}
+        self._buf_len = 0
+        self._n_edges = 0
+        self._lock = threading.RLock()
+
+    # Node and edge storage
+
+    def _ensure_node(self, node_id: str) -> int:
+        nid = self._ids.get(node_id)
+        if nid is None:
+            nid = self._ids[node_id] = len(self._strings)
+            self._strings.append(node_id)
+            self._agents.append_row()
+            self._tags.append_row()
+            self._ts_head.append(-1)
+            self._count.append(0)
+            self._ts_first.append(_NAN)
+            if self.index is not None:
+                self.index.add(node_id)
+        return nid
+
+    def _stamp(self, nid: int, agent_id: Optional[str], timestamp: Optional[str], tags):
+        self._count[nid] += 1
+        if agent_id:
+            self._agents.add(nid, (agent_id,))
+        if timestamp:
+            epoch = to_epoch(timestamp)
+            self._ts_val.append(epoch)
+            self._ts_prev.append(self._ts_head[nid])
+            self._ts_head[nid] = len(self._ts_val) - 1
+            if math.isnan(self._ts_first[nid]):
+                self._ts_first[nid] = epoch
+            limit = self.provenance_sample
+            # Counts writes without a timestamp too, so this can only overestimate
+            if limit is not None and self._count[nid] > limit:
+                self._ts_dead += 1
+                if self._ts_dead > len(self._ts_val) // 2:
+                    self._compact_stamps()
+        if tags:
+            self._tags.add(nid, tags)
+
+    def _compact_stamps(self):
+        """Rebuild the timestamp chains keeping each node's provenance_sample newest stamps."""
+        limit = self.provenance_sample
+        if limit is None:
+            return
+        head, prev, val = self._ts_head, self._ts_prev, self._ts_val
+        new_head, new_prev, new_val = array("l"), array("l"), array("d")
+        for h in head:
+            stamps = []
+            i = h
+            while i != -1 and len(stamps) < limit:
+                stamps.append(val[i])
+                i = prev[i]
+            link = -1
+            for epoch in reversed(stamps):
+                new_val.append(epoch)
+                new_prev.append(link)
+                link = len(new_val) - 1
+            new_head.append(link)
+        self._ts_head, self._ts_prev, self._ts_val = new_head, new_prev, new_val
+        self._ts_dead = 0
+
+    def _csr_slice(self, nid: int) -> range:
+        if nid + 1 < len(self._csr_off):
+            return range(self._csr_off[nid], self._csr_off[nid + 1])
+        return range(0)
+
+    def _link(self, src: int, dst: int, code: int):
+        # DiGraph semantics: a repeated edge only updates its type
+        for i in self._csr_slice(dst):
+            if self._csr_src[i] == src:
+                self._csr_type[i] = code
+                return
+        pending = self._buf.setdefault(dst, [])
+        for j, (s, _) in enumerate(pending):
+            if s == src:
+                pending[j] = (src, code)
+                return
+        pending.append((src, code))
+        self._buf_len += 1
+        self._n_edges += 1
+        if self._buf_len > max(1024, (len(self._csr_src) + len(self._strings)) // 2):
+            self._compact()
+
+    def _compact(self):
+        """Merge the append buffer into a fresh CSR, keeping per-node insertion order."""
+        off, src, typ = array("l", [0]), array("l"), array("b")
+        for nid in range(len(self._strings)):
+            r = self._csr_slice(nid)
+            if len(r):
+                src.extend(self._csr_src[r.start:r.stop])
+                typ.extend(self._csr_type[r.start:r.stop])
+            for s, code in self._buf.get(nid, ()):
+                src.append(s)
+                typ.append(code)
+            off.append(len(src))
+        self._csr_off, self._csr_src, self._csr_type = off, src, typ
+        self._buf, self._buf_len = {}, 0
+
+    def _predecessors(self, nid: int) -> Iterator[int]:
+        for i in self._csr_slice(nid):
+            yield self._csr_src[i]
+        for s, _ in self._buf.get(nid, ()):
+            yield s
+
+    # KnowledgeGraph API
+
+    def add_node(self, agent_id: str, content: str, context: Optional[str] = None, timestamp: Optional[str] = None, tags=None):
+        """Add a content node (and optional context) with provenance; see KnowledgeGraph.add_node."""
+        content_id = normalize_id(content)
+        if not content_id:
+            return
+        with self._lock:
+            nid = self._ensure_node(content_id)
+            self._stamp(nid, agent_id, timestamp, tags)
+            if context:
+                ctx_id = normalize_id(context)
+                cid = self._ensure_node(ctx_id)
+                self._stamp(cid, agent_id, timestamp, tags)
+                self.add_edge(ctx_id, content_id, edge_type=EdgeType.CONTEXT)
+
+    def add_edge(self, src: str, dst: str, edge_type: EdgeType = EdgeType.CONTEXT):
+        """Add an edge between two nodes."""
+        src, dst = normalize_id(src), normalize_id(dst)
+        if not src or not dst:
+            return
+        with self._lock:
+            self._link(self._ensure_node(src), self._ensure_node(dst), _EDGE_CODE[EdgeType(edge_type)])
+
+    def get_node(self, node_id: str) -> dict:
+        """Materialize a node's provenance (see KnowledgeGraph.get_node), or {} if absent."""
+        limit = self.provenance_sample
+        with self._lock:
+            nid = self._ids.get(normalize_id(node_id))
+            if nid is None:
+                return {}
+            stamps = []
+            i = self._ts_head[nid]
+            while i != -1 and (limit is None or len(stamps) < limit):
+                stamps.append(self._ts_val[i])
+                i = self._ts_prev[i]
+            last = self._ts_val[self._ts_head[nid]] if self._ts_head[nid] != -1 else None
+            first = self._ts_first[nid]
+            agents, tags, count = self._agents.get(nid), self._tags.get(nid), self._count[nid]
+        return {
+            "agent_ids": agents,
+            "timestamps": [_iso(t) for t in reversed(stamps)],
+            "tags": tags,
+            "count": count,
+            "first_seen": None if math.isnan(first) else _iso(first),
+            "last_seen": None if last is None else _iso(last),
+        }
+
+    def get_related(self, node_id: str, depth: int = Defaults.KG_DEFAULT_DEPTH) -> List[dict]:
+        """BFS over predecessors up to depth, returning edge dicts {src, dst}."""
+        with self._lock:
+            start = self._ids.get(normalize_id(node_id))
+            if start is None:
+                return []
+            visited = {start}
+            queue = [(start, 0)]
+            related = []
+            head = 0
+            while head < len(queue):
+                current, d = queue[head]
+                head += 1
+                if d >= depth:
+                    continue
+                for neighbor in self._predecessors(current):
+                    related.append({"src": self._strings[current], "dst": self._strings[neighbor]})
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        queue.append((neighbor, d + 1))
+        return related
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[str]:
+        """Return node ids containing normalize_id(query), in insertion order."""
+        q = normalize_id(query)
+        if self.index is not None:
+            with self._lock:
+                return self.index.search(q, top_k)
+        hits = [node for node in list(self._strings) if q in node]
+        return hits if top_k is None else hits[:top_k]
+
+    # Introspection
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self._ids
+
+    def nodes(self) -> List[str]:
+        return list(self._strings)
+
+    def edges(self) -> Iterator[Tuple[str, str, EdgeType]]:
+        """Iterate (src, dst, edge_type) grouped by destination (a consistent snapshot)."""
+        out = []
+        with self._lock:
+            for nid in range(len(self._strings)):
+                for i in self._csr_slice(nid):
+                    out.append((self._strings[self._csr_src[i]], self._strings[nid], _EDGE_TYPES[self._csr_type[i]]))
+                for s, code in self._buf.get(nid, ()):
+                    out.append((self._strings[s], self._strings[nid], _EDGE_TYPES[code]))
+        return iter(out)
+
+    def number_of_nodes(self) -> int:
+        return len(self._strings)
+
+    def number_of_edges(self) -> int:
+        return self._n_edges
+
+    # Columnar export/import (used by memory.persistence snapshots)
+
+    def export_columns(self) -> Dict[str, array]:
+        """Flatten all state into named arrays; merges the edge buffer first.
+
+        The arrays are live views of the graph, so callers sharing it between
+        threads must not mutate it until they are done with the columns.
+        """
+        with self._lock:
+            self._compact()
+            if self._ts_dead:
+                self._compact_stamps()
+            cols = {
+                "csr_off": self._csr_off, "csr_src": self._csr_src, "csr_type": self._csr_type,
+                "ts_head": self._ts_head, "ts_prev": self._ts_prev, "ts_val": self._ts_val,
+                "count": self._count, "ts_first": self._ts_first,
+                "agent_bits": self._agents.bits, "tag_bits": self._tags.bits,
+            }
+            cols["nodes_text"], cols["nodes_off"] = _pack_strings(self._strings)
+            for name, column in (("agent", self._agents), ("tag", self._tags)):
+                cols[f"{name}_text"], cols[f"{name}_off"] = _pack_strings(column.labels)
+                rows, codes = array("l"), array("l")
+                for row, extra in column.overflow.items():
+                    for code in sorted(extra):
+                        rows.append(row)
+                        codes.append(code)
+                cols[f"{name}_ovf_rows"], cols[f"{name}_ovf_codes"] = rows, codes
+            if self.index is not None:
+                grams = list(self.index.grams)
+                cols["gram_text"] = _encode_text("".join(grams))
+                off, postings = array("l", [0]), array("l")
+                for g in grams:
+                    postings.extend(self.index.grams[g])
+                    off.append(len(postings))
+                cols["gram_off"], cols["gram_postings"] = off, postings
+            return cols
+
+    @classmethod
+    def from_columns(cls, cols: Dict[str, array], use_index=Defaults.KG_SUBSTRING_INDEX) -> "CompactKnowledgeGraph":
+        """Rebuild a graph from export_columns() output (arrays are adopted, not copied)."""
+        kg = cls(use_index=False)
+        kg._strings = _unpack_strings(cols["nodes_text"], cols["nodes_off"])
+        kg._ids = dict(zip(kg._strings, range(len(kg._strings))))
+        kg._csr_off, kg._csr_src, kg._csr_type = cols["csr_off"], cols["csr_src"], cols["csr_type"]
+        kg._ts_head, kg._ts_prev, kg._ts_val = cols["ts_head"], cols["ts_prev"], cols["ts_val"]
+        if "count" in cols:
+            kg._count, kg._ts_first = cols["count"], cols["ts_first"]
+        else:
+            # Older snapshots: derive both from the timestamp chains
+            kg._count, kg._ts_first = array("l"), array("d")
+            for head in kg._ts_head:
+                n, first, i = 0, _NAN, head
+                while i != -1:
+                    n, first, i = n + 1, kg._ts_val[i], kg._ts_prev[i]
+                kg._count.append(n)
+                kg._ts_first.append(first)
+        # At least this many stamps are past their node's sample
+        kg._ts_dead = max(0, len(kg._ts_val) - len(kg._ts_head) * (kg.provenance_sample or len(kg._ts_val)))
+        kg._n_edges = len(kg._csr_src)
+        for name, column, bits in (("agent", kg._agents, "agent_bits"), ("tag", kg._tags, "tag_bits")):
+            column.labels = _unpack_strings(cols[f"{name}_text"], cols[f"{name}_off"])
+            column.codes = {label: i for i, label in enumerate(column.labels)}
+            column.bits = cols[bits]
+            for row, code in zip(cols[f"{name}_ovf_rows"], cols[f"{name}_ovf_codes"]):
+                column.overflow.setdefault(row, set()).add(code)
+        if use_index:
+            index = kg.index = TrigramIndex()
+            index.nodes = list(kg._strings)
+            if "gram_text" in cols:
+                text, off, postings = _decode_text(cols["gram_text"]), cols["gram_off"], cols["gram_postings"]
+                index.grams = {text[3 * i:3 * i + 3]: postings[off[i]:off[i + 1]] for i in range(len(off) - 1)}
+            else:
+                index.nodes = []
+                for node in kg._strings:
+                    index.add(node)
+        return kg
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+
+
+def _encode_text(text: str) -> array:
+    out = array("B")
+    out.frombytes(text.encode("utf-8"))
+    return out
+
+
+def _decode_text(column: array) -> str:
+    return column.tobytes().decode("utf-8")
+
+
+def _pack_strings(strings: List[str]) -> Tuple[array, array]:
+    """Join strings with NUL separators into one UTF-8 column plus code-point offsets."""
+    off = array("l", [0])
+    total = 0
+    for s in strings:
+        total += len(s)
+        off.append(total)
+    return _encode_text("\0".join(strings)), off
+
+
+def _unpack_strings(text: array, off: array) -> List[str]:
+    joined = _decode_text(text)
+    n = len(off) - 1
+    if n == 0:
+        return []
+    parts = joined.split("\0")
+    if len(parts) == n:
+        return parts
+    # Some string contains NUL itself: slice by offsets (shifted by one separator per item)
+    return [joined[off[i] + i:off[i + 1] + i] for i in range(n)]
@@ -1,63 +1,309 @@
-from collections import deque
+from collections import OrderedDict, deque
+from contextlib import contextmanager
 import datetime
+import itertools
 from datetime import timezone
 import json
+import math
 import re
+import threading
+import time
 import networkx as nx
+import numpy as np
 from typing import List, Tuple, Optional
 
 from .memory_types import (
-    Defaults, EdgeType,
+    Defaults, EdgeType, LazyText,
     normalize_id, ensure_agent_prefix, ensure_task_id, decay_linear
 )
+from .text_index import SECONDS_PER_DAY, TOKEN, TrigramIndex, to_epoch
+
+_TASK_REF = re.compile(r"task(\d+)", re.IGNORECASE)
+
+
+class _LockStripes:
+    """Fixed pool of locks; a key always maps to the same lock (hash(key) % n).
+
+    Lets unrelated keys (agents, graph nodes) proceed in parallel while keeping
+    the cost bounded regardless of how many keys exist. n=1 is one global lock.
+    """
+    def __init__(self, n: int = Defaults.LOCK_STRIPES):
+        if n <= 0:
+            raise ValueError("Lock stripe count must be > 0")
+        self._locks = [threading.Lock() for _ in range(n)]
+
+    def __len__(self) -> int:
+        return len(self._locks)
+
+    def lock(self, key) -> threading.Lock:
+        return self._locks[hash(key) % len(self._locks)]
+
+    @contextmanager
+    def hold(self, *keys):
+        """Acquire the stripes of all keys in index order (deadlock-free), each once."""
+        stripes = sorted({hash(k) % len(self._locks) for k in keys})
+        for i in stripes:
+            self._locks[i].acquire()
+        try:
+            yield
+        finally:
+            for i in reversed(stripes):
+                self._locks[i].release()
+
+
+def _trigrams(text: str) -> set:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class _EpisodeRing:
+    """One agent's events as fixed-capacity columns; slot s % capacity holds event s.
+
+    Texts are refcounted in a shared content table and, with use_index, in a token index.
+    """
+    def __init__(self, agent_id: str, capacity: int, use_index: bool = True):
+        self.agent_id = agent_id
+        self.capacity = capacity
+        self.seq = 0
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.cid = np.full(capacity, -1, dtype=np.int32)
+        # Content table, indexed by content id
+        self.content_ids = {}
+        self.texts = []
+        self.lowered = []
+        self.refs = []
+        self.free = []
+        self.postings = {} if use_index else None
+        self.vocab_grams = {}  # trigram -> tokens in postings containing it
+
+    def __len__(self) -> int:
+        return min(self.seq, self.capacity)
+
+    def seqs(self) -> range:
+        return range(self.seq - len(self), self.seq)
+
+    def _acquire(self, text: str) -> int:
+        cid = self.content_ids.get(text)
+        if cid is not None:
+            self.refs[cid] += 1
+            return cid
+        lowered = text.lower()
+        if lowered == text:
+            lowered = text  # share the object
+        if self.free:
+            cid = self.free.pop()
+            self.texts[cid], self.lowered[cid], self.refs[cid] = text, lowered, 1
+        else:
+            cid = len(self.texts)
+            self.texts.append(text)
+            self.lowered.append(lowered)
+            self.refs.append(1)
+        self.content_ids[text] = cid
+        if self.postings is not None:
+            for tok in set(TOKEN.findall(lowered)):
+                ids = self.postings.get(tok)
+                if ids is None:
+                    ids = self.postings[tok] = set()
+                    for gram in _trigrams(tok):
+                        self.vocab_grams.setdefault(gram, set()).add(tok)
+                ids.add(cid)
+        return cid
+
+    def _release(self, cid: int):
+        self.refs[cid] -= 1
+        if not self.refs[cid]:
+            if self.postings is not None:
+                for tok in set(TOKEN.findall(self.lowered[cid])):
+                    ids = self.postings[tok]
+                    ids.discard(cid)
+                    if not ids:
+                        del self.postings[tok]
+                        for gram in _trigrams(tok):
+                            toks = self.vocab_grams[gram]
+                            toks.discard(tok)
+                            if not toks:
+                                del self.vocab_grams[gram]
+            del self.content_ids[self.texts[cid]]
+            self.texts[cid] = self.lowered[cid] = None
+            self.free.append(cid)
+
+    def append(self, content: str, epoch: float):
+        slot = self.seq % self.capacity
+        if self.seq >= self.capacity:
+            self._release(int(self.cid[slot]))
+        self.ts[slot] = epoch
+        self.cid[slot] = self._acquire(content)
+        self.seq += 1
+
+    def content(self, seq: int) -> str:
+        return self.texts[self.cid[seq % self.capacity]]
+
+    def event(self, seq: int) -> dict:
+        """Dict view of one event; the timestamp is re-rendered as UTC ISO-8601."""
+        slot = seq % self.capacity
+        return {
+            "timestamp": datetime.datetime.fromtimestamp(self.ts[slot], timezone.utc).isoformat(),
+            "agent_id": self.agent_id,
+            "content": self.texts[self.cid[slot]],
+        }
+
+    def __iter__(self):
+        return (self.event(s) for s in self.seqs())
+
+    def scan(self, q: str) -> List[int]:
+        """Reference linear scan; q is already lowercased."""
+        return [s for s in self.seqs() if q in self.lowered[self.cid[s % self.capacity]]]
+
+    def search(self, q: str) -> List[int]:
+        """Sequence numbers (oldest first) whose lowercased content contains q."""
+        ids_per_token = []
+        for m in TOKEN.finditer(q):
+            ids = self._token_ids(m.group(), m.start() == 0, m.end() == len(q))
+            if not ids:
+                return []
+            ids_per_token.append(ids)
+        if not ids_per_token:
+            candidates = self.content_ids.values()
+        else:
+            # Smallest posting first keeps the working set small
+            ids_per_token.sort(key=len)
+            candidates = set(ids_per_token[0])
+            for ids in ids_per_token[1:]:
+                candidates &= ids
+                if not candidates:
+                    return []
+        # Each distinct text is confirmed once, however many events repeat it
+        matched = [c for c in candidates if q in self.lowered[c]]
+        if not matched:
+            return []
+        # Unused slots hold -1, so they never match
+        slots = np.flatnonzero(np.isin(self.cid, matched))
+        start = self.seq - len(self)
+        seqs = start + (slots - start) % self.capacity
+        seqs.sort()
+        return seqs.tolist()
+
+    def _token_ids(self, qt: str, open_left: bool, open_right: bool):
+        """Content ids that can hold query token qt.
+
+        open_left/open_right say whether qt touches that end of the query, so
+        the content token may continue past it on that side.
+        """
+        if not (open_left or open_right):
+            return self.postings.get(qt)
+        if open_left and open_right:
+            fits = lambda tok: qt in tok
+        elif open_left:
+            fits = lambda tok: tok.endswith(qt)
+        else:
+            fits = lambda tok: tok.startswith(qt)
+        if len(qt) < 3:
+            vocab = self.postings
+        else:
+            vocab = None
+            for gram in _trigrams(qt):
+                toks = self.vocab_grams.get(gram)
+                if toks is None:
+                    return None
+                if vocab is None or len(toks) < len(vocab):
+                    vocab = toks
+        ids = set()
+        for tok in vocab:
+            if fits(tok):
+                ids |= self.postings[tok]
+        return ids
+
+    def columns(self, seqs: List[int]) -> Tuple[List[str], np.ndarray]:
+        """(contents, epoch timestamps) for seqs, for vectorized scoring."""
+        slots = np.fromiter((s % self.capacity for s in seqs), dtype=np.int64, count=len(seqs))
+        return [self.texts[c] for c in self.cid[slots].tolist()], self.ts[slots]
+
 
 class EpisodicMemory:
     """In-memory store of recent events per agent.
 
     - strict_mode=True: accessing unknown agents raises KeyError.
-    - Events are dicts with keys: timestamp, agent_id, content.
+    - Events are stored columnar in per-agent ring buffers (see _EpisodeRing);
+      get_recent()/retrieve() return dict views with keys timestamp, agent_id, content.
+    - use_index=True: retrieve() is served from a per-agent token index kept in
+      sync with ring eviction; verify_index=True cross-checks it with a scan.
+    - search() returns (contents, epoch timestamps) columns for vectorized scoring.
+    - Thread-safe: each agent's ring is guarded by one of `stripes` locks, so
+      agents writing concurrently rarely contend.
     """
-    def __init__(self, max_length=Defaults.EP_MAX_LENGTH, strict_mode=Defaults.STRICT_MODE):
+    def __init__(self, max_length=Defaults.EP_MAX_LENGTH, strict_mode=Defaults.STRICT_MODE,
+                 use_index=Defaults.EP_TOKEN_INDEX, verify_index=Defaults.EP_VERIFY_INDEX,
+                 stripes=Defaults.LOCK_STRIPES):
         if max_length <= 0:
             raise ValueError("Max Length must be > 0")
         self.memory = {}
         self.max_length = max_length
         self.strict_mode = strict_mode
+        self.use_index = use_index
+        self.verify_index = verify_index
+        # Agents write from AsyncRuntime worker threads; ring + index updates must stay paired
+        self._locks = _LockStripes(stripes)
 
-    def store(self, agent_id: str, content: str):
-        """Store an event for an agent."""
+    def store(self, agent_id: str, content: str, timestamp=None):
+        """Store an event for an agent.
+        timestamp: ISO-8601 string or epoch seconds; defaults to now.
+        """
         if not isinstance(agent_id, str) or not agent_id.strip():
             raise ValueError("Agent ID is missing or invalid")
         if not isinstance(content, str) or not content.strip():
             return
-        if agent_id not in self.memory:
-            if self.strict_mode:
-                raise KeyError(f"Agent '{agent_id}' not in memory")
-            self.memory[agent_id] = deque(maxlen=self.max_length)
-        event = {
-            "timestamp": datetime.datetime.now(timezone.utc).isoformat(),
-            "agent_id": agent_id,
-            "content": content,
-        }
-        self.memory[agent_id].append(event)
+        epoch = time.time() if timestamp is None else to_epoch(timestamp)
+        with self._locks.lock(agent_id):
+            ring = self.memory.get(agent_id)
+            if ring is None:
+                if self.strict_mode:
+                    raise KeyError(f"Agent '{agent_id}' not in memory")
+                ring = self.memory[agent_id] = _EpisodeRing(agent_id, self.max_length, self.use_index)
+            ring.append(content, epoch)
 
     def get_recent(self, agent_id: str, n: int = 5) -> List[dict]:
         """Return up to n most recent events for agent.
         In strict mode, raises KeyError if agent has no events.
         """
-        if agent_id not in self.memory:
+        ring = self.memory.get(agent_id)
+        if ring is None:
             if self.strict_mode:
                 raise KeyError(f"Agent '{agent_id}' not in memory")
             return []
-        return list(self.memory[agent_id])[-n:]
+        if n <= 0:
+            return []
+        with self._locks.lock(agent_id):
+            return [ring.event(s) for s in ring.seqs()[-n:]]
 
     def retrieve(self, agent_id: str, query: str) -> List[dict]:
         """Retrieve events for an agent containing the query string."""
-        if agent_id not in self.memory:
+        ring = self.memory.get(agent_id)
+        if ring is None:
             return []
+        with self._locks.lock(agent_id):
+            return [ring.event(s) for s in self._match(ring, query)]
+
+    def search(self, agent_id: str, query: str) -> Tuple[List[str], np.ndarray]:
+        """Like retrieve(), but as (contents, epoch timestamps) columns, oldest first."""
+        ring = self.memory.get(agent_id)
+        if ring is None:
+            return [], np.empty(0, dtype=np.float64)
+        with self._locks.lock(agent_id):
+            return ring.columns(self._match(ring, query))
+
+    def _match(self, ring: _EpisodeRing, query: str) -> List[int]:
+        # Caller holds the agent's stripe
         q = query.lower()
-        events = [e for e in self.memory[agent_id] if q in e["content"].lower()]
-        return events
+        if not self.use_index:
+            return ring.scan(q)
+        seqs = ring.search(q)
+        if self.verify_index:
+            expected = ring.scan(q)
+            if seqs != expected:
+                raise RuntimeError(
+                    f"Episodic index mismatch for '{ring.agent_id}' query '{query}': "
+                    f"index={len(seqs)} scan={len(expected)}"
+                )
+        return seqs
 
 
 class KnowledgeGraph:
@@ -65,9 +311,64 @@ class KnowledgeGraph:
 
     - add_node(agent_id, content, context): adds nodes and edge context -> content
     - get_related(node, depth): returns list of {src, dst} edges by traversing predecessors
+    - search(query, top_k): node ids containing the normalized query, in insertion order
+    - prune(budget_ms): drop nodes (and their edges) unwritten for ttl_seconds, or
+      least recently written beyond max_nodes, in a time-boxed incremental step
+    - Provenance is bounded: count, first_seen/last_seen and the most recent
+      provenance_sample timestamps (None keeps all).
+    - Thread-safe: a node's attributes and adjacency are guarded by its shard
+      (one of `stripes` locks); edges hold both endpoint shards.
     """
-    def __init__(self):
+    def __init__(self, use_index=Defaults.KG_SUBSTRING_INDEX, stripes=Defaults.LOCK_STRIPES,
+                 provenance_sample=Defaults.KG_PROVENANCE_SAMPLE, ttl_seconds=Defaults.KG_TTL_SECONDS,
+                 max_nodes=Defaults.KG_MAX_NODES):
         self.graph = nx.DiGraph()
+        prunable = bool(ttl_seconds or max_nodes)
+        self.index = TrigramIndex(track_ids=prunable) if use_index else None
+        self._shards = _LockStripes(stripes)
+        # Trigram postings are shared by all nodes; held only while (un)indexing one id
+        self._index_lock = threading.Lock()
+        self.provenance_sample = provenance_sample
+        self.ttl_seconds = ttl_seconds
+        self.max_nodes = max_nodes
+        # Last-write order (node -> epoch), oldest first; only tracked when pruning is configured
+        self._seen = OrderedDict() if prunable else None
+        self._seen_lock = threading.Lock()
+        self.prune_stats = {"steps": 0, "pruned_nodes": 0, "pruned_edges": 0}
+
+    def _ensure_node(self, node_id: str):
+        """Create node_id with empty provenance if missing; caller holds its shard."""
+        if node_id not in self.graph:
+            self.graph.add_node(node_id, agent_ids=set(), timestamps=deque(maxlen=self.provenance_sample),
+                                tags=set(), count=0, first_seen=None, last_seen=None)
+            if self.index is not None:
+                with self._index_lock:
+                    self.index.add(node_id)
+            self._touch(node_id, time.time())
+
+    def _touch(self, node_id: str, epoch: float):
+        # Caller holds node_id's shard
+        if self._seen is not None:
+            with self._seen_lock:
+                self._seen[node_id] = epoch
+                self._seen.move_to_end(node_id)
+
+    def _stamp(self, node_id: str, agent_id: Optional[str], timestamp: Optional[str], tags):
+        with self._shards.lock(node_id):
+            self._ensure_node(node_id)
+            attrs = self.graph.nodes[node_id]
+            attrs["count"] += 1
+            if agent_id:
+                attrs["agent_ids"].add(agent_id)
+            if timestamp:
+                attrs["timestamps"].append(timestamp)
+                if attrs["first_seen"] is None:
+                    attrs["first_seen"] = timestamp
+                attrs["last_seen"] = timestamp
+            if tags:
+                attrs["tags"].update(tags)
+            if self._seen is not None:
+                self._touch(node_id, to_epoch(timestamp) if timestamp else time.time())
 
     def add_node(self, agent_id: str, content: str, context: Optional[str] = None, timestamp: Optional[str] = None, tags=None):
         """Add a content node (and optional context) with provenance.
@@ -78,24 +379,10 @@ class KnowledgeGraph:
         content_id = normalize_id(content)
         if not content_id:
             return
-        if content_id not in self.graph:
-            self.graph.add_node(content_id, agent_ids=set(), timestamps=[], tags=set())
-        if agent_id:
-            self.graph.nodes[content_id]["agent_ids"].add(agent_id)
-        if timestamp:
-            self.graph.nodes[content_id]["timestamps"].append(timestamp)
-        if tags:
-            self.graph.nodes[content_id]["tags"].update(tags)
+        self._stamp(content_id, agent_id, timestamp, tags)
         if context:
             ctx_id = normalize_id(context)
-            if ctx_id not in self.graph:
-                self.graph.add_node(ctx_id, agent_ids=set(), timestamps=[], tags=set())
-            if agent_id:
-                self.graph.nodes[ctx_id]["agent_ids"].add(agent_id)
-            if timestamp:
-                self.graph.nodes[ctx_id]["timestamps"].append(timestamp)
-            if tags:
-                self.graph.nodes[ctx_id]["tags"].update(tags)
+            self._stamp(ctx_id, agent_id, timestamp, tags)
             self.add_edge(ctx_id, content_id, edge_type=EdgeType.CONTEXT)
 
     def add_edge(self, src: str, dst: str, edge_type: EdgeType = EdgeType.CONTEXT):
@@ -103,16 +390,30 @@ class KnowledgeGraph:
         src, dst = normalize_id(src), normalize_id(dst)
         if not src or not dst:
             return
-        if src not in self.graph:
-            self.graph.add_node(src, agent_ids=set(), timestamps=[], tags=set())
-        if dst not in self.graph:
-            self.graph.add_node(dst, agent_ids=set(), timestamps=[], tags=set())
-        self.graph.add_edge(src, dst, type=edge_type)
+        # src's successors and dst's predecessors are both written
+        with self._shards.hold(src, dst):
+            self._ensure_node(src)
+            self._ensure_node(dst)
+            self.graph.add_edge(src, dst, type=edge_type)
+
+    def search(self, query: str, top_k: Optional[int] = None) -> List[str]:
+        """Return node ids containing normalize_id(query), in insertion order."""
+        q = normalize_id(query)
+        if self.index is not None:
+            return self.index.search(q, top_k)
+        hits = [node for node in list(self.graph) if q in node]
+        return hits if top_k is None else hits[:top_k]
 
     def get_node(self, node_id: str) -> dict:
         """Get a node by its ID."""
         node_id = normalize_id(node_id)
-        return self.graph.nodes.get(node_id, {})
+        with self._shards.lock(node_id):
+            attrs = self.graph.nodes.get(node_id)
+            if attrs is None:
+                return {}
+            # A copy, so callers never observe (or race with) later writes
+            return {**attrs, "agent_ids": set(attrs["agent_ids"]), "tags": set(attrs["tags"]),
+                    "timestamps": list(attrs["timestamps"])}
 
     def get_related(self, node_id: str, depth: int = Defaults.KG_DEFAULT_DEPTH) -> List[dict]:
         """BFS over predecessors up to depth, returning edge dicts {src, dst}.
@@ -129,13 +430,82 @@ class KnowledgeGraph:
             if d >= depth:
                 continue
             # Use predecessors so that if context -> content, querying content returns its contexts
-            for neighbor in self.graph.predecessors(current):
+            with self._shards.lock(current):
+                preds = list(self.graph.pred[current])
+            for neighbor in preds:
                 related.append({"src": current, "dst": neighbor})
                 if neighbor not in visited:
                     visited.add(neighbor)
                     queue.append((neighbor, d + 1))
         return related
 
+    def prune(self, budget_ms: float = Defaults.KG_PRUNE_BUDGET_MS, now: Optional[float] = None) -> dict:
+        """Remove stale nodes oldest-write first until none is stale or budget_ms elapses.
+
+        A node is stale if its last write is older than ttl_seconds, or if the
+        graph holds more than max_nodes. Each node is removed under its own and
+        its neighbours' shards only, so writers elsewhere in the graph proceed.
+        Returns this step's {"pruned_nodes", "pruned_edges", "remaining"}.
+        """
+        step = {"pruned_nodes": 0, "pruned_edges": 0, "remaining": 0}
+        if self._seen is None:
+            return step
+        now = time.time() if now is None else now
+        cutoff = now - self.ttl_seconds if self.ttl_seconds else None
+        deadline = time.perf_counter() + budget_ms / 1000
+        while True:
+            with self._seen_lock:
+                if not self._seen:
+                    break
+                node_id, epoch = next(iter(self._seen.items()))
+                over = self.max_nodes is not None and len(self._seen) > self.max_nodes
+            if not over and (cutoff is None or epoch >= cutoff):
+                break
+            edges = self._remove_node(node_id)
+            if edges is not None:
+                step["pruned_nodes"] += 1
+                step["pruned_edges"] += edges
+            if time.perf_counter() >= deadline:
+                break
+        # Spend what is left of the slice stripping tombstones from index postings
+        while self.index is not None and self.index.vacuum_due() and time.perf_counter() < deadline:
+            with self._index_lock:
+                self.index.vacuum_step()
+        with self._seen_lock:
+            step["remaining"] = len(self._seen)
+        self.prune_stats["steps"] += 1
+        self.prune_stats["pruned_nodes"] += step["pruned_nodes"]
+        self.prune_stats["pruned_edges"] += step["pruned_edges"]
+        return step
+
+    def _remove_node(self, node_id: str) -> Optional[int]:
+        """Remove node_id if it is still the least recently written; returns edges removed."""
+        while True:
+            with self._shards.lock(node_id):
+                if node_id not in self.graph:
+                    nbrs = None
+                else:
+                    nbrs = set(self.graph.pred[node_id]) | set(self.graph.succ[node_id])
+            if nbrs is None:
+                with self._seen_lock:
+                    self._seen.pop(node_id, None)
+                return None
+            with self._shards.hold(node_id, *nbrs):
+                if node_id not in self.graph:
+                    continue
+                pred, succ = set(self.graph.pred[node_id]), set(self.graph.succ[node_id])
+                if not (pred | succ) <= nbrs:
+                    continue  # gained a neighbour whose shard we don't hold; retry
+                with self._seen_lock:
+                    if next(iter(self._seen), None) != node_id:
+                        return None  # written again since it was picked
+                    del self._seen[node_id]
+                self.graph.remove_node(node_id)
+                if self.index is not None:
+                    with self._index_lock:
+                        self.index.remove(node_id)
+                return len(pred) + len(succ) - (node_id in pred)
+
 
 class SharedMemory:
     """Facade combining episodic memory and knowledge graph.
@@ -143,67 +513,231 @@ class SharedMemory:
     - write(): stores event and updates KG (context -> content; task -> content)
     - get_recent(): delegates to episodic memory (agent prefix enforced)
     - retrieve(): returns list of {"content": str} from hybrid search
+      (episodic keyword + time decay, KG substring, and optional semantic similarity),
+      memoized in a version-checked LRU cache
+    - policy.WRITE_MODE="async": write() only enqueues; flush() is the read-your-writes barrier
+    - Safe to share between agent threads; policy.LOCK_STRIPES sets lock granularity
     """
     def __init__(self, policy=Defaults):
         self.policy = policy
-        self.short_term = EpisodicMemory(max_length=policy.EP_MAX_LENGTH, strict_mode=policy.STRICT_MODE)
-        self.long_term = KnowledgeGraph()
+        self._writer = None
+        self.short_term = EpisodicMemory(max_length=policy.EP_MAX_LENGTH, strict_mode=policy.STRICT_MODE,
+                                         stripes=policy.LOCK_STRIPES)
+        if policy.KG_PERSIST_DIR:
+            from .persistence import PersistentKnowledgeGraph
+            self.long_term = PersistentKnowledgeGraph(
+                policy.KG_PERSIST_DIR, snapshot_every=policy.KG_SNAPSHOT_EVERY,
+                use_index=policy.KG_SUBSTRING_INDEX, provenance_sample=policy.KG_PROVENANCE_SAMPLE,
+            )
+        elif policy.KG_BACKEND == "compact":
+            from .compact_graph import CompactKnowledgeGraph
+            self.long_term = CompactKnowledgeGraph(use_index=policy.KG_SUBSTRING_INDEX,
+                                                   provenance_sample=policy.KG_PROVENANCE_SAMPLE)
+        else:
+            self.long_term = KnowledgeGraph(use_index=policy.KG_SUBSTRING_INDEX, stripes=policy.LOCK_STRIPES,
+                                            provenance_sample=policy.KG_PROVENANCE_SAMPLE,
+                                            ttl_seconds=policy.KG_TTL_SECONDS, max_nodes=policy.KG_MAX_NODES)
+        # Incremental TTL/LRU pruning piggybacks on every KG_PRUNE_EVERY-th write
+        self._prune_every = policy.KG_PRUNE_EVERY if getattr(self.long_term, "_seen", None) is not None else 0
+        self._writes = itertools.count(1)
+        self.semantic = None
+        if policy.SEM_RETRIEVAL:
+            from .semantic import SemanticIndex
+            self.semantic = SemanticIndex(dim=policy.SEM_DIM, chunk=policy.SEM_CHUNK,
+                                          min_score=policy.SEM_MIN_SCORE,
+                                          max_per_agent=policy.SEM_MAX_PER_AGENT)
+        self._cache = None
+        if policy.RETRIEVE_CACHE_SIZE:
+            from .query_cache import QueryCache
+            self._cache = QueryCache(policy.RETRIEVE_CACHE_SIZE)
+        self._version_clock = itertools.count(1)
+        self._agent_versions = {}
+        self._graph_adds = 0
+        self._graph_removals = 0
+        if policy.WRITE_MODE == "async":
+            from .write_pipeline import WriteBehind
+            self._writer = WriteBehind(self._apply_write, batch_size=policy.WRITE_BATCH)
 
-    def write(self, agent_id: str, content: str, context: Optional[str] = None):
+    def write(self, agent_id: str, content, context: Optional[str] = None):
         """Persist content for agent, optionally linking a context.
         Also extracts 'task\\d+' and links task -> content.
+        content may be a LazyText; in async mode it is only formatted on the writer thread.
         """
+        if self._writer is not None:
+            self._writer.submit((agent_id, content, context, time.time()))
+            return
+        self._apply_write(agent_id, content, context)
+
+    def _apply_write(self, agent_id: str, content, context: Optional[str] = None,
+                     created: Optional[float] = None):
+        if isinstance(content, LazyText):
+            content = str(content)
         agent_id = ensure_agent_prefix(agent_id, self.policy.AGENT_PREFIX)
-        self.short_term.store(agent_id, content)
-        timestamp = datetime.datetime.now(timezone.utc).isoformat()
+        epoch = created or time.time()
+        timestamp = datetime.datetime.fromtimestamp(epoch, timezone.utc).isoformat()
+        self.short_term.store(agent_id, content, timestamp=epoch)
+        if self.semantic is not None:
+            self.semantic.add(agent_id, content, epoch)
         # add to KG with provenance and optional context edge
         self.long_term.add_node(agent_id, content, context=context, timestamp=timestamp)
-        task_match = re.search(r"task(\d+)", content, re.IGNORECASE)
+        task_match = _TASK_REF.search(content)
         if task_match:
             task_id = ensure_task_id(task_match.group(1), self.policy.TASK_PREFIX)
             # Add the task node and connect it to the content
             self.long_term.add_node(agent_id, task_id, timestamp=timestamp)
             self.long_term.add_edge(task_id, content, edge_type=EdgeType.ASSIGNED_TO)
+        # After the mutations, so a reader that saw the old versions never caches newer data as current
+        self._bump_versions(agent_id)
+        if self._prune_every and next(self._writes) % self._prune_every == 0:
+            if self.long_term.prune(self.policy.KG_PRUNE_BUDGET_MS)["pruned_nodes"]:
+                self._graph_removals = next(self._version_clock)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Barrier: wait until every write issued so far is applied (no-op in sync mode).
+
+        Re-raises the first background write error since the last flush()/close().
+        """
+        if self._writer is not None:
+            self._writer.flush(timeout)
+
+    def _read_barrier(self):
+        # Only waits: a failed write is reported by the next flush()/close(), not to an unrelated reader
+        if self._writer is not None and self.policy.ASYNC_READ_BARRIER:
+            self._writer.drain()
+
+    def writer_stats(self) -> dict:
+        """Background writer counters (empty in sync mode)."""
+        if self._writer is None:
+            return {}
+        return {**self._writer.stats, "pending": self._writer.pending()}
+
+    def close(self):
+        """Drain pending writes and close the persistent knowledge graph, if any."""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        close = getattr(self.long_term, "close", None)
+        if close is not None:
+            close()
 
     def get_recent(self, agent_id: str, n: int = 5) -> List[dict]:
         """Return recent episodic events for the agent (with agent prefix normalization)."""
+        self._read_barrier()
         agent_id = ensure_agent_prefix(agent_id, self.policy.AGENT_PREFIX)
         return self.short_term.get_recent(agent_id, n)
 
     def retrieve(self, agent_id: str, query: str) -> List[dict]:
-        """Hybrid retrieval, returning list of dicts {"content": str}."""
-        ep_hits = self.search_episodes(agent_id, query)
-        kg_hits = self.search_kg(query)
-        combined = ep_hits[: self.policy.EP_BUCKET_CAP] + kg_hits[: self.policy.KG_BUCKET_CAP]
+        """Hybrid retrieval, returning list of dicts {"content": str}.
+
+        With policy.RETRIEVE_CACHE_SIZE > 0, results are memoized per
+        (agent_id, lowercased query, retrieval policy). An entry is reused only
+        while the agent's version is unchanged, no KG node was removed, the KG
+        bucket is either full (new nodes sort after it) or no node was added,
+        and no scored hit has crossed a whole-day age boundary.
+        RETRIEVE_CACHE_VERIFY recomputes every hit and raises on divergence.
+        Only mutations made through write() (and pruning) are tracked; writing
+        to short_term/long_term directly requires clearing the cache.
+        """
+        self._read_barrier()
+        now = time.time()
+        if self._cache is None:
+            return [{"content": c} for c in self._retrieve(agent_id, query, now)[0]]
+        key = (agent_id, query.lower(), self._retrieval_policy())
+        # Read versions before computing: a concurrent write then bumps past them
+        versions = self._versions_for(agent_id)
+        entry = self._cache.get(key, lambda e: self._entry_valid(e, versions, now))
+        if entry is not None:
+            contents = entry[0]
+            if self.policy.RETRIEVE_CACHE_VERIFY:
+                expected = self._retrieve(agent_id, query, now)[0]
+                if contents != expected:
+                    raise RuntimeError(
+                        f"Retrieve cache mismatch for '{agent_id}' query '{query}': "
+                        f"cached={list(contents)} fresh={list(expected)}"
+                    )
+        else:
+            contents, kg_full, expires = self._retrieve(agent_id, query, now)
+            self._cache.put(key, (contents, kg_full, expires, versions))
+        return [{"content": c} for c in contents]
+
+    def _retrieve(self, agent_id: str, query: str, now: float) -> Tuple[Tuple[str, ...], bool, float]:
+        """Uncached retrieve at time now: (contents, KG bucket full, time-valid-until)."""
+        ep_hits, ep_expires = self._score_episodes(agent_id, query, now)
+        kg_hits = self.search_kg(query, top_k=self.policy.KG_BUCKET_CAP)
+        sem_hits, sem_expires = self._score_semantic(agent_id, query, self.policy.SEM_BUCKET_CAP, now)
+        combined = (ep_hits[: self.policy.EP_BUCKET_CAP] + kg_hits[: self.policy.KG_BUCKET_CAP]
+                    + sem_hits[: self.policy.SEM_BUCKET_CAP])
         seen = set()
         results = []
         for content, score in sorted(combined, key=lambda x: x[1], reverse=True):
             if content not in seen:
-                results.append({"content": content})
+                results.append(content)
                 seen.add(content)
             if len(results) >= self.policy.FINAL_TOPK:
                 break
-        return results
+        return tuple(results), len(kg_hits) >= self.policy.KG_BUCKET_CAP, min(ep_expires, sem_expires)
+
+    def _retrieval_policy(self) -> tuple:
+        p = self.policy
+        return (p.EP_BUCKET_CAP, p.KG_BUCKET_CAP, p.SEM_BUCKET_CAP, p.FINAL_TOPK, p.DECAY_WINDOW_DAYS,
+                p.EP_SCORE_KEYWORD_W, p.EP_SCORE_TIME_W, p.KG_SCORE_KEYWORD_W, p.SEM_SCORE_W)
+
+    def _versions_for(self, agent_id: str) -> tuple:
+        prefixed = ensure_agent_prefix(agent_id, self.policy.AGENT_PREFIX)
+        return (self._agent_versions.get(agent_id, 0), self._agent_versions.get(prefixed, 0),
+                self._graph_adds, self._graph_removals)
+
+    @staticmethod
+    def _entry_valid(entry, versions: tuple, now: float) -> bool:
+        _, kg_full, expires, cached = entry
+        if cached[:2] != versions[:2] or cached[3] != versions[3] or now >= expires:
+            return False
+        return kg_full or cached[2] == versions[2]
+
+    def _bump_versions(self, agent_id: str):
+        # One shared clock keeps bumps atomic under concurrent writers
+        self._agent_versions[agent_id] = next(self._version_clock)
+        self._graph_adds = next(self._version_clock)
+
+    def cache_stats(self) -> dict:
+        """Retrieve cache counters (empty when the cache is disabled)."""
+        return self._cache.stats if self._cache is not None else {}
 
     def search_episodes(self, agent_id: str, query: str) -> List[Tuple[str, float]]:
-        events = self.short_term.retrieve(agent_id, query)
-        scored = []
-        now = datetime.datetime.now(timezone.utc)
-        for e in events:
-            ts = datetime.datetime.fromisoformat(e["timestamp"])
-            age_days = (now - ts).days
-            score_time = decay_linear(age_days, self.policy.DECAY_WINDOW_DAYS)
-            score = (self.policy.EP_SCORE_KEYWORD_W * (query.lower() in e["content"].lower())) + (
-                self.policy.EP_SCORE_TIME_W * score_time
-            )
-            scored.append((e["content"], score))
-        return sorted(scored, key=lambda x: x[1], reverse=True)
+        return self._score_episodes(agent_id, query, time.time())[0]
 
-    def search_kg(self, query: str) -> List[Tuple[str, float]]:
-        results = []
-        q = normalize_id(query)
-        for node in self.long_term.graph.nodes:
-            if q in node:
-                score = self.policy.KG_SCORE_KEYWORD_W
-                results.append((node, score))
-        return sorted(results, key=lambda x: x[1], reverse=True)
+    def _score_episodes(self, agent_id: str, query: str, now: float) -> Tuple[List[Tuple[str, float]], float]:
+        contents, ts = self.short_term.search(agent_id, query)
+        if not contents:
+            return [], math.inf
+        # Whole days, as timedelta.days; decay_linear vectorized over all hits
+        ages = (now - ts) / SECONDS_PER_DAY
+        age_days = np.floor(ages)
+        score_time = np.clip(1.0 - age_days / self.policy.DECAY_WINDOW_DAYS, 0.0, 1.0)
+        # Every hit contains the query case-insensitively, so the keyword term is constant
+        scores = self.policy.EP_SCORE_KEYWORD_W + self.policy.EP_SCORE_TIME_W * score_time
+        expires = now + float(np.min(age_days + 1 - ages)) * SECONDS_PER_DAY
+        return [(contents[i], float(scores[i])) for i in np.argsort(-scores, kind="stable")], expires
+
+    def search_kg(self, query: str, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        # All KG hits share one score, so the insertion-ordered top_k matches the old sort-then-cap
+        score = self.policy.KG_SCORE_KEYWORD_W
+        return [(node, score) for node in self.long_term.search(query, top_k)]
+
+    def search_semantic(self, agent_id: str, query: str, top_k: Optional[int] = None) -> List[Tuple[str, float]]:
+        """Agent's memories ranked by cosine similarity blended with time decay."""
+        return self._score_semantic(agent_id, query, top_k or self.policy.SEM_BUCKET_CAP, time.time())[0]
+
+    def _score_semantic(self, agent_id: str, query: str, top_k: int, now: float) -> Tuple[List[Tuple[str, float]], float]:
+        if self.semantic is None:
+            return [], math.inf
+        agent_id = ensure_agent_prefix(agent_id, self.policy.AGENT_PREFIX)
+        hits = self.semantic.search(agent_id, query, top_k, now)
+        scored = [
+            (text, self.policy.SEM_SCORE_W * cos
+             + self.policy.EP_SCORE_TIME_W * decay_linear(int(age), self.policy.DECAY_WINDOW_DAYS))
+            for text, cos, age in hits
+        ]
+        # floor-based boundary is never later than the int(age) one
+        expires = min((now + (math.floor(age) + 1 - age) * SECONDS_PER_DAY for _, _, age in hits), default=math.inf)
+        return scored, expires
@@ -21,23 +21,93 @@ class Defaults:
     DECAY_WINDOW_DAYS = 30
     EP_SCORE_KEYWORD_W = 0.7
     EP_SCORE_TIME_W = 0.3
+    EP_TOKEN_INDEX = True       # serve retrieve() from the per-agent token index
+    EP_VERIFY_INDEX = False     # cross-check index hits against a linear scan
 
     # Knowledge Graph
     KG_DEFAULT_DEPTH = 1
     KG_NEIGHBOR_LIMIT = 3
     KG_SCORE_KEYWORD_W = 0.6
     KG_SCORE_TIME_W = 0.4
+    KG_SUBSTRING_INDEX = True   # trigram index over node ids for search_kg
+    KG_BACKEND = "networkx"     # or "compact" (memory.compact_graph.CompactKnowledgeGraph)
+    KG_PERSIST_DIR = None       # directory for snapshot + log persistence (implies compact)
+    KG_SNAPSHOT_EVERY = 100_000 # log records between automatic snapshots
+    KG_PROVENANCE_SAMPLE = 16   # recent timestamps kept per node, besides count/first/last seen
+    KG_TTL_SECONDS = None       # prune nodes not written for this long (networkx backend)
+    KG_MAX_NODES = None         # prune least recently written nodes beyond this (networkx backend)
+    KG_PRUNE_EVERY = 256        # writes between incremental prune steps
+    KG_PRUNE_BUDGET_MS = 5.0    # time slice of one prune step (paid by the triggering write only)
+
+    # Write pipeline
+    WRITE_MODE = "sync"         # or "async": writes are applied by one background thread
+    WRITE_BATCH = 256           # writes applied per background wakeup
+    ASYNC_READ_BARRIER = True   # reads flush pending writes first (read-your-writes)
+
+    # Concurrency
+    LOCK_STRIPES = 64           # locks striping agents (episodic) and nodes (graph); 1 = global lock
+
+    # Semantic retrieval (memory.semantic, offline hashed n-gram embeddings)
+    SEM_RETRIEVAL = False       # opt-in: embeds every write, paid on the write path
+    SEM_DIM = 256
+    SEM_CHUNK = 1024            # rows added per matrix growth step (at least)
+    SEM_MAX_PER_AGENT = 4096    # distinct texts kept per agent; least recently written is evicted
+    SEM_MIN_SCORE = 0.2         # cosine below this is not a hit
+    SEM_SCORE_W = 0.5           # weight of cosine; time decay reuses EP_SCORE_TIME_W
 
     # Hybrid retrieval
     FINAL_TOPK = 10
     EP_BUCKET_CAP = 5
     KG_BUCKET_CAP = 5
+    SEM_BUCKET_CAP = 5
+    RETRIEVE_CACHE_SIZE = 1024  # memoized retrieve() results (0 disables)
+    RETRIEVE_CACHE_VERIFY = False  # recompute on every cache hit and raise on divergence
 
     # Normalization
     AGENT_PREFIX = "agent:"
     TASK_PREFIX = "task:"
 
 
+_ATOMIC = frozenset({str, int, float, bool, bytes, type(None)})
+
+
+def _snapshot(value):
+    """Copy of the plain containers (dict/list/tuple/set) in value; leaves are shared.
+
+    Cheaper than formatting (no text is built), and the copy repr()s the
+    same as the original did at the time of the call.
+    """
+    t = type(value)
+    if t is dict:
+        return {k: v if type(v) in _ATOMIC else _snapshot(v) for k, v in value.items()}
+    if t is list:
+        return [v if type(v) in _ATOMIC else _snapshot(v) for v in value]
+    if t is tuple:
+        return tuple(v if type(v) in _ATOMIC else _snapshot(v) for v in value)
+    if t is set:
+        return set(value)
+    return value
+
+
+class LazyText:
+    """Deferred str.format: the text is only built when str() is called.
+
+    Lets callers hand large reprs (e.g. whole result lists) to SharedMemory.write
+    without paying for formatting on the calling thread in async write mode.
+    Container args are snapshotted on construction, so the text reflects them
+    as they were then even if the caller keeps mutating them while the write
+    is queued.
+    """
+    __slots__ = ("fmt", "args")
+
+    def __init__(self, fmt: str, *args):
+        self.fmt = fmt
+        self.args = tuple(a if type(a) in _ATOMIC else _snapshot(a) for a in args)
+
+    def __str__(self) -> str:
+        return self.fmt.format(*self.args)
+
+
 #  Normalization helpers 
 
 _WS = re.compile(r'\s+')
@@ -84,7 +154,7 @@ def lists_to_sets(d: dict) -> dict:
 
 
 __all__ = [
-    "EdgeType", "Defaults",
+    "EdgeType", "Defaults", "LazyText",
     "normalize_id", "ensure_agent_prefix", "ensure_task_id",
     "decay_linear", "sets_to_lists", "lists_to_sets"
 ]
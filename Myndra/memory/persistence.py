@@ -0,0 +1,270 @@
+"""Durable KnowledgeGraph: compacted binary snapshots plus an append-only mutation log.
+
+Directory layout::
+
+    snapshot.bin     columns of a CompactKnowledgeGraph (see export_columns)
+    kg.<gen>.log     add_node/add_edge records written after snapshot <gen>
+
+Every mutation is applied to the in-memory graph and appended to the current
+log. Every ``snapshot_every`` records (or on ``snapshot()``) the graph is
+written to a temporary file, fsynced and atomically renamed over
+snapshot.bin, after which a fresh log generation starts and older logs are
+deleted. Loading reads each column straight into a preallocated array and
+replays the matching log. A torn or corrupt log tail (crash
+mid-write) is detected by a per-record CRC and truncated.
+"""
+
+import os
+import struct
+import threading
+import zlib
+from array import array
+from typing import Dict, List, Optional
+
+from .compact_graph import CompactKnowledgeGraph
+from .memory_types import Defaults, EdgeType
+
+_MAGIC = b"MYKG"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIQI")        # magic, version, generation, section count
+_SECTION = struct.Struct("<16scBQQ")     # name, typecode, itemsize, offset, nbytes
+_RECORD = struct.Struct("<IIB")          # payload length, crc32, op
+_NONE = 0xFFFFFFFF
+_OP_NODE, _OP_EDGE = 1, 2
+_EDGE_TYPES = list(EdgeType)
+_EDGE_CODE = {t: i for i, t in enumerate(_EDGE_TYPES)}
+
+
+# Snapshot I/O
+
+def write_snapshot(path: str, kg: CompactKnowledgeGraph, generation: int, fsync: bool = True):
+    """Atomically write kg's columns to path."""
+    cols = kg.export_columns()
+    names = sorted(cols)
+    offset = _HEADER.size + _SECTION.size * len(names)
+    table = []
+    for name in names:
+        offset += -offset % 8  # keep every column 8-byte aligned
+        nbytes = len(cols[name]) * cols[name].itemsize
+        table.append((name, offset, nbytes))
+        offset += nbytes
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(_MAGIC, _VERSION, generation, len(names)))
+        for name, off, nbytes in table:
+            col = cols[name]
+            f.write(_SECTION.pack(name.encode(), col.typecode.encode(), col.itemsize, off, nbytes))
+        for name, off, _ in table:
+            f.write(b"\0" * (off - f.tell()))
+            cols[name].tofile(f)
+        f.flush()
+        if fsync:
+            os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def read_snapshot(path: str, use_index: bool = Defaults.KG_SUBSTRING_INDEX):
+    """Return (graph, generation) from a snapshot file.
+
+    The graph adopts the columns and keeps appending to them, so they must
+    be owned, growable arrays rather than views of the file; each column is
+    allocated once at its final size and filled with a single readinto().
+    """
+    with open(path, "rb", buffering=0) as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"Not a Myndra KG snapshot (v{_VERSION}): {path}")
+        magic, version, generation, count = _HEADER.unpack(header)
+        if magic != _MAGIC or version != _VERSION:
+            raise ValueError(f"Not a Myndra KG snapshot (v{_VERSION}): {path}")
+        table = f.read(_SECTION.size * count)
+        cols: Dict[str, array] = {}
+        for i in range(count):
+            name, typecode, itemsize, off, nbytes = _SECTION.unpack_from(table, i * _SECTION.size)
+            col = array(typecode.decode())
+            if col.itemsize != itemsize:
+                raise ValueError(f"Snapshot column '{name}' written with itemsize {itemsize}")
+            if nbytes:
+                col = array(col.typecode, bytes(col.itemsize)) * (nbytes // itemsize)
+                f.seek(off)
+                with memoryview(col) as view, view.cast("B") as raw:
+                    if f.readinto(raw) != nbytes:
+                        raise ValueError(f"Snapshot column '{name}' is truncated: {path}")
+            cols[name.rstrip(b"\0").decode()] = col
+    return CompactKnowledgeGraph.from_columns(cols, use_index=use_index), generation
+
+
+# Log records
+
+def _pack_str(out: bytearray, value: Optional[str]):
+    if value is None:
+        out += struct.pack("<I", _NONE)
+    else:
+        raw = value.encode("utf-8")
+        out += struct.pack("<I", len(raw))
+        out += raw
+
+
+def _unpack_strs(payload: bytes) -> List[Optional[str]]:
+    values, pos = [], 0
+    while pos < len(payload):
+        (n,) = struct.unpack_from("<I", payload, pos)
+        pos += 4
+        if n == _NONE:
+            values.append(None)
+        else:
+            values.append(payload[pos:pos + n].decode("utf-8"))
+            pos += n
+    return values
+
+
+def _frame(op: int, payload: bytes) -> bytes:
+    return _RECORD.pack(len(payload), zlib.crc32(payload, op), op) + payload
+
+
+def replay_log(path: str, kg) -> int:
+    """Apply every intact record in path to kg, truncating a torn tail. Returns records applied."""
+    if not os.path.exists(path):
+        return 0
+    applied, good = 0, 0
+    with open(path, "rb") as f:
+        data = f.read()
+    while good + _RECORD.size <= len(data):
+        length, crc, op = _RECORD.unpack_from(data, good)
+        start = good + _RECORD.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload, op) != crc:
+            break
+        fields = _unpack_strs(payload)
+        if op == _OP_NODE:
+            agent_id, content, context, timestamp, *tags = fields
+            kg.add_node(agent_id, content, context=context, timestamp=timestamp, tags=set(tags) or None)
+        elif op == _OP_EDGE:
+            src, dst, code = fields
+            kg.add_edge(src, dst, edge_type=_EDGE_TYPES[int(code)])
+        else:
+            break
+        applied += 1
+        good = start + length
+    if good < len(data):
+        with open(path, "r+b") as f:
+            f.truncate(good)
+    return applied
+
+
+class PersistentKnowledgeGraph:
+    """CompactKnowledgeGraph whose mutations survive restarts.
+
+    Args:
+        directory: Where snapshot.bin and kg.<gen>.log live (created if missing).
+        snapshot_every: Log records between automatic snapshots (0 disables).
+        fsync: fsync the log after every record (durable but slow). Otherwise
+            each record is written straight to the OS page cache (the log is
+            unbuffered), which survives a process crash but not a power
+            loss; snapshots are always fsynced.
+
+    Mutations hold one lock across apply + append so the log replays in the
+    order the graph saw them.
+    """
+
+    def __init__(self, directory: str, snapshot_every: int = 100_000, fsync: bool = False,
+                 use_index: bool = Defaults.KG_SUBSTRING_INDEX,
+                 provenance_sample: Optional[int] = Defaults.KG_PROVENANCE_SAMPLE):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.use_index = use_index
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, "snapshot.bin")
+        self._remove_if_exists(f"{self._snapshot_path}.tmp")
+        if os.path.exists(self._snapshot_path):
+            self.graph, self.generation = read_snapshot(self._snapshot_path, use_index=use_index)
+        else:
+            self.graph, self.generation = CompactKnowledgeGraph(use_index=use_index), 0
+        self.graph.provenance_sample = provenance_sample
+        self.replayed = replay_log(self._log_path(self.generation), self.graph)
+        self._drop_stale_logs()
+        self._records = self.replayed
+        self._lock = threading.RLock()
+        self._log = self._open_log()
+
+    def _log_path(self, generation: int) -> str:
+        return os.path.join(self.directory, f"kg.{generation}.log")
+
+    def _open_log(self):
+        # Unbuffered: every framed record is one write() into the page cache, so a crashed
+        # process loses nothing it had already logged
+        return open(self._log_path(self.generation), "ab", buffering=0)
+
+    @staticmethod
+    def _remove_if_exists(path: str):
+        if os.path.exists(path):
+            os.remove(path)
+
+    def _drop_stale_logs(self):
+        for name in os.listdir(self.directory):
+            if name.startswith("kg.") and name.endswith(".log"):
+                gen = name[3:-4]
+                if gen.isdigit() and int(gen) < self.generation:
+                    os.remove(os.path.join(self.directory, name))
+
+    def _append(self, op: int, payload: bytes):
+        self._log.write(_frame(op, payload))
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self._records += 1
+        if self.snapshot_every and self._records >= self.snapshot_every:
+            self.snapshot()
+
+    # KnowledgeGraph API (mutations are logged, reads delegate to the graph)
+
+    def add_node(self, agent_id: str, content: str, context: Optional[str] = None, timestamp: Optional[str] = None, tags=None):
+        payload = bytearray()
+        for value in (agent_id, content, context, timestamp, *sorted(tags or ())):
+            _pack_str(payload, value)
+        with self._lock:
+            self.graph.add_node(agent_id, content, context=context, timestamp=timestamp, tags=tags)
+            self._append(_OP_NODE, bytes(payload))
+
+    def add_edge(self, src: str, dst: str, edge_type: EdgeType = EdgeType.CONTEXT):
+        payload = bytearray()
+        for value in (src, dst, str(_EDGE_CODE[EdgeType(edge_type)])):
+            _pack_str(payload, value)
+        with self._lock:
+            self.graph.add_edge(src, dst, edge_type=edge_type)
+            self._append(_OP_EDGE, bytes(payload))
+
+    def __contains__(self, node_id: str) -> bool:
+        return node_id in self.graph
+
+    def __getattr__(self, name):
+        # get_node, get_related, search, nodes, edges, ...
+        if name == "graph":
+            raise AttributeError(name)
+        return getattr(self.graph, name)
+
+    # Durability
+
+    def flush(self):
+        """Make logged records durable on disk when fsync=True (they already reach the OS on write)."""
+        with self._lock:
+            self._log.flush()
+            if self.fsync:
+                os.fsync(self._log.fileno())
+
+    def snapshot(self):
+        """Write a compacted snapshot and start a new, empty log generation."""
+        with self._lock:
+            self._log.flush()
+            write_snapshot(self._snapshot_path, self.graph, self.generation + 1)
+            self._log.close()
+            old = self._log_path(self.generation)
+            self.generation += 1
+            self._log = self._open_log()
+            self._remove_if_exists(old)
+            self._records = 0
+
+    def close(self):
+        with self._lock:
+            self._log.flush()
+            self._log.close()
@@ -0,0 +1,60 @@
+"""Bounded LRU cache for SharedMemory.retrieve results.
+
+Entries carry whatever validity token the caller stores with them; the
+cache itself only handles LRU order, size bounds and hit statistics. See
+SharedMemory.retrieve for how entries are keyed and invalidated.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class QueryCache:
+    """Thread-safe LRU map with hit/miss/stale/eviction counters."""
+
+    def __init__(self, max_size: int):
+        if max_size <= 0:
+            raise ValueError("Cache size must be > 0")
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "evictions": 0}
+
+    def get(self, key: Hashable, is_valid) -> Optional[Any]:
+        """Return the cached value if is_valid(value) holds; stale entries are dropped."""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self._stats["misses"] += 1
+                return None
+            if not is_valid(value):
+                del self._entries[key]
+                self._stats["stale"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                **self._stats,
+                "size": len(self._entries),
+                "hit_rate": self._stats["hits"] / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,171 @@
+"""Offline semantic retrieval for SharedMemory: hashed n-gram embeddings + cosine top-k.
+
+No model and no network: text is embedded by hashing word tokens and
+character n-grams (the "hashing trick") into a fixed-size, L2-normalized
+float32 vector, so the same text always yields the same vector. Paraphrases
+that share stems and word pieces ("x-ray" / "xray", "reviewed" / "reviewing")
+land close together even though a substring match misses them.
+
+Vectors are stored per agent in one contiguous matrix that grows in chunks
+(amortized, never row by row) up to a per-agent cap, after which the least
+recently written text is replaced; a query is a single mat-vec product
+followed by argpartition for the top-k. Disabled by default
+(Defaults.SEM_RETRIEVAL).
+"""
+
+import threading
+import zlib
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .memory_types import Defaults, normalize_id
+from .text_index import SECONDS_PER_DAY, TOKEN
+
+
+class HashedNgramEncoder:
+    """Deterministic text -> unit vector encoder.
+
+    Features are lowercased word tokens (crc32) plus character n-grams of
+    the space-padded text (a vectorized polynomial hash); both are stable
+    across processes, unlike hash(), and pick a bucket and a sign.
+    """
+
+    def __init__(self, dim: int = Defaults.SEM_DIM, ngrams: Tuple[int, ...] = (3, 4)):
+        if dim <= 0:
+            raise ValueError("Embedding dim must be > 0")
+        self.dim = dim
+        self.ngrams = ngrams
+
+    def _hashes(self, text: str) -> np.ndarray:
+        norm = normalize_id(text)
+        words = [zlib.crc32(f"w:{tok}".encode("utf-8")) for tok in TOKEN.findall(norm)]
+        parts = [np.array(words, dtype=np.uint64)]
+        # Character n-grams are hashed in bulk: a base-257 polynomial over the
+        # UTF-8 bytes (n-grams of different n cannot collide, since every byte is
+        # nonzero), then a Fibonacci multiply whose top 32 bits become the hash.
+        # Per-gram crc32 in Python dominated SharedMemory.write on long texts.
+        data = np.frombuffer(f" {norm} ".encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+        for n in self.ngrams:
+            count = len(data) - n + 1
+            if count <= 0:
+                continue
+            h = np.zeros(count, dtype=np.uint64)
+            for k in range(n):
+                h = h * np.uint64(257) + data[k:k + count]
+            parts.append((h * np.uint64(0x9E3779B97F4A7C15)) >> np.uint64(32))
+        return np.concatenate(parts).astype(np.uint32)
+
+    def encode(self, text: str) -> np.ndarray:
+        """Embed text; empty text maps to the zero vector."""
+        hashes = self._hashes(text)
+        if not len(hashes):
+            return np.zeros(self.dim, dtype=np.float32)
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0)
+        vec = np.bincount(hashes % self.dim, weights=signs, minlength=self.dim).astype(np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+
+class _VectorStore:
+    """One agent's embeddings, epoch timestamps and texts; deduplicated by text.
+
+    Holds at most `capacity` texts: once full, a new text takes over the row
+    of the least recently written one, so memory is bounded like the
+    episodic ring. Rows are rewritten in place, so queries score under the
+    store lock.
+    """
+
+    def __init__(self, dim: int, chunk: int, capacity: int):
+        self.chunk = chunk
+        self.capacity = capacity
+        self.mat = np.empty((min(chunk, capacity), dim), dtype=np.float32)
+        self.ts = np.empty(len(self.mat), dtype=np.float64)
+        self.texts: List[str] = []
+        self.rows: Dict[str, int] = {}
+        self.evicted = 0
+        self.lock = threading.Lock()
+
+    def add(self, vec: np.ndarray, text: str, created: float):
+        with self.lock:
+            row = self.rows.get(text)
+            if row is not None:
+                # Repeated text only refreshes recency
+                self.ts[row] = created
+                return
+            n = len(self.texts)
+            if n == self.capacity:
+                row = int(np.argmin(self.ts[:n]))
+                del self.rows[self.texts[row]]
+                self.texts[row] = text
+                self.evicted += 1
+            else:
+                if n == len(self.mat):
+                    # Grow by at least half the current size, rounded up to whole chunks
+                    grow = -(-max(self.chunk, n // 2) // self.chunk) * self.chunk
+                    size = min(n + grow, self.capacity)
+                    mat = np.empty((size, self.mat.shape[1]), dtype=np.float32)
+                    mat[:n] = self.mat
+                    ts = np.empty(size, dtype=np.float64)
+                    ts[:n] = self.ts
+                    self.mat, self.ts = mat, ts
+                row = n
+                self.texts.append(text)
+            self.mat[row] = vec
+            self.ts[row] = created
+            self.rows[text] = row
+
+    def top(self, q: np.ndarray, top_k: int) -> List[Tuple[str, float, float]]:
+        """[(text, cosine, created)] of the top_k rows by cosine, best first."""
+        with self.lock:
+            n = len(self.texts)
+            if not n:
+                return []
+            scores = self.mat[:n] @ q
+            k = min(top_k, n)
+            top = np.argpartition(scores, n - k)[-k:]
+            top = top[np.argsort(scores[top])[::-1]]
+            return [(self.texts[i], float(scores[i]), float(self.ts[i])) for i in top]
+
+
+class SemanticIndex:
+    """Per-agent semantic memory queried by cosine similarity.
+
+    - add(agent_id, text, created): embed and store (created is an epoch float)
+    - search(agent_id, query, top_k, now): [(text, cosine, age_days)] best first
+    """
+
+    def __init__(self, dim: int = Defaults.SEM_DIM, chunk: int = Defaults.SEM_CHUNK,
+                 min_score: float = Defaults.SEM_MIN_SCORE, max_per_agent: int = Defaults.SEM_MAX_PER_AGENT):
+        if max_per_agent <= 0:
+            raise ValueError("max_per_agent must be > 0")
+        self.encoder = HashedNgramEncoder(dim)
+        self.chunk = chunk
+        self.min_score = min_score
+        self.max_per_agent = max_per_agent
+        self._stores: Dict[str, _VectorStore] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return sum(len(s.texts) for s in list(self._stores.values()))
+
+    def add(self, agent_id: str, text: str, created: float):
+        if not text or not text.strip():
+            return
+        store = self._stores.get(agent_id)
+        if store is None:
+            with self._lock:
+                store = self._stores.setdefault(
+                    agent_id, _VectorStore(self.encoder.dim, self.chunk, self.max_per_agent))
+        store.add(self.encoder.encode(text), text, created)
+
+    def search(self, agent_id: str, query: str, top_k: int, now: float) -> List[Tuple[str, float, float]]:
+        store = self._stores.get(agent_id)
+        q = self.encoder.encode(query)
+        if store is None or top_k <= 0 or not q.any():
+            return []
+        return [
+            (text, score, (now - created) / SECONDS_PER_DAY)
+            for text, score, created in store.top(q, top_k)
+            if score >= self.min_score
+        ]
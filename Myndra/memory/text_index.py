@@ -0,0 +1,118 @@
+"""Search and timestamp helpers shared by the memory stores (memory_module, compact_graph, semantic)."""
+
+from array import array
+from datetime import datetime, timezone
+import re
+from typing import List, Optional
+
+TOKEN = re.compile(r"\w+")
+SECONDS_PER_DAY = 86400.0
+
+
+def to_epoch(timestamp) -> float:
+    """Epoch seconds from an epoch float or ISO-8601 string (naive means UTC)."""
+    if isinstance(timestamp, (int, float)):
+        return float(timestamp)
+    ts = datetime.fromisoformat(timestamp)
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+class TrigramIndex:
+    """Substring index over node ids using character trigrams.
+
+    Node ids get increasing integer ids, so every posting list is sorted in
+    insertion order (the order networkx iterates nodes). A query scans only the
+    shortest posting among its trigrams and confirms each candidate with `in`,
+    stopping early once top_k matches are found. Queries shorter than three
+    characters fall back to scanning all ids. Removed nodes leave a None
+    tombstone in `nodes` (ids are never reused, which keeps postings sorted);
+    vacuum() strips tombstoned ids from postings a few grams at a time.
+    """
+    def __init__(self, track_ids: bool = False):
+        self.nodes = []
+        self.grams = {}
+        self.ids = {} if track_ids else None  # node -> id, needed by remove()
+        self.dead = 0       # tombstoned ids still present in postings
+        self._sweep = None  # grams left in the current vacuum pass
+        self._sweep_dead = 0
+        self._cursor = None  # (gram, position, kept ids) of a partly filtered posting
+
+    def add(self, node_id: str):
+        nid = len(self.nodes)
+        self.nodes.append(node_id)
+        if self.ids is not None:
+            self.ids[node_id] = nid
+        for gram in {node_id[i:i + 3] for i in range(len(node_id) - 2)}:
+            posting = self.grams.get(gram)
+            if posting is None:
+                posting = self.grams[gram] = array("l")
+            posting.append(nid)
+
+    def search(self, q: str, top_k: Optional[int] = None) -> List[str]:
+        if len(q) < 3:
+            candidates = range(len(self.nodes))
+        else:
+            shortest = None
+            for gram in {q[i:i + 3] for i in range(len(q) - 2)}:
+                posting = self.grams.get(gram)
+                if posting is None:
+                    return []
+                if shortest is None or len(posting) < len(shortest):
+                    shortest = posting
+            candidates = shortest
+        hits = []
+        for nid in candidates:
+            node = self.nodes[nid]
+            if node is not None and q in node:
+                hits.append(node)
+                if top_k is not None and len(hits) >= top_k:
+                    break
+        return hits
+
+    def remove(self, node_id: str):
+        if self.ids is None:
+            self.ids = {node: i for i, node in enumerate(self.nodes) if node is not None}
+        nid = self.ids.pop(node_id, None)
+        if nid is not None:
+            self.nodes[nid] = None
+            self.dead += 1
+
+    def vacuum_due(self) -> bool:
+        return self._sweep is not None or self.dead > max(1024, len(self.ids or ()) // 2)
+
+    def vacuum_step(self, max_ids: int = 4096) -> bool:
+        """Filter tombstones from about max_ids posting entries; True when a pass completes.
+
+        A pass walks every gram; a long posting is filtered across several
+        steps and swapped in once done (ids appended meanwhile are live).
+        """
+        if self._sweep is None:
+            self._sweep, self._sweep_dead = list(self.grams), self.dead
+            self._cursor = None
+        nodes = self.nodes
+        while max_ids > 0:
+            if self._cursor is None:
+                if not self._sweep:
+                    self._sweep = None
+                    self.dead -= self._sweep_dead
+                    return True
+                gram = self._sweep.pop()
+                if gram not in self.grams:
+                    continue
+                self._cursor = (gram, 0, array("l"))
+            gram, pos, kept = self._cursor
+            posting = self.grams[gram]
+            end = min(len(posting), pos + max_ids)
+            kept.extend(i for i in posting[pos:end] if nodes[i] is not None)
+            max_ids -= end - pos
+            if end < len(posting):
+                self._cursor = (gram, end, kept)
+                continue
+            self._cursor = None
+            if kept:
+                self.grams[gram] = kept
+            else:
+                del self.grams[gram]
+        return False
@@ -0,0 +1,105 @@
+"""Background write pipeline used by SharedMemory in asynchronous write mode.
+
+Callers enqueue write arguments and return immediately; a single daemon
+thread drains the queue in batches and applies them in submission order.
+flush() is a barrier: it returns once every write enqueued before the call
+has been applied, and re-raises the first error any of them hit. drain()
+is the same barrier without the error, for readers that must not receive
+another caller's failure.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+
+_STOP = object()
+
+
+class WriteBehind:
+    """Single-writer queue applying apply_fn(*args) for each enqueued write.
+
+    Args:
+        apply_fn: Called on the writer thread with each write's argument tuple.
+        batch_size: Maximum writes applied per wakeup of the writer thread.
+    """
+
+    def __init__(self, apply_fn: Callable[..., None], batch_size: int = 256):
+        self.apply_fn = apply_fn
+        self.batch_size = batch_size
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._cond = threading.Condition()
+        self._enqueued = 0
+        self._applied = 0
+        self._error: Optional[BaseException] = None
+        self.stats = {"writes": 0, "batches": 0, "errors": 0, "apply_s": 0.0}
+        self._thread = threading.Thread(target=self._run, name="memory-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, args: Tuple[Any, ...]):
+        with self._cond:
+            self._enqueued += 1
+        self._queue.put(args)
+
+    def pending(self) -> int:
+        with self._cond:
+            return self._enqueued - self._applied
+
+    def drain(self, timeout: Optional[float] = None):
+        """Block until all writes submitted so far are applied; failures stay pending for flush()."""
+        with self._cond:
+            self._wait_applied(timeout)
+
+    def flush(self, timeout: Optional[float] = None):
+        """Block until all writes submitted so far are applied; re-raise the first failure."""
+        with self._cond:
+            self._wait_applied(timeout)
+            error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _wait_applied(self, timeout: Optional[float]):
+        # Caller holds self._cond
+        target = self._enqueued
+        if not self._cond.wait_for(lambda: self._applied >= target, timeout):
+            raise TimeoutError(f"Memory flush timed out with {target - self._applied} writes pending")
+
+    def close(self):
+        self.flush()
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            start = time.perf_counter()
+            errors = 0
+            stop = False
+            for args in batch:
+                if args is _STOP:
+                    stop = True
+                    continue
+                try:
+                    self.apply_fn(*args)
+                except Exception as e:
+                    errors += 1
+                    with self._cond:
+                        if self._error is None:
+                            self._error = e
+            elapsed = time.perf_counter() - start
+            applied = len(batch) - stop
+            with self._cond:
+                self._applied += applied
+                self.stats["writes"] += applied
+                self.stats["batches"] += 1
+                self.stats["errors"] += errors
+                self.stats["apply_s"] += elapsed
+                self._cond.notify_all()
+            if stop:
+                return
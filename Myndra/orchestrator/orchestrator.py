@@ -1,14 +1,23 @@
 from orchestrator.planner import PlannerAdapter
-from agents.agent_registry import get_agent
+from orchestrator.router import AgentRouter
+from agents.agent_registry import AGENT_REGISTRY, AgentPool
 from systems.profiler import Profiler
+from systems.tracing import get_tracer
+from memory.memory_types import LazyText
 import os
 import json
 from systems.async_runtime import AsyncRuntime
+from systems.process_agents import ProcessAgentRunner
 import asyncio
+import time
+from contextlib import contextmanager
 
 class Orchestrator:
-    def __init__(self, registry, memory, use_llm=False):
+    def __init__(self, registry, memory, use_llm=False, max_concurrent=None, agents_per_type=None,
+                 stream_plan=None):
         self.profiler = Profiler()
+        # Spans per goal/phase/task and the console log; MYNDRA_QUIET=1 silences the console
+        self.tracer = get_tracer()
 
         self.registry = registry
         self.memory = memory
@@ -16,60 +25,132 @@ class Orchestrator:
             use_llm=os.getenv("MYNDRA_USE_LLM", "0") == "1",
             memory=self.memory
         )
-        self.runtime = AsyncRuntime(max_concurrent=4)
+        # SharedMemory is lock-striped, so agent concurrency is only bounded by this knob
+        if max_concurrent is None:
+            max_concurrent = int(os.getenv("MYNDRA_MAX_CONCURRENT", "4"))
+        task_timeout = os.getenv("MYNDRA_TASK_TIMEOUT_S")
+        self.runtime = AsyncRuntime(
+            max_concurrent=max_concurrent,
+            task_timeout_s=float(task_timeout) if task_timeout else None,
+            max_retries=int(os.getenv("MYNDRA_TASK_RETRIES", "0")),
+            processes=self._process_runner(),
+            tracer=self.tracer,
+        )
+        # Agents are reused across tasks and runs so their confidence/history persists
+        if agents_per_type is None:
+            agents_per_type = int(os.getenv("MYNDRA_AGENTS_PER_TYPE", str(max_concurrent)))
+        self.agents = AgentPool(self.memory, size=agents_per_type)
+        # With an LLM planner, start each subtask as soon as the model has written it
+        if stream_plan is None:
+            stream_plan = os.getenv("MYNDRA_STREAM_PLAN", "0").lower() in ("1", "true", "yes", "on")
+        self.stream_plan = stream_plan
+        # MYNDRA_ROUTING=keyword keeps the static keyword rules; adaptive also weighs load and latency
+        self.router = AgentRouter(
+            pool=self.agents,
+            runtime=self.runtime,
+            adaptive=os.getenv("MYNDRA_ROUTING", "adaptive").lower() != "keyword",
+        )
 
-    def plan(self, goal):
-        subtasks = self.planner.decompose(goal)
-        self.memory.write("orchestrator", f"Planned subtasks: {subtasks}")
+    def _process_runner(self):
+        """Worker processes for CPU-bound agent types (cpu_bound classes plus MYNDRA_CPU_AGENTS).
+
+        MYNDRA_AGENT_PROCESSES sets the worker count (default: one per core);
+        0 keeps every agent on threads.
+        """
+        names = {name for name, cls in AGENT_REGISTRY.items() if getattr(cls, "cpu_bound", False)}
+        names |= {n.strip() for n in os.getenv("MYNDRA_CPU_AGENTS", "").split(",") if n.strip()}
+        processes = os.getenv("MYNDRA_AGENT_PROCESSES")
+        if not names or processes == "0":
+            return None
+        return ProcessAgentRunner(names, self.memory, processes=int(processes) if processes else None)
+
+    @staticmethod
+    def _run_sync(coro):
+        """Drive a coroutine from sync code; refuses (instead of deadlocking) inside a running loop."""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        coro.close()
+        raise RuntimeError("Sync Orchestrator methods cannot run inside an event loop; await the a* variant")
+
+    async def aplan(self, goal):
+        if self.planner.use_llm:
+            # Awaits the shared LLM client, so the caller's loop keeps running
+            subtasks = await self.planner.adecompose(goal)
+            self._log_plan_cache()
+        else:
+            subtasks = self.planner.decompose(goal)
+        self.memory.write("orchestrator", LazyText("Planned subtasks: {}", subtasks))
         return subtasks
 
+    def _log_plan_cache(self):
+        stats = self.planner.llm_planner.cache_stats()
+        if stats is not None:
+            self.profiler.log_metric("plan_cache_hit_rate", stats["hit_rate"])
+            self.profiler.log_metric("plan_cache_saved_ms", stats["saved_ms"])
+
+    def plan(self, goal):
+        return self._run_sync(self.aplan(goal))
+
         
     def assign(self, subtasks):
         """assign subtasks to appropriate agents. Handles both string and dict subtasks."""
-        assignments = []
-
-        for subtask in subtasks:
-            # Handle if subtask is a dict (with possible agent/confidence), or str
-            if isinstance(subtask, dict):
-                task_text = subtask.get("task", "")
-                agent_hint = subtask.get("agent", "")
-                confidence = subtask.get("confidence", 0.5)
-            else:
-                task_text = str(subtask)
-                agent_hint = ""
-                confidence = 0.5
-
-            task_lower = task_text.lower()
-            # Agent assignment logic: prefer explicit agent_hint, else auto-detect
-            if agent_hint:
-                agent = agent_hint
-            elif "data" in task_lower or "gather" in task_lower:
-                agent = "DataAgent"
-            elif "analyze" in task_lower or "pattern" in task_lower:
-                agent = "AnalystAgent"
-            elif "summarize" in task_lower or "report" in task_lower:
-                agent = "SummarizerAgent"
-            else:
-                agent = "GeneralAgent"
-            assignments.append({"task": task_text, "agent": agent, "confidence": confidence})
-        self.memory.write("orchestrator", f"Assigned tasks: {assignments}")
+        planned = {}
+        assignments = [self._assign_one(subtask, planned) for subtask in subtasks]
+        self.memory.write("orchestrator", LazyText("Assigned tasks: {}", assignments))
         return assignments
 
+    def _assign_one(self, subtask, planned=None):
+        # Handle if subtask is a dict (with possible agent/confidence), or str
+        if isinstance(subtask, dict):
+            task_text = subtask.get("task", "")
+            agent_hint = subtask.get("agent", "")
+            confidence = subtask.get("confidence", 0.5)
+            depends_on = list(subtask.get("depends_on") or [])
+        else:
+            task_text = str(subtask)
+            agent_hint = ""
+            confidence = 0.5
+            depends_on = []
 
-    def execute(self, assignments):
-        """Execute all agent assignments concurrently using AsyncRuntime."""
+        # Hint and keyword matches are the candidates; the router weighs their load and latency
+        agent = self.router.route(task_text, agent_hint, planned)
+        return {"task": task_text, "agent": agent, "confidence": confidence, "depends_on": depends_on}
+
+
+    async def aexecute(self, assignments, schedule=None):
+        """Execute agent assignments with AsyncRuntime, respecting depends_on ordering.
+
+        Runs on the caller's loop; concurrent aexecute calls share the
+        runtime's max_concurrent limit. `assignments` may also be an async
+        iterable still being planned (see run_dag_stream). Schedule stats
+        are copied into `schedule` when given.
+        """
         results = []
 
         try:
-            # Run assignments concurrently via AsyncRuntime
-            results = asyncio.run(self.runtime.run_batch(assignments, lambda a: get_agent(a, self.memory)))
+            # Independent subtasks overlap; dependents start as soon as their upstream finishes
+            schedule = {} if schedule is None else schedule
+            if hasattr(assignments, "__aiter__"):
+                results = await self.runtime.run_dag_stream(assignments, self.agents, schedule=schedule)
+            else:
+                results = await self.runtime.run_dag(assignments, self.agents, schedule=schedule)
+            self.profiler.log_metric("critical_path_ms", schedule["critical_path_ms"])
+            self.profiler.log_metric("max_parallelism", schedule["max_parallelism"])
+            self.profiler.log_metric("avg_parallelism", schedule["avg_parallelism"])
+            self.router.observe(results)
+            self.memory.write("orchestrator", LazyText("Schedule: {}", schedule))
         except Exception as e:
-            print(f"[Execute] Runtime error: {e}")
+            self.tracer.log("[Execute] Runtime error: {}", e, level="error")
             results = [{"agent": "system", "task": "runtime_error", "output": str(e)}]
 
-        self.memory.write("agent:orchestrator", f"Execution results: {results}")
+        self.memory.write("agent:orchestrator", LazyText("Execution results: {}", results))
         return results
 
+    def execute(self, assignments):
+        return self._run_sync(self.aexecute(assignments))
+
 
     def adapt(self, results):
         """Adjust agent teams or task flow based on memory feedback."""
@@ -93,61 +174,214 @@ class Orchestrator:
                 adjustments.append({"task": task, "action": "retain"})
 
         summary = {"adaptations": adjustments}
-        self.memory.write("orchestrator", f"Adaptation summary: {summary}")
+        self.memory.write("orchestrator", LazyText("Adaptation summary: {}", summary))
         return summary
 
 
-    def run(self, goal):
-        """Run the full orchestration pipeline."""
-        print(f"\nGoal: {goal}")
-
-        # Wrap the entire run for a total time
-        with self.profiler.track("total_run_latency"):
-            # 1. Plan
-            with self.profiler.track("plan_latency"):
-                subtasks = self.planner.decompose(goal)
-            print("\nPlanned Subtasks:")
-            for t in subtasks:
-                print(f"  - {t}")
-
-            # 2. Assign
-            with self.profiler.track("assign_latency"):
-                assignments = self.assign(subtasks)
-            print("\nAssignments:")
-            for a in assignments:
-                print(f"  - {a['task']} → {a['agent']}")
-
-            # 3. Execute
-            with self.profiler.track("execute_latency"):
-                results = self.execute(assignments)
-            print("\nExecution Results:")
-            for r in results:
-                agent = r.get("agent", "unknown")
-                output = r.get("output", r)
-                print(f"  - {agent} → {output}")
+    async def arun(self, goal):
+        """Run the full pipeline on the caller's loop and return a report dict.
+
+        Phase latencies go to the profiler as distributions (one sample per
+        run), so many goals can run at once on one Orchestrator. With
+        stream_plan and an LLM planner, plan/assign/execute overlap and are
+        timed together as plan_execute_latency.
+        """
+        if self.stream_plan and self.planner.use_llm:
+            return await self._arun(goal, None, None, self.profiler)
+        return await self._arun(goal, self.aplan, self.assign, self.profiler)
+
+    @contextmanager
+    def _phase(self, profiler, name):
+        """Time a phase both as a profiler sample ("<name>_latency") and as a trace span."""
+        with profiler.span(f"{name}_latency"), self.tracer.span(name):
+            yield
+
+    async def _arun(self, goal, plan, assign, profiler):
+        """plan=None streams the plan into the scheduler instead of planning first.
+
+        The run is one trace: a "goal" root span with a child span per phase
+        and per task. Its id is returned as the report's "trace_id".
+        """
+        with self.tracer.span("goal", goal=goal), self._phase(profiler, "total_run"):
+            trace_id = self.tracer.current_trace_id()
+            start = time.perf_counter()
+            schedule = {}
+            if plan is None:
+                # 1-3. Plan, assign and execute at once: each subtask runs as soon as it is written
+                with self._phase(profiler, "plan_execute"):
+                    subtasks, assignments = [], []
+                    exec_start = time.perf_counter()
+                    results = await self.aexecute(self._stream_assignments(goal, subtasks, assignments), schedule)
+            else:
+                # 1. Plan
+                with self._phase(profiler, "plan"):
+                    subtasks = await plan(goal)
+
+                # 2. Assign
+                with self._phase(profiler, "assign"):
+                    assignments = assign(subtasks)
+
+                # 3. Execute
+                with self._phase(profiler, "execute"):
+                    exec_start = time.perf_counter()
+                    results = await self.aexecute(assignments, schedule)
+            if "first_task_ms" in schedule:
+                profiler.log_metric("time_to_first_task_ms",
+                                    (exec_start - start) * 1000 + schedule["first_task_ms"])
 
             # 4. Adapt
-            with self.profiler.track("adapt_latency"):
+            with self._phase(profiler, "adapt"):
                 adaptation = self.adapt(results)
-            print("\nAdaptation Summary:")
-            for a in adaptation["adaptations"]:
-                print(f"  - {a['task']} → {a['action']}")
-
-            # New block for final summary
-            print("\nFinal Summary (LLM-driven):")
-            with self.profiler.track("summarize_latency"):
-                summarizer = get_agent("SummarizerAgent", self.memory)
-                summary = summarizer.act(results)
-            print(summary)
-
-        # 5. Memory Log (optional)
-        print("\nRecent Memory (Orchestrator):")
+
+            # 5. Summarize (may call an LLM, and the lease may wait for a free instance)
+            with self._phase(profiler, "summarize"):
+                summary = await asyncio.to_thread(self._summarize, results)
+
+        return {
+            "goal": goal,
+            "subtasks": subtasks,
+            "assignments": assignments,
+            "results": results,
+            "adaptation": adaptation,
+            "summary": summary,
+            "trace_id": trace_id,
+        }
+
+    async def _stream_assignments(self, goal, subtasks, assignments):
+        """Assignments as the planner streams subtasks; fills both lists and logs them once complete."""
+        async for subtask in self.planner.astream_decompose(goal):
+            subtasks.append(subtask)
+            # Ready assignments are already counted in runtime.load by the time the next one is routed
+            assignment = self._assign_one(subtask)
+            assignments.append(assignment)
+            yield assignment
+        if self.planner.use_llm:
+            self._log_plan_cache()
+        self.memory.write("orchestrator", LazyText("Planned subtasks: {}", subtasks))
+        self.memory.write("orchestrator", LazyText("Assigned tasks: {}", assignments))
+
+    async def astream_batch(self, goals, max_goals_in_flight=None, profiler=None, stats=None):
+        """Run many goals at once, yielding each report as soon as its goal finishes.
+
+        Goals that normalize to the same text share one planner call, and
+        identical plans share one assignment pass. Every goal's subtasks
+        interleave on the runtime, so the whole batch stays within its
+        max_concurrent worker budget. Reports carry their input "index"; a
+        goal that raises yields {"goal", "index", "error"} instead of
+        aborting the batch. Phase samples go to `profiler`, and planner/plan
+        dedupe counts to the `stats` dict, when given.
+        """
+        profiler = profiler or self.profiler
+        plans = {}
+        assigned = {}
+
+        async def plan(goal):
+            key = " ".join(goal.lower().split())
+            task = plans.get(key)
+            if task is None:
+                task = plans[key] = asyncio.ensure_future(self.aplan(goal))
+            # Shielded so one cancelled goal cannot cancel a plan others are waiting on
+            return await asyncio.shield(task)
+
+        def assign(subtasks):
+            key = json.dumps(subtasks, sort_keys=True, default=str)
+            if key not in assigned:
+                assigned[key] = self.assign(subtasks)
+            return assigned[key]
+
+        gate = asyncio.Semaphore(max_goals_in_flight) if max_goals_in_flight else None
+
+        async def one(i, goal):
+            try:
+                if gate is None:
+                    report = await self._arun(goal, plan, assign, profiler)
+                else:
+                    async with gate:
+                        report = await self._arun(goal, plan, assign, profiler)
+            except Exception as e:
+                report = {"goal": goal, "error": str(e)}
+            report["index"] = i
+            return report
+
+        try:
+            for fut in asyncio.as_completed([one(i, g) for i, g in enumerate(goals)]):
+                yield await fut
+        finally:
+            if stats is not None:
+                stats["distinct_goals"] = len(plans)
+                stats["distinct_plans"] = len(assigned)
+
+    async def arun_batch(self, goals, on_result=None, max_goals_in_flight=None):
+        """Run a goal batch; on_result(report) is called as each goal finishes.
+
+        Returns {"reports": [...] in input order, "stats": {...}} where stats
+        has goals/sec and a latency distribution per phase for this batch.
+        """
+        goals = list(goals)
+        profiler = Profiler()
+        stats = {}
+        reports = [None] * len(goals)
+        start = time.perf_counter()
+        async for report in self.astream_batch(goals, max_goals_in_flight, profiler, stats):
+            reports[report["index"]] = report
+            if on_result is not None:
+                on_result(report)
+        elapsed = time.perf_counter() - start
+
+        for key, values in profiler.metrics.items():
+            self.profiler.metrics.setdefault(key, []).extend(values)
+        phases = ("plan", "assign", "execute", "adapt", "summarize", "total_run")
+        stats.update({
+            "goals": len(goals),
+            "failed": sum(1 for r in reports if "error" in r),
+            "elapsed_s": elapsed,
+            "goals_per_s": len(goals) / elapsed if elapsed > 0 else 0.0,
+            "runtime_peak_in_flight": self.runtime.peak_in_flight,
+            "phases_ms": {p: profiler.get_distribution(f"{p}_latency") for p in phases},
+        })
+        return {"reports": reports, "stats": stats}
+
+    def run_batch(self, goals, on_result=None, max_goals_in_flight=None):
+        return self._run_sync(self.arun_batch(goals, on_result, max_goals_in_flight))
+
+    def _summarize(self, results):
+        with self.agents.lease("SummarizerAgent") as summarizer:
+            return summarizer.act(results)
+
+    def run(self, goal):
+        """Run the full orchestration pipeline and log each phase.
+
+        The phase listing goes through the tracer, so it is only formatted
+        and printed when the tracer is not quiet.
+        """
+        log = self.tracer.log
+        log("\nGoal: {}", goal)
+        report = self._run_sync(self.arun(goal))
+
+        log("\nPlanned Subtasks:")
+        for t in report["subtasks"]:
+            log("  - {}", t)
+        log("\nAssignments:")
+        for a in report["assignments"]:
+            log("  - {} → {}", a["task"], a["agent"])
+        log("\nExecution Results:")
+        for r in report["results"]:
+            log("  - {} → {}", r.get("agent", "unknown"), r.get("output", r))
+        log("\nAdaptation Summary:")
+        for a in report["adaptation"]["adaptations"]:
+            log("  - {} → {}", a["task"], a["action"])
+        log("\nFinal Summary (LLM-driven):")
+        log("{}", report["summary"])
+
+        # Memory Log (optional)
+        log("\nRecent Memory (Orchestrator):")
         for m in self.memory.get_recent("agent:orchestrator"):
-            print(f"  • {m['timestamp']} | {m['content']}")
-            
+            log("  • {} | {}", m["timestamp"], m["content"])
+
         # Save profiling results to file
         self.profiler.save("results/orchestrator_profile.json")
+        return report
 
     def print_summary(self):
         summary = self.profiler.get_summary()
-        print(json.dumps(summary, indent=2))
\ No newline at end of file
+        self.tracer.log("{}", json.dumps(summary, indent=2), name="profile_summary", metrics=summary)
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""
+Persistent cache of LLM plans.
+
+Entries are keyed on (normalized goal, model, hash of the memory context
+that went into the prompt) and stored in a local SQLite file, so plans
+survive across runs and processes. An in-memory mirror serves lookups;
+SQLite is only touched on writes and evictions. Entries expire after
+`ttl_seconds`, and the least recently used ones are evicted beyond
+`max_entries`. With `fuzzy_threshold` set, a miss falls back to the most
+similar cached goal (difflib ratio) for the same model and context.
+"""
+
+import difflib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def normalize_goal(goal: str) -> str:
+    return " ".join(str(goal).lower().split())
+
+
+def context_hash(context: str) -> str:
+    return hashlib.sha1((context or "").encode("utf-8")).hexdigest()[:16]
+
+
+class PlanCache:
+    """TTL + LRU plan cache backed by SQLite (path=None keeps it in memory only)."""
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: Optional[float] = 7 * 24 * 3600,
+                 max_entries: int = 1024, fuzzy_threshold: Optional[float] = None):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be > 0")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.fuzzy_threshold = fuzzy_threshold
+        self._lock = threading.Lock()
+        # key -> [subtasks, created, last_used, plan_ms]
+        self._entries: Dict[Tuple[str, str, str], list] = {}
+        self._stats = {"hits": 0, "fuzzy_hits": 0, "misses": 0, "expired": 0, "evictions": 0, "saved_ms": 0.0}
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS plans (goal TEXT, model TEXT, ctx TEXT, plan TEXT, "
+                "created REAL, last_used REAL, plan_ms REAL, PRIMARY KEY (goal, model, ctx))"
+            )
+            for goal, model, ctx, plan, created, last_used, plan_ms in self._db.execute("SELECT * FROM plans"):
+                self._entries[(goal, model, ctx)] = [json.loads(plan), created, last_used, plan_ms]
+            self._expire(time.time())
+
+    def _expired(self, entry, now: float) -> bool:
+        return self.ttl_seconds is not None and now - entry[1] > self.ttl_seconds
+
+    def _expire(self, now: float):
+        stale = [k for k, e in self._entries.items() if self._expired(e, now)]
+        for key in stale:
+            del self._entries[key]
+        if stale and self._db is not None:
+            self._db.executemany("DELETE FROM plans WHERE goal=? AND model=? AND ctx=?", stale)
+        self._stats["expired"] += len(stale)
+
+    def _fuzzy(self, goal: str, model: str, ctx: str, now: float):
+        best, best_score = None, self.fuzzy_threshold
+        matcher = difflib.SequenceMatcher(a=goal, autojunk=False)
+        for key, entry in self._entries.items():
+            if key[1] != model or key[2] != ctx or self._expired(entry, now):
+                continue
+            matcher.set_seq2(key[0])
+            # quick_ratio is an upper bound on ratio, so it safely prunes
+            if matcher.quick_ratio() < best_score:
+                continue
+            score = matcher.ratio()
+            if score >= best_score:
+                best, best_score = key, score
+        return best
+
+    def get(self, goal: str, model: str, context: str = "") -> Optional[List[dict]]:
+        """Cached subtasks for this goal/model/context, or None. Returns a copy."""
+        key = (normalize_goal(goal), model, context_hash(context))
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry, now):
+                self._expire(now)
+                entry = None
+            fuzzy = False
+            if entry is None and self.fuzzy_threshold is not None:
+                match = self._fuzzy(*key, now)
+                if match is not None:
+                    key, entry, fuzzy = match, self._entries[match], True
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            entry[2] = now
+            self._stats["fuzzy_hits" if fuzzy else "hits"] += 1
+            self._stats["saved_ms"] += entry[3]
+            if self._db is not None:
+                self._db.execute("UPDATE plans SET last_used=? WHERE goal=? AND model=? AND ctx=?", (now, *key))
+            return json.loads(json.dumps(entry[0]))
+
+    def put(self, goal: str, model: str, context: str, subtasks: List[dict], plan_ms: float = 0.0):
+        """Store a plan; plan_ms (what producing it cost) is credited as saved on every hit."""
+        key = (normalize_goal(goal), model, context_hash(context))
+        now = time.time()
+        plan = json.dumps(subtasks)
+        with self._lock:
+            self._entries[key] = [json.loads(plan), now, now, plan_ms]
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO plans VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                 (*key, plan, now, now, plan_ms))
+            if len(self._entries) > self.max_entries:
+                self._expire(now)
+                excess = len(self._entries) - self.max_entries
+                if excess > 0:
+                    victims = sorted(self._entries, key=lambda k: self._entries[k][2])[:excess]
+                    for victim in victims:
+                        del self._entries[victim]
+                    if self._db is not None:
+                        self._db.executemany("DELETE FROM plans WHERE goal=? AND model=? AND ctx=?", victims)
+                    self._stats["evictions"] += len(victims)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self._stats["hits"] + self._stats["fuzzy_hits"]
+            lookups = hits + self._stats["misses"]
+            return {**self._stats, "size": len(self._entries), "hit_rate": hits / lookups if lookups else 0.0}
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
@@ -1,7 +1,11 @@
 import os
 import json
-from openai import OpenAI
+import time
 from dotenv import load_dotenv
+from orchestrator.plan_cache import PlanCache
+from orchestrator.stream_parser import SubtaskStreamParser
+from systems.llm_client import LLMDeadlineExceeded, get_llm_client
+from systems.tracing import get_tracer
 load_dotenv()
 
 class Planner:
@@ -45,18 +49,45 @@ class Planner:
 class LLMPlanner:
     """Memory-aware LLM planner that returns structured subtasks. Default model: GPT-5-mini
     (override via MYNDRA_PLANNER_MODEL). Forces JSON object output and normalizes responses
-    from diverse model formats to a consistent list of {task, agent, confidence}."""
+    from diverse model formats to a consistent list of {task, agent, confidence, depends_on?}."""
 
-    def __init__(self, memory=None, model=None):
-        # Resolve model (env override allowed) and initialize client from env OPENAI_API_KEY
+    def __init__(self, memory=None, model=None, llm=None, cache=None, deadline_s=None):
+        # Resolve model (env override allowed); the shared LLM client reads OPENAI_API_KEY
         self.model = model or os.getenv("MYNDRA_PLANNER_MODEL") or "gpt-5-mini"
-        print(f"🔧 LLMPlanner: using model '{self.model}'.")
+        get_tracer().log("🔧 LLMPlanner: using model '{}'.", self.model)
         self.memory = memory
-        try:
-            # OpenAI() reads OPENAI_API_KEY from the environment
-            self.client = OpenAI()
-        except Exception:
-            self.client = None
+        self.llm = llm if llm is not None else get_llm_client()
+        # Past this, the rule-based plan is used instead (None: the client's default)
+        env_deadline = os.getenv("MYNDRA_PLANNER_DEADLINE_S")
+        self.deadline_s = deadline_s if deadline_s is not None else (float(env_deadline) if env_deadline else None)
+        # None: build from env on first use; False: no caching
+        self._cache = cache
+
+    @property
+    def cache(self):
+        """Plan cache configured from MYNDRA_PLAN_CACHE* env vars, opened lazily.
+
+        MYNDRA_PLAN_CACHE is the SQLite path ("off" disables caching),
+        MYNDRA_PLAN_CACHE_TTL the TTL in seconds and MYNDRA_PLAN_CACHE_FUZZY
+        an optional goal-similarity threshold in (0, 1].
+        """
+        if self._cache is None:
+            path = os.getenv("MYNDRA_PLAN_CACHE", "results/cache/plan_cache.sqlite")
+            if path.strip().lower() in ("", "0", "off", "none", "false"):
+                self._cache = False
+            else:
+                fuzzy = os.getenv("MYNDRA_PLAN_CACHE_FUZZY")
+                self._cache = PlanCache(
+                    path,
+                    ttl_seconds=float(os.getenv("MYNDRA_PLAN_CACHE_TTL", str(7 * 24 * 3600))),
+                    max_entries=int(os.getenv("MYNDRA_PLAN_CACHE_SIZE", "1024")),
+                    fuzzy_threshold=float(fuzzy) if fuzzy else None,
+                )
+        return None if self._cache is False else self._cache
+
+    def cache_stats(self):
+        """Plan cache counters, or None if no cache has been opened."""
+        return self._cache.stats if self._cache not in (None, False) else None
 
     def parse_llm_json(self, text):
         """Helper to parse JSON from LLM output, trying to fix common formatting issues."""
@@ -82,7 +113,8 @@ class LLMPlanner:
     def _extract_subtasks(self, parsed, raw_text=""):
         """Normalize various JSON shapes to a list of subtasks.
         Accepts either a list of objects or an object containing one of several list keys.
-        Each subtask is normalized to have keys: task(str), agent(str), confidence(float in [0,1]).
+        Each subtask is normalized to have keys: task(str), agent(str), confidence(float in [0,1]),
+        plus depends_on(list) when the model gave one.
         """
         # If the model already returned a list
         if isinstance(parsed, list):
@@ -141,14 +173,24 @@ class LLMPlanner:
                 agent_val = "general"
             if not task_val or not isinstance(task_val, str):
                 raise ValueError(f"Missing/invalid 'task' at index {idx}")
-            normalized.append({"task": task_val.strip(), "agent": agent_val, "confidence": conf_val})
+            subtask = {"task": task_val.strip(), "agent": agent_val, "confidence": conf_val}
+            if isinstance(item.get("depends_on"), list):
+                subtask["depends_on"] = item["depends_on"]
+            normalized.append(subtask)
         return normalized
 
     def decompose(self, goal):
         """
         Use the LLM to return a JSON list of {task, agent, confidence}.
-        Falls back to a generic plan if the LLM is unavailable or returns invalid output.
+        Falls back to a generic plan if the LLM is unavailable or returns invalid output,
+        and to the rule-based plan if the LLM misses its deadline.
         """
+        if self.llm is None:
+            return self._generic_plan()
+        return self.llm.run(self.adecompose(goal))
+
+    def _prompt(self, goal):
+        """(memory context, prompt) for a goal; the context is also part of the plan cache key."""
         # Gather recent orchestrator context (best-effort)
         context = ""
         if self.memory is not None:
@@ -163,28 +205,51 @@ class LLMPlanner:
             except Exception:
                 context = ""
 
-        text = ""
         prompt = (
             "You are an expert project planner. "
             "Given a high-level goal and recent context, decompose the goal into ordered subtasks. "
             "Return a single JSON object with this exact schema: \n"
-            "{\n  \"subtasks\": [\n    {\n      \"task\": string,\n      \"agent\": one of ['analyst','planner','executor','general'],\n      \"confidence\": number between 0 and 1\n    }\n  ]\n}\n"
+            "{\n  \"subtasks\": [\n    {\n      \"task\": string,\n      \"agent\": one of ['analyst','planner','executor','general'],\n      \"confidence\": number between 0 and 1,\n      \"depends_on\": list of earlier task strings this one needs (empty if none)\n    }\n  ]\n}\n"
             "Do not include any extra fields or prose. If a design/visualization task is needed, use 'planner'.\n"
             f"Context:\n{context}\n\n"
             f"Goal: {goal}\n\n"
             "Respond with only the JSON object."
         )
+        return context, prompt
+
+    def _log_raw_output(self, goal, error, text):
+        # Log raw output to file for debugging
+        try:
+            os.makedirs("logs", exist_ok=True)
+            with open("logs/llm_planner_raw_output.log", "a", encoding="utf-8") as f:
+                f.write(f"---\nGoal: {goal}\nError: {error}\nRaw output:\n{text}\n\n")
+        except Exception:
+            pass
+
+    async def adecompose(self, goal):
+        """decompose() for callers already on an event loop."""
+        context, prompt = self._prompt(goal)
+        text = ""
+
+        cache = self.cache if self.llm is not None else None
+        if cache is not None:
+            cached = cache.get(goal, self.model, context)
+            if cached is not None:
+                get_tracer().log("\nLLM Planner: plan cache hit for goal '{}'.\n", goal)
+                return cached
 
-        if self.client is not None:
+        if self.llm is not None:
             try:
+                start = time.perf_counter()
                 # Note: Some GPT-5 endpoints only support the default temperature and reject custom values.
                 # We omit the temperature parameter for maximum compatibility.
-                response = self.client.chat.completions.create(
+                text = await self.llm.acomplete(
+                    [{"role": "user", "content": prompt}],
                     model=self.model,
-                    messages=[{"role": "user", "content": prompt}],
+                    deadline_s=self.deadline_s,
                     response_format={"type": "json_object"},
                 )
-                text = response.choices[0].message.content.strip()
+                text = (text or "").strip()
                 try:
                     parsed = json.loads(text)
                 except Exception:
@@ -192,20 +257,97 @@ class LLMPlanner:
                     parsed = self.parse_llm_json(text)
                 # Normalize whatever we got into a proper list
                 subtasks = self._extract_subtasks(parsed, raw_text=text)
+                if cache is not None:
+                    cache.put(goal, self.model, context, subtasks, (time.perf_counter() - start) * 1000)
 
-                print(f"\nLLM Planner: model={self.model} successfully generated plan.\n")
+                get_tracer().log("\nLLM Planner: model={} successfully generated plan.\n", self.model)
                 return subtasks
+            except LLMDeadlineExceeded as e:
+                get_tracer().log("LLM plan timed out ({}); using the rule-based plan", e, level="warning")
+                return self.rule_plan(goal)
             except Exception as e:
-                # Log raw output to file for debugging
+                self._log_raw_output(goal, e, text)
+                # Make the reason visible in the console so you know why it fell back
+                get_tracer().log("LLM plan failed: {}", e, level="error")
+
+        return self._generic_plan()
+
+    async def astream_decompose(self, goal):
+        """Streaming adecompose(): yields each normalized subtask as soon as its JSON object closes.
+
+        The caller can start work on early subtasks while the model is still
+        writing the rest of the plan. Cache hits and fallbacks are yielded
+        whole. If the stream breaks after some subtasks were yielded, those
+        stand as the plan (they may already be running) and nothing is added.
+        """
+        context, prompt = self._prompt(goal)
+        cache = self.cache if self.llm is not None else None
+        if cache is not None:
+            cached = cache.get(goal, self.model, context)
+            if cached is not None:
+                get_tracer().log("\nLLM Planner: plan cache hit for goal '{}'.\n", goal)
+                for subtask in cached:
+                    yield subtask
+                return
+        if self.llm is None:
+            for subtask in self._generic_plan():
+                yield subtask
+            return
+
+        parser = SubtaskStreamParser()
+        chunks = []
+        subtasks = []
+        fallback = None
+        try:
+            start = time.perf_counter()
+            async for delta in self.llm.astream(
+                [{"role": "user", "content": prompt}],
+                model=self.model,
+                deadline_s=self.deadline_s,
+                response_format={"type": "json_object"},
+            ):
+                chunks.append(delta)
+                for item in parser.feed(delta):
+                    try:
+                        subtask = self._extract_subtasks([item])[0]
+                    except ValueError as e:
+                        get_tracer().log("LLM plan: skipping malformed subtask ({})", e, level="warning")
+                        continue
+                    subtasks.append(subtask)
+                    yield subtask
+            if not subtasks:
+                # Nothing streamed out as an object (e.g. a list of strings); parse the whole text
+                text = "".join(chunks).strip()
                 try:
-                    os.makedirs("logs", exist_ok=True)
-                    with open("logs/llm_planner_raw_output.log", "a", encoding="utf-8") as f:
-                        f.write(f"---\nGoal: {goal}\nError: {e}\nRaw output:\n{text}\n\n")
+                    parsed = json.loads(text)
                 except Exception:
-                    pass
-                # Make the reason visible in the console so you know why it fell back
-                print(f"LLM plan failed: {e}")
+                    parsed = self.parse_llm_json(text)
+                for subtask in self._extract_subtasks(parsed, raw_text=text):
+                    subtasks.append(subtask)
+                    yield subtask
+            if cache is not None and subtasks:
+                cache.put(goal, self.model, context, subtasks, (time.perf_counter() - start) * 1000)
+            get_tracer().log("\nLLM Planner: model={} streamed a {}-step plan.\n", self.model, len(subtasks))
+        except LLMDeadlineExceeded as e:
+            get_tracer().log("LLM plan timed out ({}); {}", e,
+                             "keeping the streamed steps" if subtasks else "using the rule-based plan", level="warning")
+            fallback = self.rule_plan(goal)
+        except Exception as e:
+            self._log_raw_output(goal, e, "".join(chunks))
+            get_tracer().log("LLM plan failed: {}", e, level="error")
+            fallback = self._generic_plan()
+        if fallback is not None and not subtasks:
+            for subtask in fallback:
+                yield subtask
+
+    @staticmethod
+    def rule_plan(goal):
+        """The rule-based Planner's steps as a sequential plan; agents are left to Orchestrator.assign."""
+        steps = Planner().decompose(goal)
+        return [{"task": t, "depends_on": steps[i - 1:i], "confidence": 0.5} for i, t in enumerate(steps)]
 
+    @staticmethod
+    def _generic_plan():
         # Fallback: minimal JSON schema the orchestrator expects
         return [
             {"task": "Understand the goal context", "agent": "analyst", "confidence": 0.8},
@@ -237,6 +379,21 @@ class PlannerAdapter:
                 {"task": "Generate visualizations and summary report", "agent": "planner", "depends_on": ["Run analysis and extract insights"], "confidence": 0.9},
             ]
 
+    async def adecompose(self, goal: str):
+        """decompose() for callers on an event loop; the LLM call does not block it."""
+        if self.use_llm:
+            return await self.llm_planner.adecompose(goal)
+        return self.decompose(goal)
+
+    async def astream_decompose(self, goal: str):
+        """Yield subtasks one by one, as the LLM writes them when use_llm=True."""
+        if self.use_llm:
+            async for subtask in self.llm_planner.astream_decompose(goal):
+                yield subtask
+            return
+        for subtask in self.decompose(goal):
+            yield subtask
+
     def _decompose_with_llm(self, goal: str):
         """Use an LLM to create a dependency-aware task hierarchy."""
         return self.llm_planner.decompose(goal)
@@ -0,0 +1,135 @@
+"""
+Load- and latency-aware routing of subtasks to agent types.
+
+The keyword rules Orchestrator.assign used to apply one substring check
+at a time are compiled once into a single alternation regex, one named
+group per agent type. The planner's hint and every keyword match for a
+subtask are its candidate types; GeneralAgent is always a fallback
+candidate. AgentRouter picks the candidate with the lowest expected
+completion time:
+
+    (load // capacity + 1) * latency / (success_rate * confidence)
+
+where load is the tasks of that type queued or running on the
+AsyncRuntime plus those already routed earlier in the same plan,
+capacity is the AgentPool size for the type, latency is an EWMA of
+`duration_ms` from runtime results and success_rate an EWMA of their
+status. confidence is the mean `confidence` of the pool's instances. The
+fallback's estimate is scaled by 1 + mismatch_penalty, so it only takes
+over when it is clearly sooner. With no live signals yet, every estimate
+is the same, and the hint (or else the first matching rule) wins, exactly
+as the keyword rules alone would choose.
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional
+
+from agents.agent_registry import resolve_agent_name
+
+# In priority order: the first rule that matches is the keyword choice
+KEYWORD_RULES = (
+    ("DataAgent", ("data", "gather")),
+    ("AnalystAgent", ("analyze", "pattern")),
+    ("SummarizerAgent", ("summarize", "report")),
+)
+FALLBACK_AGENT = "GeneralAgent"
+
+
+class AgentRouter:
+    def __init__(self, pool=None, runtime=None, rules=KEYWORD_RULES, adaptive: bool = True,
+                 mismatch_penalty: float = 0.5, alpha: float = 0.2):
+        self.pool = pool
+        self.runtime = runtime
+        self.adaptive = adaptive
+        self.mismatch_penalty = mismatch_penalty
+        self.alpha = alpha
+        self._rank = {name: i for i, (name, _) in enumerate(rules)}
+        self._matcher = re.compile("|".join(
+            f"(?P<{name}>{'|'.join(re.escape(w) for w in words)})" for name, words in rules
+        ))
+        self._lock = threading.Lock()
+        self._latency_ms: Dict[str, float] = {}
+        self._success: Dict[str, float] = {}
+        self._routed: Dict[str, int] = {}
+
+    def keyword_matches(self, task: str) -> List[str]:
+        """Agent types whose keywords occur in the task, in rule priority order."""
+        found = {m.lastgroup for m in self._matcher.finditer(task.lower())}
+        return sorted(found, key=self._rank.__getitem__)
+
+    def route(self, task: str, hint: str = "", planned: Optional[dict] = None) -> str:
+        """Agent type for one subtask. `planned` counts types already routed in this plan and is updated."""
+        preferred = []
+        if hint:
+            try:
+                preferred.append(resolve_agent_name(hint))
+            except ValueError:
+                # Unknown hint: leave it for the pool to reject, as it always has
+                return hint
+        preferred += [name for name in self.keyword_matches(task) if name not in preferred]
+        candidates = preferred + ([FALLBACK_AGENT] if FALLBACK_AGENT not in preferred else [])
+
+        if self.adaptive and len(candidates) > 1:
+            def cost(rank):
+                name = candidates[rank]
+                fit = 1.0 if name in preferred else 1.0 + self.mismatch_penalty
+                return self.expected_ms(name, planned) * fit, rank
+            choice = candidates[min(range(len(candidates)), key=cost)]
+        else:
+            choice = candidates[0]
+
+        if planned is not None:
+            planned[choice] = planned.get(choice, 0) + 1
+        with self._lock:
+            self._routed[choice] = self._routed.get(choice, 0) + 1
+        return choice
+
+    def expected_ms(self, name: str, planned: Optional[dict] = None) -> float:
+        """Estimated time until a new task of this type would finish."""
+        load = (self.runtime.load.get(name, 0) if self.runtime is not None else 0) + (planned or {}).get(name, 0)
+        capacity = self.pool.capacity(name) if self.pool is not None else 1
+        with self._lock:
+            latency = self._latency_ms.get(name)
+            if latency is None:
+                # Unobserved types are assumed as fast as the average observed one
+                latency = sum(self._latency_ms.values()) / len(self._latency_ms) if self._latency_ms else 1.0
+            success = self._success.get(name, 1.0)
+        reliability = max(0.05, success * self._confidence(name))
+        return (load // capacity + 1) * latency / reliability
+
+    def _confidence(self, name: str) -> float:
+        if self.pool is None:
+            return 1.0
+        values = [getattr(a, "confidence", 1.0) for a in self.pool.instances(name)]
+        values = [v for v in values if isinstance(v, (int, float))]
+        return sum(values) / len(values) if values else 1.0
+
+    def observe(self, results):
+        """Fold runtime results (agent, status, duration_ms) into the rolling estimates; timeouts count as failures."""
+        with self._lock:
+            for r in results:
+                status = r.get("status")
+                if status not in ("success", "error", "timeout"):
+                    # Skipped tasks never ran; runtime errors carry no timing
+                    continue
+                name = r.get("agent")
+                ok = 1.0 if status == "success" else 0.0
+                latency = self._latency_ms.setdefault(name, r["duration_ms"])
+                self._latency_ms[name] = latency + self.alpha * (r["duration_ms"] - latency)
+                # Success starts from an optimistic prior, so one early failure does not bench a type
+                success = self._success.get(name, 1.0)
+                self._success[name] = success + self.alpha * (ok - success)
+
+    @property
+    def stats(self) -> dict:
+        with self._lock:
+            names = set(self._routed) | set(self._latency_ms)
+            return {
+                name: {
+                    "routed": self._routed.get(name, 0),
+                    "latency_ms": self._latency_ms.get(name),
+                    "success_rate": self._success.get(name),
+                }
+                for name in sorted(names)
+            }
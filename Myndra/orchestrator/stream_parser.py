@@ -0,0 +1,84 @@
+"""
+Incremental extraction of plan items from a streamed JSON completion.
+
+The planner asks for {"subtasks": [{...}, ...]}, but models also answer
+with a bare array, another container key, or code fences around either.
+SubtaskStreamParser scans characters as they arrive, tracking string and
+escape state and bracket depth. The plan list is the first array that
+opens at the top level or as a value of the top-level object. Each
+element of that list is decoded and returned the moment it closes, so a
+subtask can be dispatched before the rest of the plan has been generated.
+"""
+
+import json
+from typing import Any, List, Optional
+
+
+class SubtaskStreamParser:
+    def __init__(self):
+        self._buf: List[str] = []
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Depth of the plan array's contents once found, and where the current element started
+        self._list_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self._done = False
+        self._pos = 0
+
+    @property
+    def done(self) -> bool:
+        """True once the plan array has closed."""
+        return self._done
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Consume a chunk; return the list elements that closed within it (decoded)."""
+        items = []
+        if self._done or not chunk:
+            return items
+        self._buf.append(chunk)
+        for ch in chunk:
+            pos = self._pos
+            self._pos += 1
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._item_start is not None and self._depth == self._list_depth:
+                        # A bare string element just closed
+                        items.append(self._decode(self._item_start, pos + 1))
+                        self._item_start = None
+                continue
+            if ch == '"':
+                self._in_string = True
+                if self._list_depth is not None and self._depth == self._list_depth:
+                    self._item_start = pos
+            elif ch in "[{":
+                if self._list_depth is None and ch == "[" and self._depth <= 1:
+                    self._list_depth = self._depth + 1
+                elif self._list_depth is not None and self._depth == self._list_depth:
+                    self._item_start = pos
+                self._depth += 1
+            elif ch in "]}":
+                self._depth -= 1
+                if self._list_depth is None:
+                    continue
+                if self._depth == self._list_depth and self._item_start is not None:
+                    items.append(self._decode(self._item_start, pos + 1))
+                    self._item_start = None
+                elif self._depth == self._list_depth - 1:
+                    self._done = True
+                    break
+        return [item for item in items if item is not None]
+
+    def _decode(self, start: int, end: int):
+        text = "".join(self._buf)
+        self._buf = [text]
+        try:
+            return json.loads(text[start:end])
+        except ValueError:
+            # Let the final full-text parse deal with malformed elements
+            return None
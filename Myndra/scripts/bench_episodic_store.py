@@ -0,0 +1,182 @@
+# scripts/bench_episodic_store.py
+"""Compare the columnar episodic ring buffer with the previous deque-of-dicts store.
+
+The baseline reproduces the old layout (a deque of dicts holding ISO-8601
+strings, plus the per-event token index: event and lowercased-text maps and
+token -> event id postings) and its scoring loop (datetime.fromisoformat
+per hit, scalar decay_linear). Both stores are measured with and without
+their token index.
+
+Run from the Myndra directory:
+    python -m scripts.bench_episodic_store --agents 50 --max-length 1000
+"""
+import argparse
+import datetime
+import json
+import random
+import re
+import statistics
+import time
+import tracemalloc
+from collections import deque
+from datetime import timezone
+from pathlib import Path
+
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults, decay_linear
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--agents", type=int, default=50)
+    p.add_argument("--max-length", type=int, default=1000)
+    p.add_argument("--repeat-ratio", type=float, default=0.3, help="Share of events repeating a status line")
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/memory/episodic_store_bench.json")
+    return p.parse_args()
+
+
+def workload(args):
+    rng = random.Random(args.seed)
+    now = time.time()
+    events = []
+    for a in range(args.agents):
+        for i in range(args.max_length):
+            if rng.random() < args.repeat_ratio:
+                text = f"Task 'step {i % 5}' completed successfully"
+            else:
+                text = f"[Data Engineer] DataAgent processed task{i} for ward {rng.randrange(40)}"
+            events.append((f"agent:{a}", text, now - rng.uniform(0, 40) * 86400))
+    return events
+
+
+_TOKEN = re.compile(r"\w+")
+
+
+class LegacyIndex:
+    """The previous per-agent token index, keyed by event id."""
+
+    def __init__(self, max_length):
+        self.next_id = 0
+        self.ids = deque(maxlen=max_length)
+        self.events, self.lowered, self.postings = {}, {}, {}
+
+    def add(self, event):
+        if len(self.ids) == self.ids.maxlen:
+            old = self.ids[0]
+            self.events.pop(old)
+            for tok in set(_TOKEN.findall(self.lowered.pop(old))):
+                self.postings[tok].discard(old)
+                if not self.postings[tok]:
+                    del self.postings[tok]
+        eid, self.next_id = self.next_id, self.next_id + 1
+        lowered = event["content"].lower()
+        self.ids.append(eid)
+        self.events[eid], self.lowered[eid] = event, lowered
+        for tok in set(_TOKEN.findall(lowered)):
+            self.postings.setdefault(tok, set()).add(eid)
+
+    def search(self, q):
+        candidates = None
+        for qt in sorted(set(_TOKEN.findall(q)), key=len, reverse=True):
+            ids = set()
+            for tok, posting in self.postings.items():
+                if qt in tok:
+                    ids |= posting
+            candidates = ids if candidates is None else candidates & ids
+        if candidates is None:
+            candidates = self.events.keys()
+        return [self.events[i] for i in sorted(candidates) if q in self.lowered[i]]
+
+
+class LegacyStore:
+    def __init__(self, max_length, use_index):
+        self.memory = {}
+        self.index = {} if use_index else None
+        self.max_length = max_length
+
+    def store(self, agent_id, content, epoch):
+        event = {
+            "timestamp": datetime.datetime.fromtimestamp(epoch, timezone.utc).isoformat(),
+            "agent_id": agent_id,
+            "content": content,
+        }
+        self.memory.setdefault(agent_id, deque(maxlen=self.max_length)).append(event)
+        if self.index is not None:
+            self.index.setdefault(agent_id, LegacyIndex(self.max_length)).add(event)
+
+    def search_episodes(self, agent_id, query):
+        q = query.lower()
+        if agent_id not in self.memory:
+            return []
+        if self.index is not None:
+            events = self.index[agent_id].search(q)
+        else:
+            events = [e for e in self.memory[agent_id] if q in e["content"].lower()]
+        scored = []
+        now = datetime.datetime.now(timezone.utc)
+        for e in events:
+            age_days = (now - datetime.datetime.fromisoformat(e["timestamp"])).days
+            score = Defaults.EP_SCORE_KEYWORD_W + Defaults.EP_SCORE_TIME_W * decay_linear(age_days)
+            scored.append((e["content"], score))
+        return sorted(scored, key=lambda x: x[1], reverse=True)
+
+
+def measure(build, search, events, queries):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    store = build()
+    mem = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    lat = []
+    for agent, q in queries:
+        t0 = time.perf_counter()
+        search(store, agent, q)
+        lat.append((time.perf_counter() - t0) * 1e3)
+    return {
+        "bytes_per_event": mem / len(events),
+        "search_ms_p50": statistics.median(lat),
+        "search_ms_max": max(lat),
+    }
+
+
+def main():
+    args = parse_args()
+    events = workload(args)
+    rng = random.Random(args.seed + 1)
+    queries = [(f"agent:{rng.randrange(args.agents)}", rng.choice(["task", "completed", "ward 7", "dataagent"]))
+               for _ in range(args.queries)]
+
+    def build_legacy(use_index):
+        store = LegacyStore(args.max_length, use_index)
+        for agent, text, epoch in events:
+            store.store(agent, text, epoch)
+        return store
+
+    def build_columnar(use_index):
+        class Policy(Defaults):
+            EP_MAX_LENGTH = args.max_length
+            SEM_RETRIEVAL = False
+
+        sm = SharedMemory(policy=Policy)
+        sm.short_term.use_index = use_index
+        for agent, text, epoch in events:
+            sm.short_term.store(agent, text, timestamp=epoch)
+        return sm
+
+    search = lambda s, a, q: s.search_episodes(a, q)  # noqa: E731
+    result = {"events": len(events)}
+    for use_index in (False, True):
+        suffix = "indexed" if use_index else "scan"
+        result[f"legacy_deque_of_dicts_{suffix}"] = measure(lambda: build_legacy(use_index), search, events, queries)
+        result[f"columnar_ring_{suffix}"] = measure(lambda: build_columnar(use_index), search, events, queries)
+    print(json.dumps(result, indent=2))
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
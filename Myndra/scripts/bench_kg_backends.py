@@ -0,0 +1,85 @@
+# scripts/bench_kg_backends.py
+"""Compare memory and throughput of the networkx and compact KnowledgeGraph backends.
+
+Run from the Myndra directory:
+    python -m scripts.bench_kg_backends --writes 100000
+"""
+import argparse
+import json
+import random
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+from memory.compact_graph import CompactKnowledgeGraph
+from memory.memory_module import KnowledgeGraph
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--writes", type=int, nargs="+", default=[10_000, 100_000])
+    p.add_argument("--agents", type=int, default=16)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/memory/kg_backend_bench.json")
+    return p.parse_args()
+
+
+def workload(n, agents, seed):
+    """SharedMemory-like writes: mostly unique contents, a small pool of contexts."""
+    rng = random.Random(seed)
+    ts = datetime.now(timezone.utc).isoformat()
+    return [
+        (f"agent:{rng.randrange(agents)}", f"DataAgent processed task{i} batch {rng.randrange(10**6)}",
+         f"ward {rng.randrange(50)}", ts)
+        for i in range(n)
+    ]
+
+
+def run(factory, ops):
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    kg = factory()
+    for agent, content, context, ts in ops:
+        kg.add_node(agent, content, context=context, timestamp=ts)
+    write_s = time.perf_counter() - t0
+    mem = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+
+    probes = [c for _, c, _, _ in ops[:: max(1, len(ops) // 2000)]]
+    t0 = time.perf_counter()
+    for c in probes:
+        kg.get_related(c)
+        kg.get_node(c)
+    read_s = time.perf_counter() - t0
+    return {
+        "bytes": mem,
+        "bytes_per_write": mem / len(ops),
+        "writes_per_s": len(ops) / write_s,
+        "reads_per_s": len(probes) / read_s,
+    }
+
+
+def main():
+    args = parse_args()
+    results = []
+    for n in args.writes:
+        ops = workload(n, args.agents, args.seed)
+        row = {
+            "writes": n,
+            "networkx": run(KnowledgeGraph, ops),
+            "compact": run(CompactKnowledgeGraph, ops),
+        }
+        row["memory_ratio"] = row["networkx"]["bytes"] / max(1, row["compact"]["bytes"])
+        print(json.dumps(row))
+        results.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
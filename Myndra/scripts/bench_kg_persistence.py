@@ -0,0 +1,85 @@
+# scripts/bench_kg_persistence.py
+"""Benchmark persistent KnowledgeGraph: SharedMemory.write overhead and restart time.
+
+Run from the Myndra directory:
+    python -m scripts.bench_kg_persistence --writes 20000 --reload-nodes 100000 1000000
+"""
+import argparse
+import json
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from memory.compact_graph import CompactKnowledgeGraph
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults
+from memory.persistence import PersistentKnowledgeGraph, write_snapshot
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--writes", type=int, default=20_000)
+    p.add_argument("--fsync-writes", type=int, default=500)
+    p.add_argument("--reload-nodes", type=int, nargs="+", default=[100_000, 1_000_000])
+    p.add_argument("--out", type=str, default="results/memory/kg_persistence_bench.json")
+    return p.parse_args()
+
+
+def write_cost(n, persist_dir=None, fsync=False):
+    class Policy(Defaults):
+        KG_BACKEND = "compact"
+        KG_PERSIST_DIR = persist_dir
+
+    sm = SharedMemory(policy=Policy)
+    if persist_dir:
+        sm.long_term.fsync = fsync
+    t0 = time.perf_counter()
+    for i in range(n):
+        sm.write(f"agent{i % 8}", f"DataAgent processed task{i} for ward {i % 40}", f"run {i // 100}")
+    elapsed = time.perf_counter() - t0
+    sm.close()
+    return elapsed / n * 1e6
+
+
+def reload_time(n, directory):
+    Path(directory).mkdir(parents=True)
+    kg = CompactKnowledgeGraph()
+    for i in range(n):
+        kg.add_node(f"agent:{i % 8}", f"result {i} for ward {i % 40}", context=f"run {i // 100}",
+                    timestamp="2026-10-19T10:00:00+00:00")
+    write_snapshot(str(Path(directory) / "snapshot.bin"), kg, generation=0, fsync=False)
+    size = (Path(directory) / "snapshot.bin").stat().st_size
+    del kg
+    t0 = time.perf_counter()
+    loaded = PersistentKnowledgeGraph(directory)
+    elapsed = time.perf_counter() - t0
+    nodes = loaded.number_of_nodes()
+    loaded.close()
+    return {"nodes": nodes, "snapshot_mb": size / 2**20, "reload_s": elapsed}
+
+
+def main():
+    args = parse_args()
+    tmp = tempfile.mkdtemp(prefix="myndra_kg_")
+    try:
+        base = write_cost(args.writes)
+        logged = write_cost(args.writes, persist_dir=f"{tmp}/w1")
+        synced = write_cost(args.fsync_writes, persist_dir=f"{tmp}/w2", fsync=True)
+        result = {
+            "write_us": {"in_memory": base, "log_buffered": logged, "log_fsync": synced},
+            "write_overhead_us": {"log_buffered": logged - base, "log_fsync": synced - base},
+            "reload": [reload_time(n, f"{tmp}/r{n}") for n in args.reload_nodes],
+        }
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(json.dumps(result, indent=2))
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
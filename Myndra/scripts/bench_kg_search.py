@@ -0,0 +1,78 @@
+# scripts/bench_kg_search.py
+"""Benchmark KnowledgeGraph.search: trigram index vs. full node scan.
+
+Run from the Myndra directory:
+    python -m scripts.bench_kg_search --nodes 100000 1000000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+from memory.memory_module import KnowledgeGraph
+
+WORDS = ["data", "agent", "analysis", "summary", "pneumonia", "cardiomegaly", "report",
+         "pipeline", "latency", "metrics", "completed", "task", "planner", "ward", "review"]
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--nodes", type=int, nargs="+", default=[100_000, 1_000_000])
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--top-k", type=int, default=5)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/memory/kg_search_bench.json")
+    return p.parse_args()
+
+
+def build(n, rng):
+    kg = KnowledgeGraph()
+    for i in range(n):
+        text = " ".join(rng.choice(WORDS) for _ in range(4))
+        kg._ensure_node(f"{text} #{i}")
+    return kg
+
+
+def time_queries(fn, queries):
+    samples = []
+    for q in queries:
+        t0 = time.perf_counter()
+        fn(q)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    return {"p50_ms": statistics.median(samples), "p95_ms": samples[int(0.95 * (len(samples) - 1))]}
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    results = []
+    for n in args.nodes:
+        t0 = time.perf_counter()
+        kg = build(n, rng)
+        build_s = time.perf_counter() - t0
+        # Mix of selective (unique id) and broad (common word pair) queries
+        queries = [f"#{rng.randrange(n)}" if i % 2 else f"{rng.choice(WORDS)} {rng.choice(WORDS)}"
+                   for i in range(args.queries)]
+        scan = lambda q: [node for node in kg.graph.nodes if q in node][: args.top_k]
+        row = {
+            "nodes": n,
+            "build_s": build_s,
+            "scan": time_queries(scan, queries),
+            "index": time_queries(lambda q: kg.search(q, top_k=args.top_k), queries),
+            "index_all_hits": time_queries(kg.search, queries[1::2]),
+        }
+        row["speedup_p50"] = row["scan"]["p50_ms"] / max(row["index"]["p50_ms"], 1e-9)
+        print(json.dumps(row))
+        results.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# scripts/bench_llm_client.py
+"""Tail latency of the shared LLM client with and without hedged requests.
+
+The local OpenAI stub answers in --fast-ms, except a --slow-frac share of
+requests that take --slow-ms (a straggling replica). Hedging sends a
+duplicate after --hedge-ms when a slot is free; the first answer wins.
+
+Run from the Myndra directory:
+    python -m scripts.bench_llm_client --calls 400 --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from pathlib import Path
+
+from systems.llm_client import LLMClient
+from systems.llm_stub import StubLLMServer
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--calls", type=int, default=400)
+    p.add_argument("--concurrency", type=int, default=8)
+    p.add_argument("--fast-ms", type=float, default=20.0)
+    p.add_argument("--slow-ms", type=float, default=500.0)
+    p.add_argument("--slow-frac", type=float, default=0.05)
+    p.add_argument("--hedge-ms", type=float, default=60.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/llm/client_hedging_bench.json")
+    return p.parse_args()
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main():
+    args = parse_args()
+    rows = []
+    for hedge in (None, args.hedge_ms / 1000):
+        rng = random.Random(args.seed)
+        slow = lambda n, body: (args.slow_ms if rng.random() < args.slow_frac else args.fast_ms) / 1000
+        with StubLLMServer(respond=lambda m, b: "ok", latency_s=slow) as server:
+            # Headroom over the caller concurrency so hedges can get a slot
+            llm = LLMClient(base_url=server.base_url, api_key="stub",
+                            max_concurrent=args.concurrency * 2, hedge_after_s=hedge)
+            latencies = []
+
+            async def worker(n):
+                for _ in range(n):
+                    t0 = time.perf_counter()
+                    await llm.acomplete([{"role": "user", "content": "plan"}], model="stub")
+                    latencies.append((time.perf_counter() - t0) * 1000)
+
+            t0 = time.perf_counter()
+
+            async def run():
+                await asyncio.gather(*(worker(args.calls // args.concurrency) for _ in range(args.concurrency)))
+
+            asyncio.run(run())
+            elapsed = time.perf_counter() - t0
+            stats = llm.stats
+            llm.close()
+            row = {
+                "hedge_ms": args.hedge_ms if hedge else None,
+                "calls": len(latencies),
+                "p50_ms": pct(latencies, 0.50),
+                "p95_ms": pct(latencies, 0.95),
+                "p99_ms": pct(latencies, 0.99),
+                "calls_per_s": len(latencies) / elapsed,
+                "server_requests": len(server.requests),
+                "hedges": stats["hedges"],
+                "hedge_wins": stats["hedge_wins"],
+            }
+        print(json.dumps(row))
+        rows.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# scripts/bench_memory_contention.py
+"""Benchmark SharedMemory under concurrent agents: lock-striped vs one global lock.
+
+Each thread plays one agent: it writes its own events (with a shared pool of
+contexts, so graph nodes are contended too) and interleaves reads
+(retrieve, get_recent, get_related). LOCK_STRIPES=1 is the single-lock
+baseline. Reports aggregate ops/s per thread count.
+
+Run from the Myndra directory:
+    python -m scripts.bench_memory_contention --threads 1 2 4 8 16 32 64
+"""
+import argparse
+import json
+import threading
+import time
+from pathlib import Path
+
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32, 64])
+    p.add_argument("--ops", type=int, default=2000, help="Operations per thread")
+    p.add_argument("--read-ratio", type=float, default=0.5)
+    p.add_argument("--stripes", type=int, nargs="+", default=[1, Defaults.LOCK_STRIPES])
+    p.add_argument("--out", type=str, default="results/memory/contention_bench.json")
+    return p.parse_args()
+
+
+def run(stripes, threads, ops, read_ratio):
+    class Policy(Defaults):
+        LOCK_STRIPES = stripes
+
+    sm = SharedMemory(policy=Policy)
+    every = max(1, round(1 / max(1e-9, 1 - read_ratio)))
+    counts = {"writes": 0, "reads": 0}
+    count_lock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def agent(i):
+        writes = reads = 0
+        barrier.wait()
+        for j in range(ops):
+            if j % every == 0:
+                sm.write(f"agent{i}", f"agent{i} processed task{j} for ward {j % 40}", f"ward {j % 40}")
+                writes += 1
+            elif j % 3 == 0:
+                sm.retrieve(f"agent{i}", f"task{j - 1}")
+                reads += 1
+            elif j % 3 == 1:
+                sm.get_recent(f"agent{i}", 5)
+                reads += 1
+            else:
+                sm.long_term.get_related(f"ward {j % 40}")
+                reads += 1
+        with count_lock:
+            counts["writes"] += writes
+            counts["reads"] += reads
+
+    workers = [threading.Thread(target=agent, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for w in workers:
+        w.join()
+    elapsed = time.perf_counter() - t0
+    return {
+        "stripes": stripes,
+        "threads": threads,
+        "ops_per_s": (counts["writes"] + counts["reads"]) / elapsed,
+        "writes_per_s": counts["writes"] / elapsed,
+        "reads_per_s": counts["reads"] / elapsed,
+    }
+
+
+def main():
+    args = parse_args()
+    results = []
+    for threads in args.threads:
+        for stripes in args.stripes:
+            row = run(stripes, threads, args.ops, args.read_ratio)
+            print(json.dumps(row))
+            results.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
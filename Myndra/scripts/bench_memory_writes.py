@@ -0,0 +1,89 @@
+# scripts/bench_memory_writes.py
+"""Benchmark SharedMemory.write throughput with many concurrent agent threads.
+
+Compares the synchronous write path with the background write pipeline
+(WRITE_MODE="async"). Reports caller-side latency (what an agent's act()
+pays) and end-to-end throughput including the final flush.
+
+Run from the Myndra directory:
+    python -m scripts.bench_memory_writes --threads 1 4 16 64
+"""
+import argparse
+import json
+import statistics
+import threading
+import time
+from pathlib import Path
+
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults, LazyText
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--threads", type=int, nargs="+", default=[1, 4, 16, 64])
+    p.add_argument("--writes", type=int, default=2000, help="Writes per thread")
+    p.add_argument("--out", type=str, default="results/memory/write_pipeline_bench.json")
+    return p.parse_args()
+
+
+def run(mode, threads, writes):
+    class Policy(Defaults):
+        WRITE_MODE = mode
+
+    sm = SharedMemory(policy=Policy)
+    payload = [{"agent": "DataAgent", "task": f"task{i}", "status": "success"} for i in range(20)]
+    caller_us = []
+    barrier = threading.Barrier(threads + 1)
+
+    def agent(i):
+        barrier.wait()
+        t0 = time.perf_counter()
+        for j in range(writes):
+            if j % 10 == 0:
+                # orchestrator-style bulk repr, formatted lazily
+                sm.write("orchestrator", LazyText("Execution results: {}", payload))
+            else:
+                sm.write(f"agent{i}", f"[Data Engineer] DataAgent processed task{j} for run {i}", "ctx")
+        caller_us.append((time.perf_counter() - t0) / writes * 1e6)
+
+    workers = [threading.Thread(target=agent, args=(i,)) for i in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    t0 = time.perf_counter()
+    for w in workers:
+        w.join()
+    submitted_s = time.perf_counter() - t0
+    sm.flush()
+    total_s = time.perf_counter() - t0
+    stats = sm.writer_stats()
+    sm.close()
+    n = threads * writes
+    return {
+        "mode": mode,
+        "threads": threads,
+        "caller_us_per_write": statistics.mean(caller_us),
+        "submit_writes_per_s": n / submitted_s,
+        "applied_writes_per_s": n / total_s,
+        "avg_batch": stats["writes"] / stats["batches"] if stats else 1.0,
+    }
+
+
+def main():
+    args = parse_args()
+    results = []
+    for threads in args.threads:
+        for mode in ("sync", "async"):
+            row = run(mode, threads, args.writes)
+            print(json.dumps(row))
+            results.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# scripts/bench_orchestration_overhead.py
+"""Benchmark the latency the orchestrated backend path adds over the direct one.
+
+For each request the same analysis runs once through the direct
+myndra_runner-style call and once through OrchestratedRunner (a
+RadiologyAgent plan on AsyncRuntime, with its trace spans), alternating
+so drift hits both paths alike. Without --image the pipelines are stubbed
+by a --model-ms sleep, which isolates the orchestration cost; with --image
+the real DenseNet pipelines run (model weights must be available).
+
+Reports p50/p99 latency per path and the paired per-request overhead, and
+exits non-zero when the p99 overhead exceeds --max-overhead-ms.
+
+Run from the Myndra directory:
+    python -m scripts.bench_orchestration_overhead --requests 500 --model-ms 20 --max-overhead-ms 5
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from backend.services import myndra_runner
+from backend.services.orchestrated_runner import OrchestratedRunner
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--requests", type=int, default=500)
+    p.add_argument("--warmup", type=int, default=20)
+    p.add_argument("--analysis", type=str, nargs="+", default=["pneumonia", "dual"],
+                   choices=["pneumonia", "cardiomegaly", "dual"])
+    p.add_argument("--model-ms", type=float, default=20.0)
+    p.add_argument("--image", type=str, help="Run the real pipelines on this image instead of the stub")
+    p.add_argument("--max-overhead-ms", type=float, default=5.0)
+    p.add_argument("--out", type=str, default="results/orchestrator/orchestration_overhead_bench.json")
+    return p.parse_args()
+
+
+def stub_runners(model_ms):
+    def predict(diagnosis):
+        def run(image_path):
+            time.sleep(model_ms / 1000)
+            return {"diagnosis": diagnosis, "probability": 0.5, "steps": [], "artifacts": {}}
+        return run
+    return {"pneumonia": predict("Normal"), "cardiomegaly": predict("Normal")}
+
+
+def direct_path(runners, analysis):
+    """What the direct backend mode calls for one analysis."""
+    if analysis == "dual":
+        return lambda path: myndra_runner.merge_dual(runners["pneumonia"](path), runners["cardiomegaly"](path))
+    return runners[analysis]
+
+
+def pct(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def main():
+    args = parse_args()
+    if args.image:
+        runners = {"pneumonia": myndra_runner.run_pneumonia, "cardiomegaly": myndra_runner.run_cardiomegaly}
+        image = args.image
+    else:
+        runners = stub_runners(args.model_ms)
+        image = "stub.png"
+    orchestrated = OrchestratedRunner(runners=runners)
+
+    rows = []
+    passed = True
+    for analysis in args.analysis:
+        paths = {"direct": direct_path(runners, analysis),
+                 "orchestrated": lambda path, a=analysis: orchestrated.run(a, [path])[0]}
+        latencies = {name: [] for name in paths}
+        for i in range(args.warmup + args.requests):
+            for name, fn in paths.items():
+                t0 = time.perf_counter()
+                fn(image)
+                if i >= args.warmup:
+                    latencies[name].append((time.perf_counter() - t0) * 1000)
+        overhead = [o - d for o, d in zip(latencies["orchestrated"], latencies["direct"])]
+        row = {
+            "analysis": analysis,
+            "requests": args.requests,
+            "model": "real" if args.image else f"stub {args.model_ms} ms",
+            **{f"{name}_ms": {"p50": pct(v, 0.50), "p99": pct(v, 0.99)} for name, v in latencies.items()},
+            "overhead_ms": {"p50": pct(overhead, 0.50), "p99": pct(overhead, 0.99)},
+            "max_overhead_ms": args.max_overhead_ms,
+        }
+        row["passed"] = row["overhead_ms"]["p99"] <= args.max_overhead_ms
+        passed = passed and row["passed"]
+        print(json.dumps(row))
+        rows.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+    if not passed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# scripts/bench_orchestrator_async.py
+"""Per-orchestration overhead of the sync vs native async Orchestrator API.
+
+Agents are no-ops (or sleep --agent-ms), so with --agent-ms 0 the numbers
+are pure framework overhead per goal:
+  sync        orch.run-style: a fresh event loop per goal (asyncio.run)
+  async_seq   await orch.arun(goal) one after another on one loop
+  async_conc  all goals gathered on one loop under the shared concurrency limit
+
+Run from the Myndra directory:
+    python -m scripts.bench_orchestrator_async --goals 200
+"""
+import argparse
+import asyncio
+import io
+import json
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from agents.agent_registry import AgentPool
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--goals", type=int, default=200)
+    p.add_argument("--agent-ms", type=float, default=0.0)
+    p.add_argument("--max-concurrent", type=int, default=8)
+    p.add_argument("--out", type=str, default="results/orchestrator/async_api_bench.json")
+    return p.parse_args()
+
+
+def make_orchestrator(args):
+    delay = args.agent_ms / 1000
+
+    class StubAgent(BaseAgent):
+        def act(self, task):
+            if delay:
+                time.sleep(delay)
+            return task
+
+    memory = SharedMemory()
+    orch = Orchestrator(None, memory, max_concurrent=args.max_concurrent)
+    orch.agents = AgentPool(memory, size=args.max_concurrent, factory=lambda name, mem: StubAgent(name, "stub", mem))
+    return orch
+
+
+def main():
+    args = parse_args()
+    goals = [f"Analyze ward {i} metrics" for i in range(args.goals)]
+    rows = []
+
+    def record(mode, elapsed):
+        row = {
+            "mode": mode,
+            "goals": args.goals,
+            "agent_ms": args.agent_ms,
+            "ms_per_goal": elapsed / args.goals * 1000,
+            "goals_per_s": args.goals / elapsed,
+        }
+        print(json.dumps(row))
+        rows.append(row)
+
+    with redirect_stdout(io.StringIO()):
+        orch = make_orchestrator(args)
+        t0 = time.perf_counter()
+        for g in goals:
+            asyncio.run(orch.arun(g))
+        sync_s = time.perf_counter() - t0
+
+        orch = make_orchestrator(args)
+
+        async def seq():
+            for g in goals:
+                await orch.arun(g)
+
+        t0 = time.perf_counter()
+        asyncio.run(seq())
+        seq_s = time.perf_counter() - t0
+
+        orch = make_orchestrator(args)
+
+        async def conc():
+            await asyncio.gather(*(orch.arun(g) for g in goals))
+
+        t0 = time.perf_counter()
+        asyncio.run(conc())
+        conc_s = time.perf_counter() - t0
+
+    record("sync", sync_s)
+    record("async_seq", seq_s)
+    record("async_conc", conc_s)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# scripts/bench_orchestrator_batch.py
+"""Benchmark batch orchestration (nightly report generation over every ward).
+
+Compares running goals one at a time (orch.arun in a loop) with
+orch.arun_batch, which dedupes planning and interleaves every goal's
+subtasks under the runtime's worker budget. Agents sleep --agent-ms to
+stand in for real work. Reports goals/sec and per-phase latency
+distributions for the batch.
+
+Run from the Myndra directory:
+    python -m scripts.bench_orchestrator_batch --wards 100 --agent-ms 5
+"""
+import argparse
+import asyncio
+import io
+import json
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from agents.agent_registry import AgentPool
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--wards", type=int, default=100)
+    p.add_argument("--agent-ms", type=float, default=5.0)
+    p.add_argument("--workers", type=int, nargs="+", default=[4, 16])
+    p.add_argument("--out", type=str, default="results/orchestrator/batch_bench.json")
+    return p.parse_args()
+
+
+def make_orchestrator(workers, agent_ms):
+    delay = agent_ms / 1000
+
+    class StubAgent(BaseAgent):
+        def act(self, task):
+            time.sleep(delay)
+            return task
+
+    memory = SharedMemory()
+    orch = Orchestrator(None, memory, max_concurrent=workers)
+    orch.agents = AgentPool(memory, size=workers, factory=lambda name, mem: StubAgent(name, "stub", mem))
+    return orch
+
+
+def main():
+    args = parse_args()
+    goals = [f"Generate nightly report for ward {i}" for i in range(args.wards)]
+    rows = []
+    for workers in args.workers:
+        with redirect_stdout(io.StringIO()):
+            orch = make_orchestrator(workers, args.agent_ms)
+
+            async def sequential():
+                for g in goals:
+                    await orch.arun(g)
+
+            t0 = time.perf_counter()
+            asyncio.run(sequential())
+            seq_s = time.perf_counter() - t0
+
+            orch = make_orchestrator(workers, args.agent_ms)
+            batch = orch.run_batch(goals)
+        stats = batch["stats"]
+        row = {
+            "workers": workers,
+            "goals": len(goals),
+            "sequential_goals_per_s": len(goals) / seq_s,
+            "batch_goals_per_s": stats["goals_per_s"],
+            "distinct_plans": stats["distinct_plans"],
+            "phases_ms": {p: {k: round(v, 3) for k, v in d.items()} for p, d in stats["phases_ms"].items()},
+        }
+        print(json.dumps(row))
+        rows.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# scripts/bench_plan_cache.py
+"""Benchmark LLMPlanner.decompose with and without the persistent plan cache.
+
+Uses the local OpenAI stub (systems/llm_stub.py) with --llm-ms of simulated
+completion latency. A workload of --goals requests drawn from --distinct
+goal texts (with case/spacing variants) is planned cold, then again by a
+"second run" that reopens the same cache file.
+
+Run from the Myndra directory:
+    python -m scripts.bench_plan_cache --goals 200 --distinct 20 --llm-ms 50
+"""
+import argparse
+import io
+import json
+import random
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from orchestrator.plan_cache import PlanCache
+from orchestrator.planner import LLMPlanner
+from systems.llm_client import LLMClient
+from systems.llm_stub import StubLLMServer
+
+PLAN = json.dumps({"subtasks": [
+    {"task": "Collect metrics", "agent": "executor", "confidence": 0.9},
+    {"task": "Analyze metrics", "agent": "analyst", "confidence": 0.8},
+    {"task": "Summarize findings", "agent": "general", "confidence": 0.8},
+]})
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--goals", type=int, default=200)
+    p.add_argument("--distinct", type=int, default=20)
+    p.add_argument("--llm-ms", type=float, default=50.0)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/orchestrator/plan_cache_bench.json")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    base = [f"Analyze performance metrics for ward {i}" for i in range(args.distinct)]
+    goals = [rng.choice(base) for _ in range(args.goals)]
+    goals = [g.upper() if rng.random() < 0.3 else g for g in goals]
+    rows = []
+    with StubLLMServer(respond=lambda m, b: PLAN, latency_s=args.llm_ms / 1000) as server, \
+            tempfile.TemporaryDirectory() as tmp:
+        llm = LLMClient(base_url=server.base_url, api_key="stub")
+        path = str(Path(tmp) / "plans.sqlite")
+        for mode in ("no_cache", "cold_cache", "warm_cache"):
+            # warm_cache reopens the file cold_cache filled, as the next run would
+            cache = False if mode == "no_cache" else PlanCache(path)
+            with redirect_stdout(io.StringIO()):
+                planner = LLMPlanner(model="stub", llm=llm, cache=cache)
+                before = len(server.requests)
+                t0 = time.perf_counter()
+                for g in goals:
+                    planner.decompose(g)
+                elapsed = time.perf_counter() - t0
+            stats = planner.cache_stats() or {}
+            row = {
+                "mode": mode,
+                "goals": len(goals),
+                "llm_calls": len(server.requests) - before,
+                "ms_per_plan": elapsed / len(goals) * 1000,
+                "hit_rate": stats.get("hit_rate", 0.0),
+                "saved_ms": stats.get("saved_ms", 0.0),
+            }
+            print(json.dumps(row))
+            rows.append(row)
+            if cache:
+                cache.close()
+        llm.close()
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
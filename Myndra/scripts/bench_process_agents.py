@@ -0,0 +1,101 @@
+# scripts/bench_process_agents.py
+"""Benchmark thread vs process execution of a CPU-bound agent in AsyncRuntime.
+
+The agent burns --work iterations of pure-Python arithmetic per task (so it
+holds the GIL) and writes one memory entry. For each worker count from 1 to
+--max-workers (default: every core), --tasks independent tasks run once on
+threads and once on a warmed-up ProcessAgentRunner with the same number of
+processes. Reports tasks/sec, speedup over one worker of the same mode, and
+how many memory writes reached the parent.
+
+Run from the Myndra directory:
+    python -m scripts.bench_process_agents --tasks 64 --work 200000
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from functools import partial
+from pathlib import Path
+
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from systems.async_runtime import AsyncRuntime
+from systems.process_agents import ProcessAgentRunner
+
+
+class CrunchAgent(BaseAgent):
+    cpu_bound = True
+
+    def __init__(self, name, role, memory, work):
+        super().__init__(name, role, memory)
+        self.work = work
+
+    def act(self, task):
+        total = 0
+        for i in range(self.work):
+            total += i * i % 7
+        self.reflect(f"crunched {task}")
+        return total
+
+
+def crunch_factory(name, memory, work):
+    return CrunchAgent(name, "cpu", memory, work)
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--tasks", type=int, default=64)
+    p.add_argument("--work", type=int, default=200000)
+    p.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    p.add_argument("--out", type=str, default="results/orchestrator/process_agents_bench.json")
+    return p.parse_args()
+
+
+def run(workers, mode, tasks, work):
+    memory = SharedMemory()
+    # partial of a module-level function pickles, so it doubles as the worker-side spec
+    factory = partial(crunch_factory, work=work)
+    runner = None
+    if mode == "process":
+        runner = ProcessAgentRunner(["crunch"], memory, processes=workers, factory=factory)
+        runner.start()
+    rt = AsyncRuntime(max_concurrent=workers, processes=runner)
+    batch = [{"task": f"t{i}", "agent": "crunch"} for i in range(tasks)]
+    t0 = time.perf_counter()
+    results = asyncio.run(rt.run_batch(batch, lambda name: factory(name, memory)))
+    elapsed = time.perf_counter() - t0
+    if runner is not None:
+        runner.close()
+    assert all(r["status"] == "success" for r in results)
+    return elapsed, len(memory.get_recent("crunch", tasks))
+
+
+def main():
+    args = parse_args()
+    rows = []
+    base = {}
+    for workers in range(1, args.max_workers + 1):
+        for mode in ("thread", "process"):
+            elapsed, writes = run(workers, mode, args.tasks, args.work)
+            base.setdefault(mode, elapsed)
+            row = {
+                "mode": mode,
+                "workers": workers,
+                "tasks": args.tasks,
+                "tasks_per_s": args.tasks / elapsed,
+                "speedup": base[mode] / elapsed,
+                "memory_writes": writes,
+            }
+            print(json.dumps(row))
+            rows.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
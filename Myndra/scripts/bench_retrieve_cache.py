@@ -0,0 +1,68 @@
+# scripts/bench_retrieve_cache.py
+"""Benchmark SharedMemory.retrieve with and without the versioned query cache.
+
+Workload: a populated memory, then rounds in which several agents each
+write once and the planner/agents re-issue a fixed set of queries (as an
+orchestrator run does). Reports mean retrieve latency and cache hit rate.
+
+Run from the Myndra directory:
+    python -m scripts.bench_retrieve_cache --prefill 20000 --rounds 200
+"""
+import argparse
+import json
+import random
+import time
+from pathlib import Path
+
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults
+
+QUERIES = ["pneumonia", "task", "ward 3", "completed", "cardiomegaly", "summary", "xray review", "flagged"]
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--prefill", type=int, default=20_000)
+    p.add_argument("--rounds", type=int, default=200)
+    p.add_argument("--agents", type=int, default=6)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/memory/retrieve_cache_bench.json")
+    return p.parse_args()
+
+
+def run(args, cache_size):
+    class Policy(Defaults):
+        RETRIEVE_CACHE_SIZE = cache_size
+
+    rng = random.Random(args.seed)
+    sm = SharedMemory(policy=Policy)
+    for i in range(args.prefill):
+        sm.write(f"agent{i % args.agents}", f"DataAgent flagged pneumonia on xray {i} for ward {i % 40}", f"run {i // 500}")
+    calls, elapsed = 0, 0.0
+    for r in range(args.rounds):
+        writer = rng.randrange(args.agents)
+        sm.write(f"agent{writer}", f"Task 'step {r}' completed successfully")
+        for a in range(args.agents):
+            for q in QUERIES:
+                t0 = time.perf_counter()
+                sm.retrieve(f"agent{a}", q)
+                elapsed += time.perf_counter() - t0
+                calls += 1
+    return {"cache_size": cache_size, "retrieve_us": elapsed / calls * 1e6, **sm.cache_stats()}
+
+
+def main():
+    args = parse_args()
+    rows = [run(args, 0), run(args, Defaults.RETRIEVE_CACHE_SIZE)]
+    rows[1]["speedup"] = rows[0]["retrieve_us"] / rows[1]["retrieve_us"]
+    for row in rows:
+        print(json.dumps(row))
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
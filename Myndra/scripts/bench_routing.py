@@ -0,0 +1,106 @@
+# scripts/bench_routing.py
+"""Benchmark keyword vs load/latency-aware routing in Orchestrator.assign.
+
+Simulated agents sleep a per-type service time (--service-ms, in
+registry order Data/Analyst/Summarizer/General), with --pool instances of
+each type. Every plan has --tasks independent subtasks, a --skew fraction
+of which are analyses, and the rest spread over the other keywords. Each
+mode runs --rounds plans through assign + execute, so the adaptive router
+learns latencies from the first rounds; makespan is averaged over the
+rounds after the first.
+
+Run from the Myndra directory:
+    python -m scripts.bench_routing --tasks 16 --skew 0.25 0.5 0.75 0.9
+"""
+import argparse
+import asyncio
+import io
+import json
+import random
+import statistics
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from agents.agent_registry import AgentPool
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+
+TYPES = ("DataAgent", "AnalystAgent", "SummarizerAgent", "GeneralAgent")
+KEYWORDS = {"DataAgent": "Gather data", "AnalystAgent": "Analyze patterns",
+            "SummarizerAgent": "Summarize findings", "GeneralAgent": "Coordinate teams"}
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--tasks", type=int, default=16)
+    p.add_argument("--skew", type=float, nargs="+", default=[0.25, 0.5, 0.75, 0.9])
+    p.add_argument("--service-ms", type=float, nargs=4, default=[20.0, 40.0, 20.0, 30.0])
+    p.add_argument("--pool", type=int, default=2)
+    p.add_argument("--max-concurrent", type=int, default=8)
+    p.add_argument("--rounds", type=int, default=6)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/orchestrator/routing_bench.json")
+    return p.parse_args()
+
+
+def sim_agents(service_ms):
+    """One BaseAgent subclass per registry type, named like it so results carry the type."""
+    classes = {}
+    for name, ms in zip(TYPES, service_ms):
+        def act(self, task, delay=ms / 1000):
+            time.sleep(delay)
+            return f"{self.name} did {task}"
+        classes[name] = type(name, (BaseAgent,), {"act": act})
+    return classes
+
+
+def make_plan(rng, n, skew):
+    others = [t for t in TYPES if t != "AnalystAgent"]
+    plan = []
+    for i in range(n):
+        kind = "AnalystAgent" if rng.random() < skew else rng.choice(others)
+        plan.append({"task": f"{KEYWORDS[kind]} for ward {i}"})
+    return plan
+
+
+def main():
+    args = parse_args()
+    classes = sim_agents(args.service_ms)
+    rows = []
+    for skew in args.skew:
+        for mode in ("keyword", "adaptive"):
+            rng = random.Random(args.seed)
+            memory = SharedMemory()
+            with redirect_stdout(io.StringIO()):
+                orch = Orchestrator(None, memory, max_concurrent=args.max_concurrent)
+            orch.agents = AgentPool(memory, size=args.pool, factory=lambda name, mem: classes[name](name, "sim", mem))
+            orch.router.pool = orch.agents
+            orch.router.adaptive = mode == "adaptive"
+            makespans = []
+            for _ in range(args.rounds):
+                schedule = {}
+                with redirect_stdout(io.StringIO()):
+                    assignments = orch.assign(make_plan(rng, args.tasks, skew))
+                    asyncio.run(orch.aexecute(assignments, schedule))
+                makespans.append(schedule["makespan_ms"])
+            routed = {name: s["routed"] for name, s in orch.router.stats.items()}
+            row = {
+                "skew": skew,
+                "mode": mode,
+                "tasks": args.tasks,
+                "makespan_ms": statistics.mean(makespans[1:] or makespans),
+                "routed": routed,
+            }
+            print(json.dumps(row))
+            rows.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+# scripts/bench_semantic_retrieval.py
+"""Benchmark semantic retrieval query latency as one agent's memory grows.
+
+Embeds synthetic agent results into a SemanticIndex (one agent, the worst
+case since queries scan only the querying agent's rows) and times cosine
+top-k queries at each size. Also reports per-write encode cost and matrix
+memory.
+
+Run from the Myndra directory:
+    python -m scripts.bench_semantic_retrieval --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from pathlib import Path
+
+from memory.memory_types import Defaults
+from memory.semantic import SemanticIndex
+
+WORDS = ["pneumonia", "cardiomegaly", "chest", "xray", "reviewed", "flagged", "ward", "patient",
+         "billing", "export", "summary", "planner", "report", "triage", "stat", "routine"]
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--dim", type=int, default=Defaults.SEM_DIM)
+    p.add_argument("--queries", type=int, default=200)
+    p.add_argument("--top-k", type=int, default=Defaults.SEM_BUCKET_CAP)
+    p.add_argument("--seed", type=int, default=0)
+    p.add_argument("--out", type=str, default="results/memory/semantic_bench.json")
+    return p.parse_args()
+
+
+def text(rng, i):
+    return f"{' '.join(rng.choice(WORDS) for _ in range(5))} case {i}"
+
+
+def main():
+    args = parse_args()
+    rng = random.Random(args.seed)
+    idx = SemanticIndex(dim=args.dim, max_per_agent=max(args.sizes))
+    results = []
+    added, encode_s = 0, 0.0
+    for size in sorted(args.sizes):
+        t0 = time.perf_counter()
+        while added < size:
+            idx.add("agent:bench", text(rng, added), created=time.time())
+            added += 1
+        encode_s += time.perf_counter() - t0
+        queries = [text(rng, rng.randrange(size)) for _ in range(args.queries)]
+        now = time.time()
+        lat = []
+        for q in queries:
+            t0 = time.perf_counter()
+            idx.search("agent:bench", q, args.top_k, now)
+            lat.append((time.perf_counter() - t0) * 1e3)
+        lat.sort()
+        store = idx._stores["agent:bench"]
+        row = {
+            "memories": size,
+            "dim": args.dim,
+            "encode_us_per_write": encode_s / added * 1e6,
+            "query_ms_p50": statistics.median(lat),
+            "query_ms_p99": lat[int(0.99 * (len(lat) - 1))],
+            "matrix_mb": store.mat.nbytes / 2**20,
+        }
+        print(json.dumps(row))
+        results.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(results, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
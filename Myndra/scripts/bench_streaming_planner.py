@@ -0,0 +1,100 @@
+# scripts/bench_streaming_planner.py
+"""Benchmark Orchestrator.arun with a blocking vs a streaming LLM plan.
+
+Uses the local OpenAI stub (systems/llm_stub.py), which writes the plan
+--chunk-chars characters at a time, --chunk-ms apart; a blocking call
+waits out the same generation time before answering. The plan has
+--subtasks steps, every third depending on the one before it, and each
+agent works for --task-ms. Reports time-to-first-task (goal start to the
+first agent starting) and total run latency, as medians over --runs.
+
+Run from the Myndra directory:
+    python -m scripts.bench_streaming_planner --subtasks 8 --chunk-ms 10 --task-ms 100
+"""
+import argparse
+import asyncio
+import io
+import json
+import statistics
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from agents.agent_registry import AgentPool
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+from orchestrator.planner import LLMPlanner
+from systems.llm_client import LLMClient
+from systems.llm_stub import StubLLMServer
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--subtasks", type=int, default=8)
+    p.add_argument("--chunk-chars", type=int, default=8)
+    p.add_argument("--chunk-ms", type=float, default=10.0)
+    p.add_argument("--task-ms", type=float, default=100.0)
+    p.add_argument("--max-concurrent", type=int, default=4)
+    p.add_argument("--runs", type=int, default=5)
+    p.add_argument("--out", type=str, default="results/orchestrator/streaming_planner_bench.json")
+    return p.parse_args()
+
+
+def make_plan(n):
+    subtasks = []
+    for i in range(n):
+        deps = [subtasks[-1]["task"]] if i % 3 == 2 else []
+        subtasks.append({"task": f"Review ward {i} throughput", "agent": "general",
+                         "confidence": 0.8, "depends_on": deps})
+    return json.dumps({"subtasks": subtasks})
+
+
+def main():
+    args = parse_args()
+    plan = make_plan(args.subtasks)
+
+    class WorkAgent(BaseAgent):
+        def act(self, task):
+            time.sleep(args.task_ms / 1000)
+            return f"done: {task}"
+
+    rows = []
+    with StubLLMServer(respond=lambda m, b: plan, chunk_chars=args.chunk_chars,
+                       chunk_latency_s=args.chunk_ms / 1000) as server:
+        llm = LLMClient(base_url=server.base_url, api_key="stub")
+        for mode in ("blocking", "streaming"):
+            ttft, total = [], []
+            for _ in range(args.runs):
+                memory = SharedMemory()
+                with redirect_stdout(io.StringIO()):
+                    orch = Orchestrator(None, memory, max_concurrent=args.max_concurrent,
+                                        stream_plan=mode == "streaming")
+                    orch.agents = AgentPool(memory, size=args.max_concurrent,
+                                            factory=lambda name, mem: WorkAgent(name, "bench", mem))
+                    orch.planner.use_llm = True
+                    orch.planner.llm_planner = LLMPlanner(memory=memory, model="stub", llm=llm, cache=False)
+                    t0 = time.perf_counter()
+                    asyncio.run(orch.arun("Review throughput across wards"))
+                    total.append((time.perf_counter() - t0) * 1000)
+                ttft.append(orch.profiler.metrics["time_to_first_task_ms"][0])
+            row = {
+                "mode": mode,
+                "subtasks": args.subtasks,
+                "plan_chars": len(plan),
+                "generation_ms": args.chunk_ms * -(-len(plan) // args.chunk_chars),
+                "time_to_first_task_ms": statistics.median(ttft),
+                "total_ms": statistics.median(total),
+            }
+            print(json.dumps(row))
+            rows.append(row)
+        llm.close()
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+# scripts/bench_tracing.py
+"""Benchmark the cost of orchestration logging in batch mode.
+
+Runs --wards goals through orch.run_batch with the registry agents (which
+log on every act) under three tracer settings:
+
+- echo:  every log event is formatted and printed (the old print()
+         behaviour); stdout goes to os.devnull so terminal speed does not
+         skew the numbers
+- quiet: events are recorded in the ring buffer but never formatted
+- off:   nothing is recorded (MYNDRA_TRACE=0)
+
+Each mode runs --repeats times; reports the best goals/sec and how many
+events the ring buffer holds afterwards.
+
+Run from the Myndra directory:
+    python -m scripts.bench_tracing --wards 200 --repeats 3
+"""
+import argparse
+import json
+import os
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+from systems.tracing import get_tracer
+
+MODES = {"echo": (False, True), "quiet": (True, True), "off": (True, False)}
+
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--wards", type=int, default=200)
+    p.add_argument("--repeats", type=int, default=3)
+    p.add_argument("--workers", type=int, default=4)
+    p.add_argument("--out", type=str, default="results/orchestrator/tracing_bench.json")
+    return p.parse_args()
+
+
+def main():
+    args = parse_args()
+    goals = [f"Analyze vitals and summarize trends for ward {i}" for i in range(args.wards)]
+    tracer = get_tracer()
+    rows = []
+    for mode, (quiet, enabled) in MODES.items():
+        tracer.quiet, tracer.enabled = quiet, enabled
+        best = None
+        for _ in range(args.repeats):
+            tracer.clear()
+            with open(os.devnull, "w") as sink, redirect_stdout(sink):
+                orch = Orchestrator(None, SharedMemory(), max_concurrent=args.workers)
+                t0 = time.perf_counter()
+                orch.run_batch(goals)
+                elapsed = time.perf_counter() - t0
+            best = elapsed if best is None else min(best, elapsed)
+        row = {
+            "mode": mode,
+            "goals": len(goals),
+            "goals_per_s": len(goals) / best,
+            "ms_per_goal": best * 1000 / len(goals),
+            "events_buffered": len(tracer.events()),
+        }
+        print(json.dumps(row))
+        rows.append(row)
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(rows, indent=2))
+    print(f"\n Saved benchmark results to {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,417 @@
 import asyncio
+import contextvars
+import random
+import threading
 import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+
+from systems.dag_scheduler import TaskGraph
+from systems.tracing import get_tracer
+
+
+class TransientError(Exception):
+    """Raised by an agent for a failure worth retrying (a flaky backend, a busy service)."""
+
+
+# Agent errors retried by default; anything else fails the task on the first attempt
+RETRYABLE = (TransientError, ConnectionError, TimeoutError)
+
 
 class AsyncRuntime:
-    def __init__(self, max_concurrent=4):
+    """Runs agent.act calls on worker threads with bounded concurrency.
+
+    Every task can have a deadline (task_timeout_s, or "timeout_s" on the
+    assignment) covering all of its attempts. A task past it reports status
+    "timeout". Its thread cannot
+    be killed, so it is left to finish on its own and the executor is
+    replaced so the abandoned thread does not take a worker slot. At most
+    max_abandoned_threads stuck threads are left behind this way; past that
+    the runtime is `degraded`: stuck calls keep their worker slots, so
+    capacity shrinks instead of threads piling up. Errors in
+    retry_on are retried up to max_retries times with full-jitter
+    exponential backoff. Cancellation is cooperative: each attempt hands
+    the agent a threading.Event as agent.cancelled. The event is set when
+    the attempt times out or the awaiting task is cancelled, so
+    long-running agents can check it and stop early.
+
+    With `processes` (a ProcessAgentRunner), the agent types it handles run
+    in its worker processes instead of on threads; see
+    systems/process_agents.py.
+
+    Each task is recorded as a "task" span on `tracer` (the process-wide
+    tracer by default); act() runs in a copy of the caller's context, so
+    an agent's log events nest under its task.
+    """
+
+    def __init__(self, max_concurrent=4, task_timeout_s=None, max_retries=0, backoff_base_s=0.05,
+                 backoff_max_s=1.0, retry_on=RETRYABLE, processes=None, tracer=None, max_abandoned_threads=8):
         self.max_concurrent = max_concurrent
+        self.task_timeout_s = task_timeout_s
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.retry_on = retry_on
+        self.processes = processes
+        self.tracer = tracer or get_tracer()
+        # Schedule stats of the most recent run_dag call
+        self.last_schedule = None
+        # asyncio's default executor has min(32, cpus + 4) threads, which would cap
+        # concurrency below max_concurrent on small machines
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="myndra-agent")
+        # One limiter per event loop, shared by every batch/plan running on it, so
+        # concurrent orchestrations together stay within max_concurrent
+        self._limiters = weakref.WeakKeyDictionary()
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        # Ready tasks (waiting for a slot or running) per agent name, read by AgentRouter
+        self.load = {}
+        self.stats = {"retries": 0, "timeouts": 0, "cancelled": 0, "abandoned_threads": 0}
+        self.max_abandoned_threads = max_abandoned_threads
+        # Abandoned act() calls still running; their done callbacks decrement it from worker threads
+        self.stuck_threads = 0
+        self._stuck_lock = threading.Lock()
+
+    @property
+    def degraded(self):
+        """True while max_abandoned_threads stuck calls are still running."""
+        return self.stuck_threads >= self.max_abandoned_threads
 
-    async def _run_agent(self, agent, task):
+    def _limiter(self):
+        loop = asyncio.get_running_loop()
+        sem = self._limiters.get(loop)
+        if sem is None:
+            sem = self._limiters[loop] = asyncio.Semaphore(self.max_concurrent)
+        return sem
+
+    @staticmethod
+    def _acquire(agent_source, name):
+        """Context manager yielding an agent: leased from a pool, or built by a factory."""
+        if hasattr(agent_source, "lease"):
+            return agent_source.lease(name)
+        return nullcontext(agent_source(name))
+
+    def _act(self, agent_source, name, task, inputs, cancelled):
+        # Runs on a worker thread, so a pool checkout that has to wait never blocks the loop
+        with self._acquire(agent_source, name) as agent:
+            if inputs is not None:
+                agent.inputs = inputs
+            agent.cancelled = cancelled
+            return agent.__class__.__name__, agent.act(task)
+
+    def _abandon(self, work, in_process=False):
+        """Give up on a submitted act() call; if it is already running, move on to a fresh executor."""
+        if work.cancel() or work.done():
+            return
+        if in_process:
+            # The worker process stays busy until act() returns; restarting the pool would lose every warm agent
+            return
+        if self.degraded:
+            # The stuck call keeps its worker slot instead of adding another thread
+            self.tracer.log("[Runtime] {} abandoned threads still running; not replacing the executor",
+                            self.stuck_threads, level="warning")
+            return
+        self.stats["abandoned_threads"] += 1
+        with self._stuck_lock:
+            self.stuck_threads += 1
+        work.add_done_callback(self._unstick)
+        old, self._executor = self._executor, ThreadPoolExecutor(
+            max_workers=self.max_concurrent, thread_name_prefix="myndra-agent")
+        # Lets the stuck thread exit whenever act() returns; other running calls finish normally
+        old.shutdown(wait=False)
+
+    def _unstick(self, work):
+        with self._stuck_lock:
+            self.stuck_threads -= 1
+
+    async def _run_agent(self, agent_source, name, task, inputs=None, timeout_s=None):
+        with self.tracer.span("task", agent=name, task=task) as span:
+            result = await self._attempt(agent_source, name, task, inputs, timeout_s)
+            span.update(agent=result["agent"], status=result["status"], attempts=result["attempts"])
+        return result
+
+    async def _attempt(self, agent_source, name, task, inputs, timeout_s):
+        """Run act() until it succeeds, fails for good, or the deadline passes."""
         start = time.time()
-        try:
-            result = await asyncio.to_thread(agent.act, task)
-            status = "success"
-        except Exception as e:
-            result = {"error":str(e)}
-            status = "error"
+        agent_cls = name
+        timeout_s = self.task_timeout_s if timeout_s is None else timeout_s
+        # The deadline covers every attempt and backoff, not each attempt separately
+        deadline = None if timeout_s is None else time.monotonic() + timeout_s
+        attempts = 0
+        while True:
+            attempts += 1
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            cancelled = threading.Event()
+            in_process = self.processes is not None and self.processes.handles(name)
+            if in_process:
+                work = self.processes.submit(name, task, inputs)
+            else:
+                work = self._executor.submit(contextvars.copy_context().run,
+                                             self._act, agent_source, name, task, inputs, cancelled)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            retry = False
+            try:
+                if in_process:
+                    agent_cls, result, writes = await asyncio.wait_for(asyncio.wrap_future(work), remaining)
+                    self.processes.apply(writes)
+                else:
+                    agent_cls, result = await asyncio.wait_for(asyncio.wrap_future(work), remaining)
+                status = "success"
+            except asyncio.CancelledError:
+                cancelled.set()
+                self._abandon(work, in_process)
+                self.stats["cancelled"] += 1
+                raise
+            except Exception as e:
+                if isinstance(e, asyncio.TimeoutError) and (work.cancelled() or not work.done()):
+                    cancelled.set()
+                    self._abandon(work, in_process)
+                    self.stats["timeouts"] += 1
+                    result = {"error": f"timed out after {timeout_s}s"}
+                    status = "timeout"
+                else:
+                    result = {"error": str(e)}
+                    status = "error"
+                    retry = isinstance(e, self.retry_on) and attempts <= self.max_retries
+            finally:
+                self.in_flight -= 1
+            delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** (attempts - 1)))
+            if not retry or (deadline is not None and time.monotonic() + delay >= deadline):
+                break
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
         end = time.time()
 
         return {
-            "agent":agent.__class__.__name__,
+            "agent":agent_cls,
             "task":task,
             "result":result,
             "status":status,
-            "duration_ms":(end-start) * 1000
+            "duration_ms":(end-start) * 1000,
+            "attempts":attempts,
         }
-            
+
+
+    @contextmanager
+    def _queued(self, name):
+        self.load[name] = self.load.get(name, 0) + 1
+        try:
+            yield
+        finally:
+            self.load[name] -= 1
 
     async def run_batch(self, assignments, get_agent_fn):
-        sem = asyncio.Semaphore(self.max_concurrent)
+        """Run all assignments at once under the concurrency limit.
+
+        get_agent_fn is either a factory (name -> agent) or an AgentPool, in
+        which case each task leases an instance and returns it when done.
+        Results come back in assignment order once every task has finished;
+        as_completed() hands them over one by one instead. An assignment may
+        carry a "context" (contextvars.Context) to run its task in, e.g. the
+        context of the request it serves, so its span joins that trace.
+        """
+        results = [None] * len(assignments)
+        async for result in self.as_completed(assignments, get_agent_fn):
+            results[result.pop("index")] = result
+        return results
+
+    async def as_completed(self, assignments, get_agent_fn):
+        """Run assignments like run_batch, yielding each result (with its "index") as soon as it finishes.
+
+        Closing the iterator early, or cancelling the task consuming it,
+        cancels the tasks still pending or running.
+        """
+        sem = self._limiter()
+
+        async def run_with_semaphore(i, assignment):
+            with self._queued(assignment["agent"]):
+                async with sem:
+                    result = await self._run_agent(get_agent_fn, assignment["agent"], assignment["task"],
+                                                   timeout_s=assignment.get("timeout_s"))
+            result["index"] = i
+            return result
+
+        def start(i, assignment):
+            coro = run_with_semaphore(i, assignment)
+            context = assignment.get("context")
+            # A task copies the context current at its creation
+            return asyncio.ensure_future(coro) if context is None else context.run(asyncio.ensure_future, coro)
+
+        tasks = [start(i, a) for i, a in enumerate(assignments)]
+        try:
+            for fut in asyncio.as_completed(tasks):
+                yield await fut
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def run_dag(self, assignments, get_agent_fn, schedule=None):
+        """Run assignments in dependency order, each as soon as its depends_on are done.
+
+        get_agent_fn is a factory or an AgentPool, as in run_batch. An agent
+        that cannot be built (e.g. an unknown name) fails only its own task.
+        Upstream outputs reach a task as agent.inputs ({upstream task: result})
+        and are echoed in its result under "inputs". A task whose upstream
+        failed is not run; it reports status "skipped". Raises CycleError
+        before anything runs if the plan has a cycle. Results come back in
+        assignment order. Schedule stats are left in self.last_schedule and,
+        when several plans run at once, also written into the `schedule` dict
+        if one is passed.
+        """
+        graph = TaskGraph(assignments)
+        n = len(graph)
+        results = [None] * n
+        remaining = [len(p) for p in graph.parents]
+        clock = self._clock()
+        spans = [None] * n
+
+        async def run_node(i):
+            upstream = [results[p] for p in graph.parents[i]]
+            results[i], spans[i] = await self._run_node(assignments[i], upstream, get_agent_fn, clock)
+
+        pending = {asyncio.ensure_future(run_node(i)): i for i in graph.roots()}
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for fut in done:
+                    i = pending.pop(fut)
+                    fut.result()
+                    for c in graph.children[i]:
+                        remaining[c] -= 1
+                        if remaining[c] == 0:
+                            pending[asyncio.ensure_future(run_node(c))] = c
+        finally:
+            # A failed node or a cancelled caller stops the rest of the plan
+            for fut in pending:
+                fut.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        return self._finish_schedule(graph, spans, clock, schedule, results)
+
+    async def run_dag_stream(self, assignments, get_agent_fn, schedule=None):
+        """run_dag() over an async iterable of assignments that is still being produced.
+
+        Each assignment is scheduled the moment it arrives: it starts at once
+        if its depends_on are done, otherwise when they finish, so early tasks
+        run while later ones are still being planned. depends_on may only
+        name assignments that arrived earlier (by task text or arrival index);
+        anything else is reported in unresolved_deps, which also rules out
+        cycles. Results come back in arrival order; schedule stats gain
+        "first_task_ms", when the first task started relative to this call.
+        """
+        names, parents, children, results, spans, remaining = [], [], [], [], [], []
+        by_name = {}
+        unresolved = []
+        clock = self._clock()
         tasks = []
 
-        async def run_with_semaphore(assignment):
-            async with sem:
-                agent = get_agent_fn(assignment["agent"])
-                return await self._run_agent(agent, assignment["task"])
-        
-        for a in assignments:
-            tasks.append(run_with_semaphore(a))
-        results = await asyncio.gather(*tasks)
-        return results
\ No newline at end of file
+        async def run_node(i, assignment):
+            upstream = [results[p] for p in parents[i]]
+            results[i], spans[i] = await self._run_node(assignment, upstream, get_agent_fn, clock)
+            for c in children[i]:
+                remaining[c] -= 1
+                if remaining[c] == 0:
+                    tasks.append(asyncio.ensure_future(run_node(c, arrived[c])))
+
+        arrived = []
+        try:
+            async for assignment in assignments:
+                i = len(names)
+                name = str(assignment.get("task", ""))
+                names.append(name)
+                arrived.append(assignment)
+                by_name.setdefault(name.strip().lower(), i)
+                parents.append([])
+                children.append([])
+                results.append(None)
+                spans.append(None)
+                for dep in assignment.get("depends_on") or []:
+                    if isinstance(dep, int) and not isinstance(dep, bool):
+                        j = dep if 0 <= dep < i else None
+                    else:
+                        j = by_name.get(str(dep).strip().lower())
+                    if j is None or j == i:
+                        unresolved.append((name, dep))
+                    elif j not in parents[i]:
+                        parents[i].append(j)
+                remaining.append(0)
+                for j in parents[i]:
+                    if results[j] is None:
+                        children[j].append(i)
+                        remaining[i] += 1
+                if remaining[i] == 0:
+                    tasks.append(asyncio.ensure_future(run_node(i, assignment)))
+        finally:
+            # Tasks already started finish even if the producer fails; running tasks may start their children
+            try:
+                while not all(t.done() for t in tasks):
+                    await asyncio.wait([t for t in tasks if not t.done()])
+            except asyncio.CancelledError:
+                # The caller was cancelled: stop the tasks instead of leaving them running
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+        for task in tasks:
+            task.result()
+
+        # Every edge points at an earlier arrival, so arrival indices make a valid TaskGraph
+        graph = TaskGraph([{"task": names[i], "depends_on": parents[i]} for i in range(len(names))])
+        graph.unresolved = unresolved
+        return self._finish_schedule(graph, spans, clock, schedule, results)
+
+    def _clock(self):
+        return {"t0": time.perf_counter(), "running": 0, "peak": 0, "first": None, "sem": self._limiter()}
+
+    async def _run_node(self, assignment, upstream, get_agent_fn, clock):
+        """Run one DAG node once its upstream results are in; returns (result, (start, end) offsets)."""
+        failed = [u["task"] for u in upstream if u["status"] != "success"]
+        if failed:
+            now = time.perf_counter() - clock["t0"]
+            return {
+                "agent": assignment["agent"],
+                "task": assignment["task"],
+                "result": {"error": f"upstream failed: {', '.join(failed)}"},
+                "status": "skipped",
+                "duration_ms": 0.0,
+            }, (now, now)
+        inputs = {u["task"]: u["result"] for u in upstream}
+        with self._queued(assignment["agent"]):
+            async with clock["sem"]:
+                clock["running"] += 1
+                clock["peak"] = max(clock["peak"], clock["running"])
+                start = time.perf_counter() - clock["t0"]
+                if clock["first"] is None:
+                    clock["first"] = start
+                try:
+                    result = await self._run_agent(get_agent_fn, assignment["agent"], assignment["task"], inputs,
+                                                   timeout_s=assignment.get("timeout_s"))
+                finally:
+                    clock["running"] -= 1
+                span = (start, time.perf_counter() - clock["t0"])
+        if inputs:
+            result["inputs"] = inputs
+        return result, span
+
+    def _finish_schedule(self, graph, spans, clock, schedule, results):
+        makespan = time.perf_counter() - clock["t0"]
+        busy = [end - start for start, end in spans]
+        path, path_s = graph.critical_path(busy)
+        stats = {
+            "tasks": len(graph),
+            "makespan_ms": makespan * 1000,
+            "critical_path": [graph.names[i] for i in path],
+            "critical_path_ms": path_s * 1000,
+            "max_parallelism": clock["peak"],
+            # Mean number of tasks in flight over the run
+            "avg_parallelism": sum(busy) / makespan if makespan > 0 else 0.0,
+            "first_task_ms": (clock["first"] or 0.0) * 1000,
+            "unresolved_deps": list(graph.unresolved),
+        }
+        self.last_schedule = stats
+        if schedule is not None:
+            schedule.update(stats)
+        return results
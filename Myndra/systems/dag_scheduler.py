@@ -0,0 +1,101 @@
+"""
+Dependency-aware scheduling for orchestrator plans.
+
+PlannerAdapter emits subtasks whose `depends_on` lists name earlier tasks
+(by task text, or by position). TaskGraph turns an assignment list into a
+DAG, rejects cycles, and computes the critical path once durations are
+known. AsyncRuntime.run_dag uses it to launch every subtask as soon as its
+own dependencies finish instead of all at once.
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+
+class CycleError(ValueError):
+    """Raised when a plan's depends_on edges form a cycle; .cycle lists the task names."""
+
+    def __init__(self, cycle: List[str]):
+        self.cycle = cycle
+        super().__init__("Dependency cycle: " + " -> ".join(cycle))
+
+
+class TaskGraph:
+    """DAG over assignment indices built from each assignment's depends_on."""
+
+    def __init__(self, assignments: Sequence[dict]):
+        self.names = [str(a.get("task", "")) for a in assignments]
+        by_name: Dict[str, int] = {}
+        for i, name in enumerate(self.names):
+            by_name.setdefault(name.strip().lower(), i)
+
+        self.parents: List[List[int]] = [[] for _ in assignments]
+        self.children: List[List[int]] = [[] for _ in assignments]
+        # Dependencies that name no task in the plan; LLM plans drift, so
+        # these are reported rather than failing the run
+        self.unresolved: List[tuple] = []
+        for i, a in enumerate(assignments):
+            for dep in a.get("depends_on") or []:
+                j = self._resolve(dep, by_name)
+                if j is None:
+                    self.unresolved.append((self.names[i], dep))
+                    continue
+                if j == i:
+                    raise CycleError([self.names[i], self.names[i]])
+                if j not in self.parents[i]:
+                    self.parents[i].append(j)
+                    self.children[j].append(i)
+        self.order = self._topological_order()
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _resolve(self, dep, by_name) -> Optional[int]:
+        if isinstance(dep, int) and not isinstance(dep, bool):
+            return dep if 0 <= dep < len(self.names) else None
+        return by_name.get(str(dep).strip().lower())
+
+    def _topological_order(self) -> List[int]:
+        """Kahn's algorithm; on leftover nodes, walk parents to name the cycle."""
+        indeg = [len(p) for p in self.parents]
+        ready = [i for i, d in enumerate(indeg) if d == 0]
+        order = []
+        while ready:
+            i = ready.pop()
+            order.append(i)
+            for c in self.children[i]:
+                indeg[c] -= 1
+                if indeg[c] == 0:
+                    ready.append(c)
+        if len(order) < len(self.names):
+            # Every leftover node keeps a leftover parent, so walking parents must revisit one
+            node = next(i for i, d in enumerate(indeg) if d > 0)
+            seen: Dict[int, int] = {}
+            path = []
+            while node not in seen:
+                seen[node] = len(path)
+                path.append(node)
+                node = next(p for p in self.parents[node] if indeg[p] > 0)
+            cycle = path[seen[node]:] + [node]
+            raise CycleError([self.names[i] for i in reversed(cycle)])
+        return order
+
+    def roots(self) -> List[int]:
+        return [i for i, p in enumerate(self.parents) if not p]
+
+    def critical_path(self, durations: Sequence[float]) -> tuple:
+        """Longest duration-weighted chain: returns (indices in run order, total duration)."""
+        if not self.names:
+            return [], 0.0
+        finish = [0.0] * len(self.names)
+        via: List[Optional[int]] = [None] * len(self.names)
+        for i in self.order:
+            best = max(self.parents[i], key=lambda p: finish[p], default=None)
+            finish[i] = durations[i] + (finish[best] if best is not None else 0.0)
+            via[i] = best
+        node = max(range(len(finish)), key=finish.__getitem__)
+        total = finish[node]
+        path = []
+        while node is not None:
+            path.append(node)
+            node = via[node]
+        return path[::-1], total
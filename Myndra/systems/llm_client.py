@@ -0,0 +1,312 @@
+"""
+Shared async LLM client for the planner and summarizer.
+
+One AsyncOpenAI client (one pooled HTTP connection pool) runs on a private
+event loop thread, so callers on any loop, or in plain sync code, share the
+same connections and the same limits:
+
+- deadline_s: per-call budget covering every retry and hedge; on expiry
+  LLMDeadlineExceeded is raised so callers can fall back
+- max_retries: connection errors, 429s and 5xx are retried with full-jitter
+  exponential backoff (uniform(0, min(backoff_max_s, backoff_base_s * 2**n)))
+- max_concurrent: cap on requests in flight across all callers
+- hedge_after_s: if a request has not answered by then and a slot is free,
+  a duplicate is sent and the first success wins (the other is cancelled)
+
+astream() yields content deltas as they arrive. The deadline covers the
+whole stream, and a stream holds one concurrency slot until it ends. It is
+retried only until the response starts; after that a retry would repeat
+text the caller has already consumed. Streams are never hedged.
+
+    llm = get_llm_client()
+    text = llm.complete([{"role": "user", "content": "hi"}], model="gpt-5-mini")
+    text = await llm.acomplete(messages, model="gpt-5-mini", deadline_s=5)
+    async for delta in llm.astream(messages, model="gpt-5-mini"):
+        ...
+"""
+
+import asyncio
+import os
+import random
+import threading
+import time
+from collections import deque
+
+import httpx
+import openai
+
+RETRYABLE = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """The call (including retries and hedges) ran past its deadline."""
+
+
+class LLMClient:
+    def __init__(self, api_key=None, base_url=None, max_concurrent: int = 8, deadline_s: float = 30.0,
+                 max_retries: int = 3, backoff_base_s: float = 0.25, backoff_max_s: float = 4.0,
+                 hedge_after_s: float = None, client=None):
+        if max_concurrent <= 0:
+            raise ValueError("max_concurrent must be > 0")
+        self.max_concurrent = max_concurrent
+        self.deadline_s = deadline_s
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self.hedge_after_s = hedge_after_s
+        # Retries are ours (deadline-aware); the SDK's own would stack on top
+        self._client = client or openai.AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            http_client=openai.DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=max_concurrent * 2, max_keepalive_connections=max_concurrent)
+            ),
+        )
+        self._loop = None
+        self._thread = None
+        self._sem = None
+        self._start_lock = threading.Lock()
+        self._latency_ms = deque(maxlen=1024)
+        self._stats = {"calls": 0, "ok": 0, "errors": 0, "deadline_exceeded": 0,
+                       "retries": 0, "hedges": 0, "hedge_wins": 0}
+
+    def _ensure_loop(self):
+        with self._start_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                self._thread = threading.Thread(target=serve, name="myndra-llm", daemon=True)
+                self._thread.start()
+                ready.wait()
+                self._loop = loop
+        return self._loop
+
+    def run(self, coro):
+        """Run a coroutine on the client loop from sync code and return its result."""
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("LLMClient.run called from the client loop; await instead")
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    async def acomplete(self, messages, model: str, deadline_s: float = None, **kwargs) -> str:
+        """Chat completion text, awaitable from any event loop."""
+        loop = self._ensure_loop()
+        coro = self._complete(messages, model, deadline_s, kwargs)
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    def complete(self, messages, model: str, deadline_s: float = None, **kwargs) -> str:
+        """Blocking chat completion text."""
+        return self.run(self._complete(messages, model, deadline_s, kwargs))
+
+    async def astream(self, messages, model: str, deadline_s: float = None, **kwargs):
+        """Streamed chat completion: an async iterator of content deltas, usable from any event loop."""
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            async for delta in self._stream(messages, model, deadline_s, kwargs):
+                yield delta
+            return
+
+        # Pump the stream on the client loop and hand deltas across to the caller's loop
+        queue = asyncio.Queue()
+
+        def put(item):
+            try:
+                running.call_soon_threadsafe(queue.put_nowait, item)
+            except RuntimeError:
+                # The caller's loop is gone; nobody is listening any more
+                pass
+
+        async def pump():
+            try:
+                async for delta in self._stream(messages, model, deadline_s, kwargs):
+                    put(("delta", delta))
+            except BaseException as e:
+                put(("error", e))
+                raise
+            put(("end", None))
+
+        future = asyncio.run_coroutine_threadsafe(pump(), loop)
+        try:
+            while True:
+                kind, value = await queue.get()
+                if kind == "delta":
+                    yield value
+                elif kind == "error":
+                    raise value
+                else:
+                    return
+        finally:
+            future.cancel()
+
+    async def _stream(self, messages, model, deadline_s, kwargs):
+        self._ensure_sem()
+        budget = self.deadline_s if deadline_s is None else deadline_s
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + budget
+        self._stats["calls"] += 1
+        start = time.perf_counter()
+        try:
+            stream = await self._open_stream(messages, model, kwargs, lambda: deadline - loop.time())
+            try:
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(stream.__anext__(), timeout=deadline - loop.time())
+                    except StopAsyncIteration:
+                        break
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+            finally:
+                self._sem.release()
+                await stream.close()
+        except asyncio.TimeoutError:
+            self._stats["deadline_exceeded"] += 1
+            raise LLMDeadlineExceeded(f"LLM stream from {model} exceeded its {budget:.2f}s deadline")
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        self._stats["ok"] += 1
+        self._latency_ms.append((time.perf_counter() - start) * 1000)
+
+    async def _open_stream(self, messages, model, kwargs, remaining):
+        """Start a stream, retrying until it does; returns holding a semaphore slot the caller must release."""
+        attempt = 0
+        while True:
+            await asyncio.wait_for(self._sem.acquire(), timeout=remaining())
+            try:
+                return await asyncio.wait_for(
+                    self._client.chat.completions.create(model=model, messages=messages, stream=True, **kwargs),
+                    timeout=remaining(),
+                )
+            except BaseException as e:
+                self._sem.release()
+                if not isinstance(e, RETRYABLE) or attempt >= self.max_retries:
+                    raise
+            delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+            attempt += 1
+            self._stats["retries"] += 1
+            await asyncio.wait_for(asyncio.sleep(delay), timeout=remaining())
+
+    def _ensure_sem(self):
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrent)
+
+    async def _complete(self, messages, model, deadline_s, kwargs):
+        self._ensure_sem()
+        budget = self.deadline_s if deadline_s is None else deadline_s
+        self._stats["calls"] += 1
+        start = time.perf_counter()
+        try:
+            text = await asyncio.wait_for(self._with_retries(messages, model, kwargs), timeout=budget)
+        except asyncio.TimeoutError:
+            self._stats["deadline_exceeded"] += 1
+            raise LLMDeadlineExceeded(f"LLM call to {model} exceeded its {budget:.2f}s deadline")
+        except Exception:
+            self._stats["errors"] += 1
+            raise
+        self._stats["ok"] += 1
+        self._latency_ms.append((time.perf_counter() - start) * 1000)
+        return text
+
+    async def _with_retries(self, messages, model, kwargs):
+        attempt = 0
+        while True:
+            try:
+                return await self._hedged(messages, model, kwargs)
+            except RETRYABLE:
+                if attempt >= self.max_retries:
+                    raise
+                # Full jitter; the surrounding wait_for cuts the sleep short at the deadline
+                delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+                attempt += 1
+                self._stats["retries"] += 1
+                await asyncio.sleep(delay)
+
+    async def _hedged(self, messages, model, kwargs):
+        first = asyncio.ensure_future(self._attempt(messages, model, kwargs))
+        tasks = {first}
+        try:
+            if self.hedge_after_s is None:
+                return await first
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after_s)
+            if not done and not self._sem.locked():
+                # Only hedge with spare capacity; a hedge must not queue behind real work
+                tasks.add(asyncio.ensure_future(self._attempt(messages, model, kwargs)))
+                self._stats["hedges"] += 1
+            error = None
+            while tasks:
+                done, tasks = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is not first:
+                            self._stats["hedge_wins"] += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _attempt(self, messages, model, kwargs):
+        async with self._sem:
+            response = await self._client.chat.completions.create(model=model, messages=messages, **kwargs)
+        return response.choices[0].message.content
+
+    @property
+    def stats(self) -> dict:
+        values = sorted(self._latency_ms)
+
+        def pct(q):
+            return values[min(len(values) - 1, int(round(q * (len(values) - 1))))] if values else 0.0
+
+        return {**self._stats, "p50_ms": pct(0.50), "p95_ms": pct(0.95), "p99_ms": pct(0.99)}
+
+    def close(self):
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self._client.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+        self._loop = None
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Process-wide LLMClient configured from MYNDRA_LLM_* env vars; None if no API key is set up."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            hedge_ms = os.getenv("MYNDRA_LLM_HEDGE_MS")
+            try:
+                _shared = LLMClient(
+                    max_concurrent=int(os.getenv("MYNDRA_LLM_MAX_CONCURRENT", "8")),
+                    deadline_s=float(os.getenv("MYNDRA_LLM_DEADLINE_S", "30")),
+                    max_retries=int(os.getenv("MYNDRA_LLM_RETRIES", "3")),
+                    hedge_after_s=float(hedge_ms) / 1000 if hedge_ms else None,
+                )
+            except openai.OpenAIError:
+                # AsyncOpenAI() raises without OPENAI_API_KEY
+                _shared = False
+        return _shared if _shared is not False else None
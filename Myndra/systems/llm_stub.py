@@ -0,0 +1,169 @@
+"""
+Local stand-in for the OpenAI chat completions API.
+
+Serves POST /v1/chat/completions on 127.0.0.1 so the real `openai` client
+(and anything built on it) can run offline in tests and benchmarks:
+
+    with StubLLMServer(respond=lambda messages, body: '{"subtasks": []}') as server:
+        client = OpenAI(base_url=server.base_url, api_key="stub")
+
+`respond(messages, body)` returns the assistant message content. `latency_s`
+delays every response; it may also be a callable (n, body) -> seconds, where
+n is the 0-based request number. `fault(n, body)` may return an HTTP status
+(e.g. 429, 500) to fail that request instead. Every request body is kept in
+`server.requests`; `peak_concurrency` is the most requests ever in flight.
+
+Requests with "stream": true get server-sent events, `chunk_chars`
+characters of content per chunk. `chunk_latency_s` models generation speed:
+it is slept before every streamed chunk, and a non-streamed response waits
+as long as the whole stream would have taken.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class _QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients hang up on purpose (hedged or timed-out requests); that is not an error here
+        pass
+
+
+class StubLLMServer:
+    def __init__(self, respond=None, latency_s=0.0, fault=None, chunk_chars: int = 16,
+                 chunk_latency_s: float = 0.0, host: str = "127.0.0.1", port: int = 0):
+        self.respond = respond or (lambda messages, body: "{}")
+        self.latency_s = latency_s
+        self.fault = fault
+        self.chunk_chars = max(1, chunk_chars)
+        self.chunk_latency_s = chunk_latency_s
+        self.requests = []
+        self.in_flight = 0
+        self.peak_concurrency = 0
+        self._lock = threading.Lock()
+        self._httpd = _QuietServer((host, port), self._handler())
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, kwargs={"poll_interval": 0.05},
+                                        name="llm-stub", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _completion(self, body: dict, content: str) -> dict:
+        return {
+            "id": f"chatcmpl-stub-{len(self.requests)}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+        }
+
+    def _chunk(self, body: dict, delta: dict, finish_reason=None) -> dict:
+        return {
+            "id": f"chatcmpl-stub-{len(self.requests)}",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+
+    def _pieces(self, content: str):
+        return [content[i:i + self.chunk_chars] for i in range(0, len(content), self.chunk_chars)] or [""]
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out in separate writes; without TCP_NODELAY,
+            # Nagle + delayed ACK adds ~40ms to every response
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status: int, payload: dict):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_events(self, events):
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for event in events:
+                    data = f"data: {event}\n\n".encode("utf-8")
+                    self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+
+            def _stream(self, body: dict, content: str):
+                for i, piece in enumerate(server._pieces(content)):
+                    if server.chunk_latency_s:
+                        time.sleep(server.chunk_latency_s)
+                    delta = {"role": "assistant", "content": piece} if i == 0 else {"content": piece}
+                    yield json.dumps(server._chunk(body, delta))
+                yield json.dumps(server._chunk(body, {}, "stop"))
+                yield "[DONE]"
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                    return
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                with server._lock:
+                    n = len(server.requests)
+                    server.requests.append(body)
+                    server.in_flight += 1
+                    server.peak_concurrency = max(server.peak_concurrency, server.in_flight)
+                try:
+                    latency = server.latency_s(n, body) if callable(server.latency_s) else server.latency_s
+                    if latency:
+                        time.sleep(latency)
+                    status = server.fault(n, body) if server.fault else None
+                    if status:
+                        self._send_json(status, {"error": {"message": f"stub fault {status}", "type": "stub"}})
+                        return
+                    content = server.respond(body.get("messages", []), body)
+                    if body.get("stream"):
+                        self._send_events(self._stream(body, content))
+                        return
+                    if server.chunk_latency_s:
+                        time.sleep(server.chunk_latency_s * len(server._pieces(content)))
+                    self._send_json(200, server._completion(body, content))
+                finally:
+                    with server._lock:
+                        server.in_flight -= 1
+
+        return Handler
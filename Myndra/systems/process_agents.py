@@ -0,0 +1,125 @@
+"""
+Process-pool execution for CPU-bound agent types.
+
+Threads give a CPU-heavy act() (an image model, pure-Python data
+crunching) no parallelism under the GIL. ProcessAgentRunner runs the agent
+types it is given in a persistent ProcessPoolExecutor instead:
+
+- agents are built inside the worker from a picklable spec: the factory
+  (a module-level callable, get_agent by default) plus the agent name.
+  Each worker keeps its agents for its whole life, so model weights and
+  other set-up are paid once per process, not once per task
+- a worker's agents write to a buffer instead of SharedMemory; the writes
+  a task makes travel back with its result as one batch and are applied to
+  the parent memory there. Reads inside a worker see no shared memory
+- task inputs and results cross the process boundary, so they must pickle;
+  agent.cancelled is never set in a worker (timeouts only stop waiting)
+
+AsyncRuntime(processes=runner) sends the runner's agent types to it and
+everything else to its thread pool.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from agents.agent_registry import get_agent, resolve_agent_name
+
+
+class WriteBuffer:
+    """Stand-in for SharedMemory inside a worker: collects writes for the parent."""
+
+    def __init__(self):
+        self.pending = []
+
+    def write(self, agent_id, content, context=None):
+        # LazyText and friends are formatted here; only plain strings cross back
+        self.pending.append((agent_id, str(content), context))
+
+    def get_recent(self, agent_id, n=5):
+        return []
+
+    def retrieve(self, agent_id, query):
+        return []
+
+    def drain(self):
+        writes, self.pending = self.pending, []
+        return writes
+
+
+# Per-worker state: one buffer and the agents built so far, keyed by (factory, name)
+_buffer = WriteBuffer()
+_agents = {}
+
+
+def _worker_ready():
+    return os.getpid()
+
+
+def _worker_act(factory, name, task, inputs):
+    agent = _agents.get((factory, name))
+    if agent is None:
+        agent = _agents[(factory, name)] = factory(name, _buffer)
+    agent.inputs = inputs or {}
+    try:
+        result = agent.act(task)
+    except BaseException:
+        # A failed task's writes are dropped along with its result
+        _buffer.drain()
+        raise
+    return agent.__class__.__name__, result, _buffer.drain()
+
+
+class ProcessAgentRunner:
+    def __init__(self, agent_names, memory=None, processes: int = None, factory=get_agent):
+        self.agent_names = {self._resolve(n) for n in agent_names}
+        self.memory = memory
+        self.processes = processes or os.cpu_count() or 1
+        self.factory = factory
+        self._pool = None
+        self._lock = threading.Lock()
+        self.stats = {"tasks": 0, "write_batches": 0, "writes": 0}
+
+    @staticmethod
+    def _resolve(name):
+        try:
+            return resolve_agent_name(name)
+        except ValueError:
+            return name
+
+    def handles(self, name) -> bool:
+        return self._resolve(name) in self.agent_names
+
+    def _executor(self):
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a parent that already runs agent and LLM threads is unsafe
+                self._pool = ProcessPoolExecutor(max_workers=self.processes,
+                                                 mp_context=multiprocessing.get_context("spawn"))
+            return self._pool
+
+    def start(self):
+        """Start every worker now rather than on first use; returns their pids."""
+        pool = self._executor()
+        return sorted({f.result() for f in [pool.submit(_worker_ready) for _ in range(self.processes)]})
+
+    def submit(self, name, task, inputs=None):
+        """concurrent.futures.Future of (agent class name, result, buffered writes)."""
+        self.stats["tasks"] += 1
+        return self._executor().submit(_worker_act, self.factory, self._resolve(name), task, inputs)
+
+    def apply(self, writes):
+        """Replay a task's buffered writes into the parent memory."""
+        if not writes or self.memory is None:
+            return
+        for agent_id, content, context in writes:
+            self.memory.write(agent_id, content, context)
+        self.stats["write_batches"] += 1
+        self.stats["writes"] += len(writes)
+
+    def close(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
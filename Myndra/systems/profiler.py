@@ -51,6 +51,19 @@ class Profiler:
 
 
 
+    @contextmanager
+    def span(self, name:str):
+        """Like track(), but safe when many runs overlap: each duration is
+        appended to metrics[name] and timers[name] keeps only the latest."""
+        start = time.time()
+        try:
+            yield
+        finally:
+            end = time.time()
+            duration_ms = (end - start) * 1000
+            self.timers[name] = {"start": start, "end": end, "duration_ms": duration_ms}
+            self.log_metric(name, duration_ms)
+
     def log_metric(self, key:str, value:float):
         "record scalar metric like gpu initalization or steps/sec."
         if key not in self.metrics:
@@ -96,6 +109,22 @@ class Profiler:
             }
         return summary
 
+    def get_distribution(self, key:str):
+        "count/mean/p50/p95/p99/max of one metric's samples (empty dict if none)"
+        values = sorted(self.metrics.get(key, []))
+        if not values:
+            return {}
+        def pct(q):
+            return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+        return {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": pct(0.50),
+            "p95": pct(0.95),
+            "p99": pct(0.99),
+            "max": values[-1],
+        }
+
     def save(self, path:str):
         "write all collected metrics to a json file for later analysis"
         os.makedirs(os.path.dirname(path), exist_ok=True)
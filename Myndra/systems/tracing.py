@@ -0,0 +1,236 @@
+"""
+Structured trace recorder for Myndra.
+
+Replaces ad-hoc print() logging with typed events kept in a bounded ring
+buffer:
+
+- "span" events time a block (monotonic perf_counter_ns start + duration)
+  and carry a span id, the enclosing span's id and a trace id shared by
+  everything under one root span (a goal run, a backend case). The current
+  span lives in a contextvar, so asyncio tasks and threads started with a
+  copied context nest under the span that launched them
+- "log" events replace print(): the message is a LazyText, formatted only
+  when it is echoed or exported
+- quiet mode (MYNDRA_QUIET=1) stops log events echoing to stdout; they are
+  still recorded. MYNDRA_TRACE=0 stops recording (echo is unaffected)
+- the buffer keeps the last MYNDRA_TRACE_CAPACITY events (default 10000)
+- export as JSONL (one event per line) or Chrome trace format, which loads
+  in chrome://tracing and Perfetto
+
+Usage:
+    from systems.tracing import get_tracer
+    tracer = get_tracer()
+
+    with tracer.span("plan", goal=goal) as span:
+        subtasks = planner.decompose(goal)
+        span["subtasks"] = len(subtasks)
+
+    tracer.log("[Planner] {} subtasks", len(subtasks))
+    tracer.save_chrome("results/traces/run.json")
+"""
+
+import contextvars
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from memory.memory_types import LazyText
+
+# (trace id, span id) of the innermost open span
+_current = contextvars.ContextVar("myndra_trace_span", default=None)
+
+
+def _env_flag(name, default):
+    return os.getenv(name, default).lower() in ("1", "true", "yes", "on")
+
+
+class TraceEvent:
+    """One recorded event; fields and message stay unformatted until to_dict()."""
+
+    __slots__ = ("kind", "name", "start_ns", "dur_ns", "trace_id", "span_id", "parent_id",
+                 "thread", "level", "message", "fields")
+
+    def __init__(self, kind, name, start_ns, dur_ns, trace_id, span_id, parent_id, thread,
+                 level=None, message=None, fields=None):
+        self.kind = kind
+        self.name = name
+        self.start_ns = start_ns
+        self.dur_ns = dur_ns
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.thread = thread
+        self.level = level
+        self.message = message
+        self.fields = fields
+
+    def to_dict(self, origin_ns=0):
+        """Plain dict with times in ms relative to origin_ns."""
+        event = {
+            "kind": self.kind,
+            "name": self.name,
+            "ts_ms": (self.start_ns - origin_ns) / 1e6,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "thread": self.thread,
+        }
+        if self.kind == "span":
+            event["duration_ms"] = self.dur_ns / 1e6
+        else:
+            event["level"] = self.level
+            event["message"] = str(self.message)
+        if self.fields:
+            event["fields"] = self.fields
+        return event
+
+
+class Tracer:
+    def __init__(self, capacity=None, quiet=None, enabled=None):
+        if capacity is None:
+            capacity = int(os.getenv("MYNDRA_TRACE_CAPACITY", "10000"))
+        self.quiet = _env_flag("MYNDRA_QUIET", "0") if quiet is None else quiet
+        self.enabled = _env_flag("MYNDRA_TRACE", "1") if enabled is None else enabled
+        # deque.append is atomic, so recording needs no lock; old events fall off the front
+        self._events = deque(maxlen=capacity)
+        self._ids = itertools.count(1)
+        self.origin_ns = time.perf_counter_ns()
+        self.origin_wall = time.time()
+
+    @property
+    def capacity(self):
+        return self._events.maxlen
+
+    @contextmanager
+    def span(self, name, trace_id=None, **fields):
+        """Time a block as a span; yields its fields dict so the block can add to it.
+
+        Nests under the current span and inherits its trace id unless
+        trace_id is given (a new root, e.g. one per backend case). If the
+        block raises, the span records status="error" and the error text.
+        """
+        if not self.enabled:
+            yield fields
+            return
+        parent = _current.get()
+        span_id = next(self._ids)
+        if trace_id is None:
+            trace_id = parent[0] if parent is not None else span_id
+        token = _current.set((trace_id, span_id))
+        start = time.perf_counter_ns()
+        try:
+            yield fields
+        except BaseException as e:
+            fields.setdefault("status", "error")
+            fields.setdefault("error", str(e) or type(e).__name__)
+            raise
+        finally:
+            end = time.perf_counter_ns()
+            _current.reset(token)
+            self._events.append(TraceEvent(
+                "span", name, start, end - start, trace_id, span_id,
+                parent[1] if parent is not None else None, threading.get_ident(), fields=fields or None,
+            ))
+
+    def log(self, fmt, *args, level="info", name="log", **fields):
+        """Record a message (str.format of fmt with args) under the current span.
+
+        Unless quiet, the message is also printed, replacing a print() call.
+        In quiet mode the text is never built unless the trace is exported.
+        """
+        message = LazyText(fmt, *args) if args else fmt
+        if not self.quiet:
+            print(message)
+        if not self.enabled:
+            return
+        parent = _current.get()
+        self._events.append(TraceEvent(
+            "log", name, time.perf_counter_ns(), 0,
+            parent[0] if parent is not None else None,
+            next(self._ids), parent[1] if parent is not None else None,
+            threading.get_ident(), level=level, message=message, fields=fields or None,
+        ))
+
+    @staticmethod
+    def current_trace_id():
+        current = _current.get()
+        return current[0] if current is not None else None
+
+    def events(self, trace_id=None):
+        """Recorded events as dicts, oldest first (only one trace's when trace_id is given)."""
+        return [e.to_dict(self.origin_ns) for e in self._select(trace_id)]
+
+    def _select(self, trace_id):
+        events = list(self._events)
+        if trace_id is None:
+            return events
+        return [e for e in events if e.trace_id == trace_id]
+
+    def clear(self):
+        self._events.clear()
+
+    def to_chrome(self, trace_id=None):
+        """Chrome trace format dict.
+
+        Spans are async begin/end pairs grouped by trace id, so overlapping
+        tasks on one event loop thread still draw as separate slices; log
+        events are thread-scoped instants.
+        """
+        pid = os.getpid()
+        trace_events = []
+        for e in self._select(trace_id):
+            ts = (e.start_ns - self.origin_ns) / 1000
+            if e.kind == "span":
+                common = {"name": e.name, "cat": "myndra", "id": str(e.trace_id), "pid": pid, "tid": e.thread}
+                args = {"span_id": e.span_id, "parent_id": e.parent_id, **(e.fields or {})}
+                trace_events.append({**common, "ph": "b", "ts": ts, "args": args})
+                trace_events.append({**common, "ph": "e", "ts": ts + e.dur_ns / 1000})
+            else:
+                trace_events.append({
+                    "name": e.name, "cat": e.level, "ph": "i", "s": "t", "ts": ts, "pid": pid, "tid": e.thread,
+                    "args": {"message": str(e.message), "trace_id": e.trace_id, **(e.fields or {})},
+                })
+        # Begin/end pairs must be in time order for the viewer
+        trace_events.sort(key=lambda ev: ev["ts"])
+        return {
+            "traceEvents": trace_events,
+            "displayTimeUnit": "ms",
+            "otherData": {"origin_unix_s": self.origin_wall},
+        }
+
+    def save_jsonl(self, path, trace_id=None):
+        """Write one JSON event per line; non-JSON field values are written with str()."""
+        _makedirs(path)
+        with open(path, "w", encoding="utf-8") as f:
+            for e in self._select(trace_id):
+                f.write(json.dumps(e.to_dict(self.origin_ns), default=str))
+                f.write("\n")
+
+    def save_chrome(self, path, trace_id=None):
+        _makedirs(path)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome(trace_id), f, default=str)
+
+
+def _makedirs(path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+
+_tracer = None
+_tracer_lock = threading.Lock()
+
+
+def get_tracer():
+    """Process-wide tracer, configured from the MYNDRA_TRACE* / MYNDRA_QUIET env vars on first use."""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                _tracer = Tracer()
+    return _tracer
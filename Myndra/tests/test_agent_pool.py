@@ -0,0 +1,58 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from agents.agent_registry import AgentPool
+from memory.memory_module import SharedMemory
+from systems.async_runtime import AsyncRuntime
+
+
+def test_aliases_share_instances_and_state_persists():
+    pool = AgentPool(SharedMemory(), size=2)
+    with pool.lease("analyst") as a:
+        a.act("first task")
+    with pool.lease("AnalystAgent") as b:
+        b.act("second task")
+    # The most recently returned instance is reused, history and all
+    assert a is b
+    assert [h["task"] for h in b.history] == ["first task", "second task"]
+    assert pool.utilization()["AnalystAgent"]["created"] == 1
+
+    with pytest.raises(ValueError):
+        pool.checkout("NoSuchAgent")
+    with pytest.raises(ValueError):
+        pool.checkin(object())
+
+
+def test_checkout_blocks_at_capacity():
+    pool = AgentPool(SharedMemory(), size=1)
+    held = pool.checkout("general")
+    with pytest.raises(TimeoutError):
+        pool.checkout("GeneralAgent", timeout=0.05)
+
+    got = []
+    t = threading.Thread(target=lambda: got.append(pool.checkout("general", timeout=2)))
+    t.start()
+    time.sleep(0.05)
+    pool.checkin(held)
+    t.join()
+    assert got == [held]
+    stats = pool.utilization()["GeneralAgent"]
+    assert stats["waits"] == 1 and stats["timeouts"] == 1 and stats["peak_in_use"] == 1 and stats["in_use"] == 1
+
+
+def test_runtime_leases_from_pool_within_capacity():
+    memory = SharedMemory()
+    pool = AgentPool(memory, size=2, sizes={"data": 1})
+    assignments = [{"task": f"gather data {i}", "agent": "data"} for i in range(6)]
+    assignments += [{"task": f"step {i}", "agent": "general"} for i in range(6)]
+    rt = AsyncRuntime(max_concurrent=8)
+    for _ in range(2):
+        results = asyncio.run(rt.run_batch(assignments, pool))
+        assert all(r["status"] == "success" for r in results)
+    stats = pool.utilization()
+    assert stats["DataAgent"]["created"] == 1 and stats["DataAgent"]["checkouts"] == 12
+    assert stats["GeneralAgent"]["created"] <= 2 and stats["GeneralAgent"]["in_use"] == 0
+    assert len(pool.instances("data")[0].history) == 12
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from systems.async_runtime import AsyncRuntime, TransientError
+
+
+class ScriptedAgent:
+    """act() behaviour per task name: 'hang' waits for cancellation, 'flaky' fails twice, 'bad' always fails."""
+
+    calls = {}
+    lock = threading.Lock()
+
+    def __init__(self, name):
+        self.name = name
+        self.inputs = {}
+
+    def act(self, task):
+        with self.lock:
+            n = self.calls[task] = self.calls.get(task, 0) + 1
+        if task.startswith("hang"):
+            # Cooperative: returns once the runtime gives up on it
+            self.cancelled.wait(5)
+            return "stopped" if self.cancelled.is_set() else "finished"
+        if task.startswith("slow"):
+            time.sleep(0.2)
+        if task == "flaky" and n <= 2:
+            raise TransientError("backend busy")
+        if task == "bad":
+            raise ValueError("bad input")
+        return f"ok:{task}"
+
+
+def _batch(*tasks, **kwargs):
+    return [{"task": t, "agent": "scripted", **kwargs} for t in tasks]
+
+
+def test_hung_agent_times_out_without_blocking_the_batch():
+    ScriptedAgent.calls = {}
+    rt = AsyncRuntime(max_concurrent=2, task_timeout_s=0.1)
+    start = time.perf_counter()
+    results = asyncio.run(rt.run_batch(_batch("hang-1", "hang-2", "a", "b", "c"), ScriptedAgent))
+    assert time.perf_counter() - start < 1.0
+    assert [r["status"] for r in results] == ["timeout", "timeout", "success", "success", "success"]
+    # Both hung threads were abandoned, so the later tasks still had two workers
+    assert rt.stats["timeouts"] == 2 and rt.stats["abandoned_threads"] == 2
+    assert rt.in_flight == 0
+
+
+def test_transient_errors_are_retried_with_backoff():
+    ScriptedAgent.calls = {}
+    rt = AsyncRuntime(max_concurrent=4, max_retries=3, backoff_base_s=0.01)
+    flaky, bad = asyncio.run(rt.run_batch(_batch("flaky", "bad"), ScriptedAgent))
+    assert flaky["status"] == "success" and flaky["attempts"] == 3
+    # Not transient: fails on the first attempt
+    assert bad["status"] == "error" and bad["attempts"] == 1
+    assert rt.stats["retries"] == 2
+
+    ScriptedAgent.calls = {}
+    rt = AsyncRuntime(max_concurrent=4, max_retries=1, backoff_base_s=0.01)
+    (flaky,) = asyncio.run(rt.run_batch(_batch("flaky"), ScriptedAgent))
+    assert flaky["status"] == "error" and flaky["attempts"] == 2
+
+
+def test_as_completed_yields_fast_results_first_and_cancels_on_close():
+    ScriptedAgent.calls = {}
+    rt = AsyncRuntime(max_concurrent=4)
+
+    async def first_two():
+        seen = []
+        stream = rt.as_completed(_batch("slow-1", "a", "hang-1", "b"), ScriptedAgent)
+        async for result in stream:
+            seen.append((result["index"], time.perf_counter()))
+            if len(seen) == 2:
+                break
+        await stream.aclose()
+        return seen
+
+    start = time.perf_counter()
+    seen = asyncio.run(first_two())
+    assert sorted(i for i, _ in seen) == [1, 3]
+    assert all(t - start < 0.15 for _, t in seen)
+    # The slow and the hung task were cancelled; the hung one saw its event and stopped
+    assert rt.stats["cancelled"] == 2
+    assert rt.in_flight == 0
+
+
+def test_per_assignment_deadline_in_dag():
+    ScriptedAgent.calls = {}
+    rt = AsyncRuntime(max_concurrent=2)
+    plan = [
+        {"task": "hang-1", "agent": "x", "timeout_s": 0.05},
+        {"task": "after", "agent": "x", "depends_on": ["hang-1"]},
+        {"task": "a", "agent": "x"},
+    ]
+    results = asyncio.run(rt.run_dag(plan, ScriptedAgent))
+    assert [r["status"] for r in results] == ["timeout", "skipped", "success"]
+
+
+def test_abandoned_threads_are_capped():
+    ScriptedAgent.calls = {}
+    rt = AsyncRuntime(max_concurrent=2, task_timeout_s=0.05, max_abandoned_threads=1)
+    results = asyncio.run(rt.run_batch(_batch("hang-1", "hang-2", "a"), ScriptedAgent))
+    assert [r["status"] for r in results] == ["timeout", "timeout", "success"]
+    # Only the first stuck thread got a replacement executor; the second kept its slot
+    assert rt.stats["timeouts"] == 2 and rt.stats["abandoned_threads"] == 1
+    deadline = time.monotonic() + 2
+    while rt.stuck_threads and time.monotonic() < deadline:
+        time.sleep(0.01)
+    # Hung agents saw their event and returned, so the runtime recovers
+    assert rt.stuck_threads == 0 and not rt.degraded
+
+
+def test_run_dag_cancels_siblings_when_a_node_raises():
+    ScriptedAgent.calls = {}
+    rt = AsyncRuntime(max_concurrent=2)
+    run_node = rt._run_node
+
+    async def failing_run_node(assignment, *args):
+        if assignment["task"] == "boom":
+            await asyncio.sleep(0.05)
+            raise RuntimeError("scheduler bug")
+        return await run_node(assignment, *args)
+
+    rt._run_node = failing_run_node
+    plan = [{"task": "hang-1", "agent": "x"}, {"task": "boom", "agent": "x"}]
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="scheduler bug"):
+        asyncio.run(rt.run_dag(plan, ScriptedAgent))
+    assert time.perf_counter() - start < 1.0
+    assert rt.stats["cancelled"] == 1 and rt.in_flight == 0
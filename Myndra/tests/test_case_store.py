@@ -0,0 +1,68 @@
+import csv
+import io
+import json
+from backend.services.case_store import CaseStore
+
+
+def _case(i, atype="pneumonia", diagnosis="Normal", day="2026-10-01", latency=120.0):
+    return {
+        "case_id": f"c{i}",
+        "analysis_type": atype,
+        "diagnosis": diagnosis,
+        "probability": 0.5,
+        "date": f"{day}T12:00:00",
+        "latency_ms": latency,
+    }
+
+
+def test_cursor_pagination_covers_all_cases_once():
+    store = CaseStore()
+    for i in range(25):
+        store.add(_case(i))
+    seen, cursor = [], None
+    while True:
+        page = store.page(limit=10, cursor=cursor)
+        seen += [c["case_id"] for c in page["items"]]
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+    assert seen == [f"c{i}" for i in range(25)]
+
+
+def test_filters_by_type_diagnosis_and_date():
+    store = CaseStore()
+    store.add(_case(0, "pneumonia", "Pneumonia", "2026-10-01"))
+    store.add(_case(1, "cardiomegaly", "Cardiomegaly", "2026-10-02"))
+    store.add(_case(2, "pneumonia", "Normal", "2026-10-03"))
+    store.add({"case_id": "d0", "analysis_type": "dual", "date": "2026-10-03T08:00:00", "latency_ms": 10.0,
+               "result": {"pneumonia": {"diagnosis": "Pneumonia"}, "cardiomegaly": {"diagnosis": "Normal"}}})
+    ids = lambda page: [c["case_id"] for c in page["items"]]
+    assert ids(store.page(analysis_type="pneumonia")) == ["c0", "c2"]
+    assert ids(store.page(diagnosis="Pneumonia")) == ["c0", "d0"]
+    assert ids(store.page(date_from="2026-10-02", date_to="2026-10-02")) == ["c1"]
+    page = store.page(limit=1, analysis_type="pneumonia")
+    assert ids(store.page(limit=1, cursor=page["next_cursor"], analysis_type="pneumonia")) == ["c2"]
+
+
+def test_exports_stream_every_case():
+    store = CaseStore()
+    for i in range(5):
+        store.add(_case(i))
+    lines = "".join(store.export_ndjson()).splitlines()
+    assert [json.loads(l)["case_id"] for l in lines] == [f"c{i}" for i in range(5)]
+    rows = list(csv.DictReader(io.StringIO("".join(store.export_csv(analysis_type="pneumonia")))))
+    assert len(rows) == 5 and rows[0]["diagnosis"] == "Normal"
+
+
+def test_stats_are_incremental_per_type_and_day():
+    store = CaseStore()
+    store.add(_case(0, diagnosis="Pneumonia", latency=40.0))
+    store.add(_case(1, diagnosis="Normal", latency=400.0))
+    store.add(_case(2, day="2026-10-02", latency=90.0))
+    stats = store.stats()
+    day = stats["by_type"]["pneumonia"]["2026-10-01"]
+    assert stats["total_cases"] == 3
+    assert day["count"] == 2 and day["positive_rate"] == 0.5
+    assert day["latency_ms"]["avg"] == 220.0
+    assert day["latency_ms"]["p50"] == 50
+    assert "2026-10-02" not in store.stats(date_to="2026-10-01")["by_type"]["pneumonia"]
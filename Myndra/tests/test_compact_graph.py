@@ -0,0 +1,90 @@
+import random
+from datetime import datetime, timezone
+from memory.compact_graph import CompactKnowledgeGraph
+from memory.memory_module import KnowledgeGraph, SharedMemory
+from memory.memory_types import Defaults, EdgeType
+
+
+def _populate(kgs, n=3000, seed=0):
+    rng = random.Random(seed)
+    for i in range(n):
+        content = f"event {rng.randrange(400)}"
+        context = f"ctx {rng.randrange(50)}" if rng.random() < 0.7 else None
+        ts = datetime(2026, 10, 1 + i % 28, 12, 0, 0, i, tzinfo=timezone.utc).isoformat()
+        tags = {f"t{rng.randrange(80)}"} if rng.random() < 0.3 else None
+        agent = f"agent:{rng.randrange(70)}"
+        for kg in kgs:
+            kg.add_node(agent, content, context=context, timestamp=ts, tags=tags)
+            if i % 5 == 0:
+                kg.add_edge(content, f"event {i % 400}", edge_type=EdgeType.NEXT)
+
+
+def test_compact_matches_networkx():
+    ref, compact = KnowledgeGraph(), CompactKnowledgeGraph()
+    _populate([ref, compact])
+    assert compact.nodes() == list(ref.graph.nodes)
+    assert sorted((s, d, t) for s, d, t in compact.edges()) == sorted(
+        (s, d, a["type"]) for s, d, a in ref.graph.edges(data=True))
+    for node in list(ref.graph.nodes)[::17]:
+        assert compact.get_node(node) == ref.get_node(node)
+        assert compact.get_related(node, depth=2) == ref.get_related(node, depth=2)
+    assert compact.search("event 1", top_k=5) == ref.search("event 1", top_k=5)
+    assert compact.get_node("missing") == {} and compact.get_related("missing") == []
+
+
+def test_shared_memory_compact_backend():
+    class Policy(Defaults):
+        KG_BACKEND = "compact"
+
+    sm = SharedMemory(policy=Policy)
+    assert isinstance(sm.long_term, CompactKnowledgeGraph)
+    sm.write("alice", "Started task12", "Kickoff")
+    texts = " ".join(r["content"] for r in sm.retrieve("alice", "task12"))
+    assert "started task12" in texts
+    assert sm.long_term.get_related("started task12") == [
+        {"src": "started task12", "dst": "kickoff"},
+        {"src": "started task12", "dst": "task:12"},
+    ]
+
+
+def test_from_columns_derives_provenance_from_old_snapshots():
+    kg = CompactKnowledgeGraph()
+    _populate([kg], n=300)
+    cols = kg.export_columns()
+    expected = {node: kg.get_node(node) for node in kg.nodes()}
+    del cols["count"], cols["ts_first"]
+    old = CompactKnowledgeGraph.from_columns(cols)
+    for node, attrs in expected.items():
+        got = old.get_node(node)
+        # Counts come from timestamp chains, which every _populate write carries
+        assert got == attrs
+
+
+def test_timestamp_chains_stay_bounded_by_the_sample():
+    ref = KnowledgeGraph(provenance_sample=4)
+    compact = CompactKnowledgeGraph(provenance_sample=4)
+    for i in range(5000):
+        ts = datetime.fromtimestamp(1_790_000_000 + i, timezone.utc).isoformat()
+        for kg in (ref, compact):
+            kg.add_node("agent:hot", "status ok" if i % 10 else f"event {i}", timestamp=ts)
+    # 500 one-stamp nodes plus the hot node's 4 live stamps, with at most as many dead ones
+    assert len(compact._ts_val) <= 2 * (500 + 4) + 1
+    for node in ["status ok", "event 0", "event 4990"]:
+        assert compact.get_node(node) == ref.get_node(node)
+    cols = compact.export_columns()
+    assert len(cols["ts_val"]) == 504
+    assert CompactKnowledgeGraph.from_columns(cols).get_node("status ok") == ref.get_node("status ok")
+
+
+def test_naive_timestamps_are_utc(monkeypatch):
+    import time
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        kg = CompactKnowledgeGraph()
+        kg.add_node("agent:a", "naive", timestamp="2026-10-19T05:30:00")
+        kg.add_node("agent:a", "aware", timestamp="2026-10-19T05:30:00+00:00")
+        assert kg.get_node("naive")["first_seen"] == kg.get_node("aware")["first_seen"] == "2026-10-19T05:30:00+00:00"
+    finally:
+        monkeypatch.undo()
+        time.tzset()
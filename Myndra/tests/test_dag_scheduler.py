@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from systems.async_runtime import AsyncRuntime
+from systems.dag_scheduler import CycleError, TaskGraph
+
+
+class SleepAgent:
+    """Records start/end order and sleeps to simulate work."""
+
+    def __init__(self, log, lock, delay=0.02):
+        self.log, self.lock, self.delay = log, lock, delay
+        self.inputs = {}
+
+    def act(self, task):
+        with self.lock:
+            self.log.append(("start", task, dict(self.inputs)))
+        time.sleep(self.delay)
+        if task == "boom":
+            raise RuntimeError("boom")
+        with self.lock:
+            self.log.append(("end", task, None))
+        return f"out:{task}"
+
+
+def _run(assignments, max_concurrent=8, delay=0.02):
+    log, lock = [], threading.Lock()
+    rt = AsyncRuntime(max_concurrent=max_concurrent)
+    results = asyncio.run(rt.run_dag(assignments, lambda name: SleepAgent(log, lock, delay)))
+    return rt, results, log
+
+
+def test_dependents_start_after_upstream_and_receive_outputs():
+    plan = [
+        {"task": "a", "agent": "x", "depends_on": []},
+        {"task": "b", "agent": "x", "depends_on": ["a"]},
+        {"task": "c", "agent": "x", "depends_on": ["a"]},
+        {"task": "d", "agent": "x", "depends_on": ["b", "C"]},
+    ]
+    rt, results, log = _run(plan)
+    events = [(kind, task) for kind, task, _ in log]
+    for parent, child in [("a", "b"), ("a", "c"), ("b", "d"), ("c", "d")]:
+        assert events.index(("end", parent)) < events.index(("start", child))
+    starts = {task: inputs for kind, task, inputs in log if kind == "start"}
+    assert starts["d"] == {"b": "out:b", "c": "out:c"}
+    assert [r["task"] for r in results] == ["a", "b", "c", "d"]
+    assert results[3]["inputs"] == {"b": "out:b", "c": "out:c"}
+    sched = rt.last_schedule
+    assert sched["max_parallelism"] == 2
+    assert sched["critical_path"][0] == "a" and sched["critical_path"][-1] == "d"
+
+
+def test_cycle_is_reported_before_running():
+    plan = [
+        {"task": "a", "agent": "x", "depends_on": ["c"]},
+        {"task": "b", "agent": "x", "depends_on": ["a"]},
+        {"task": "c", "agent": "x", "depends_on": ["b"]},
+        {"task": "d", "agent": "x", "depends_on": []},
+    ]
+    with pytest.raises(CycleError) as err:
+        _run(plan)
+    cycle = err.value.cycle
+    assert cycle[0] == cycle[-1] and set(cycle) == {"a", "b", "c"}
+
+
+def test_failed_upstream_skips_dependents_and_unknown_deps_are_reported():
+    plan = [
+        {"task": "boom", "agent": "x"},
+        {"task": "after", "agent": "x", "depends_on": ["boom"]},
+        {"task": "free", "agent": "x", "depends_on": ["no such task"]},
+    ]
+    rt, results, log = _run(plan)
+    assert [r["status"] for r in results] == ["error", "skipped", "success"]
+    assert "upstream failed: boom" in results[1]["result"]["error"]
+    assert rt.last_schedule["unresolved_deps"] == [("free", "no such task")]
+
+
+def test_wide_plan_overlaps_and_critical_path_matches_chain():
+    wide = [{"task": f"t{i}", "agent": "x"} for i in range(8)]
+    rt, _, _ = _run(wide, max_concurrent=8, delay=0.05)
+    # Serial would take 400ms
+    assert rt.last_schedule["makespan_ms"] < 250
+    assert rt.last_schedule["max_parallelism"] == 8
+
+    graph = TaskGraph([
+        {"task": "a"}, {"task": "b", "depends_on": [0]}, {"task": "c", "depends_on": [0]},
+        {"task": "d", "depends_on": [1, 2]},
+    ])
+    path, total = graph.critical_path([1.0, 5.0, 2.0, 1.0])
+    assert path == [0, 1, 3] and total == 7.0
@@ -21,3 +21,79 @@ def test_retrieve_case_insensitive():
     ep.store("agent:alice", "Hammer broke")
     hits = ep.retrieve("agent:alice", "hammer")
     assert any("Hammer broke" in h["content"] for h in hits)
+
+def test_index_tracks_maxlen_eviction():
+    ep = EpisodicMemory(max_length=2)
+    ep.store("agent:alice", "hammer one")
+    ep.store("agent:alice", "drill two")
+    ep.store("agent:alice", "saw three")
+    assert ep.retrieve("agent:alice", "hammer") == []
+    assert [e["content"] for e in ep.retrieve("agent:alice", "o")] == ["drill two"]
+    assert "hammer" not in ep.memory["agent:alice"].postings
+    assert "ham" not in ep.memory["agent:alice"].vocab_grams
+
+def test_index_matches_linear_scan():
+    import random
+    rng = random.Random(0)
+    words = ["Hammer", "drill", "task12", "saw-blade", "x", "Ünïcode", "  spaced  out "]
+    ep = EpisodicMemory(max_length=20, verify_index=True)
+    for _ in range(200):
+        ep.store("agent:alice", " ".join(rng.choice(words) for _ in range(rng.randint(1, 4))))
+        q = rng.choice(["ham", "MER DR", "ask1", "w-b", "", " ", "d o", "ünï", "e s", "zzz"])
+        # verify_index raises on any divergence from `q in content.lower()`
+        ep.retrieve("agent:alice", q)
+
+def test_index_keeps_substring_semantics():
+    ep = EpisodicMemory(max_length=10, verify_index=True)
+    for text in ["Analysis complete for task7", "re-analysis pending", "Lab analyst note", "complete"]:
+        ep.store("agent:alice", text)
+
+    def hits(q):
+        return [e["content"] for e in ep.retrieve("agent:alice", q)]
+
+    # Query edges may cut content tokens; interior tokens must be whole
+    assert hits("nalys") == ["Analysis complete for task7", "re-analysis pending", "Lab analyst note"]
+    assert hits("nalysis compl") == ["Analysis complete for task7"]
+    assert hits("is complete for tas") == ["Analysis complete for task7"]
+    assert hits("s complete f") == ["Analysis complete for task7"]
+    assert hits("s compl f") == []
+    assert hits("-analysis") == ["re-analysis pending"]
+    assert hits("ab an") == ["Lab analyst note"]
+    assert hits("k7") == ["Analysis complete for task7"]
+    assert hits("lete") == ["Analysis complete for task7", "complete"]
+    assert hits("lete ") == ["Analysis complete for task7"]
+
+def test_ring_interns_repeated_content_and_releases_evicted():
+    ep = EpisodicMemory(max_length=3)
+    for text in ["status ok", "status ok", "status ok", "drill", "saw"]:
+        ep.store("agent:alice", text)
+    ring = ep.memory["agent:alice"]
+    assert [e["content"] for e in ep.get_recent("agent:alice", 5)] == ["status ok", "drill", "saw"]
+    assert ring.refs[ring.content_ids["status ok"]] == 1
+    ep.store("agent:alice", "hammer")
+    assert "status ok" not in ring.content_ids and len(ring.texts) == 3  # freed slot reused
+
+def test_timestamps_round_trip_and_naive_means_utc():
+    ep = EpisodicMemory()
+    ep.store("agent:alice", "a", timestamp="2026-10-19T08:30:00+02:00")
+    ep.store("agent:alice", "b", timestamp="2026-10-19T06:30:00")
+    stamps = [e["timestamp"] for e in ep.get_recent("agent:alice")]
+    assert stamps == ["2026-10-19T06:30:00+00:00"] * 2
+
+def test_search_episodes_matches_scalar_scoring():
+    import datetime
+    from memory.memory_module import SharedMemory
+    from memory.memory_types import decay_linear
+    sm = SharedMemory()
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for age in (0, 45, 3, 12, 3, 29.5):
+        ts = (now - datetime.timedelta(days=age)).isoformat()
+        sm.short_term.store("bob", f"scan result aged {age}", timestamp=ts)
+    got = sm.search_episodes("bob", "SCAN")
+    expected = []
+    for e in sm.short_term.retrieve("bob", "scan"):
+        age_days = (now - datetime.datetime.fromisoformat(e["timestamp"])).days
+        expected.append((e["content"], 0.7 + 0.3 * decay_linear(age_days, 30)))
+    expected.sort(key=lambda x: x[1], reverse=True)
+    assert [c for c, _ in got] == [c for c, _ in expected]
+    assert all(abs(a - b) < 1e-9 for (_, a), (_, b) in zip(got, expected))
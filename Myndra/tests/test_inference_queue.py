@@ -0,0 +1,130 @@
+import threading
+from concurrent.futures import wait
+import pytest
+from backend.services.inference_queue import InferenceQueue, Priority, parse_priority
+
+
+def _blocked_queue(**kwargs):
+    """Queue whose single worker is parked on a gate job so the backlog can be staged."""
+    q = InferenceQueue(workers=1, **kwargs)
+    gate = threading.Event()
+    started = threading.Event()
+
+    def hold(_):
+        started.set()
+        gate.wait(5)
+
+    q.submit(hold, None, Priority.ROUTINE)
+    started.wait(5)
+    return q, gate
+
+
+def test_stat_jumps_queued_routine():
+    q, gate = _blocked_queue(routine_min_share=0.0)
+    order = []
+    futures = [q.submit(order.append, f"r{i}", Priority.ROUTINE) for i in range(3)]
+    futures.append(q.submit(order.append, "s0", Priority.STAT))
+    gate.set()
+    for f in futures:
+        f.result(5)
+    q.stop()
+    assert order == ["s0", "r0", "r1", "r2"]
+
+
+def test_routine_min_share_prevents_starvation():
+    q, gate = _blocked_queue(routine_min_share=0.25)
+    order = []
+    futures = [q.submit(order.append, "r", Priority.ROUTINE) for _ in range(2)]
+    futures += [q.submit(order.append, "s", Priority.STAT) for _ in range(6)]
+    gate.set()
+    for f in futures:
+        f.result(5)
+    q.stop()
+    # share 0.25 -> one routine dispatch after every three STAT dispatches while contended
+    assert order == ["s", "s", "s", "r", "s", "s", "s", "r"]
+
+
+def test_batches_follow_priority_order():
+    q, gate = _blocked_queue(routine_min_share=0.0, max_batch=4)
+    batches = []
+
+    def handler(args):
+        batches.append(list(args))
+        return [a.upper() for a in args]
+
+    q.register_batch_handler("cxr", handler)
+    futures = [q.submit(str.upper, f"r{i}", Priority.ROUTINE, batch_key="cxr") for i in range(3)]
+    futures += [q.submit(str.upper, f"s{i}", Priority.STAT, batch_key="cxr") for i in range(2)]
+    gate.set()
+    results = [f.result(5) for f in futures]
+    q.stop()
+    assert results == ["R0", "R1", "R2", "S0", "S1"]
+    assert batches[0] == ["s0", "s1", "r0", "r1"]
+
+
+def test_per_class_stats_and_errors():
+    q = InferenceQueue(workers=2)
+
+    def boom(_):
+        raise RuntimeError("model failed")
+
+    q.submit(lambda x: x, 1, Priority.STAT).result(5)
+    with pytest.raises(RuntimeError):
+        q.submit(boom, None, Priority.ROUTINE).result(5)
+    stats = q.stats()
+    q.stop()
+    assert stats["classes"]["stat"]["completed"] == 1
+    assert stats["classes"]["routine"]["failed"] == 1
+    assert stats["classes"]["stat"]["total_ms"]["p95"] >= 0.0
+
+
+def test_parse_priority():
+    assert parse_priority(None) is Priority.ROUTINE
+    assert parse_priority("STAT") is Priority.STAT
+    with pytest.raises(ValueError):
+        parse_priority("urgent")
+
+
+def test_cancelled_job_is_dropped_and_worker_survives():
+    q, gate = _blocked_queue()
+    ran = []
+    abandoned = q.submit(ran.append, "abandoned")
+    assert abandoned.cancel()
+    later = q.submit(ran.append, "later")
+    gate.set()
+    later.result(5)
+    assert ran == ["later"]
+
+    # Jobs still queued at stop() are cancelled rather than left pending
+    q2, gate2 = _blocked_queue()
+    pending = q2.submit(ran.append, "never")
+    stopper = threading.Thread(target=q2.stop)
+    stopper.start()
+    # Release the worker only once stop() has drained the queue
+    wait([pending], timeout=5)
+    gate2.set()
+    stopper.join(5)
+    q.stop()
+    assert pending.cancelled() and "never" not in ran
+
+
+def test_context_aware_batch_handler_gets_each_jobs_context():
+    import contextvars
+    case = contextvars.ContextVar("case", default=None)
+    q, gate = _blocked_queue(max_batch=4)
+    seen = []
+
+    def handler(jobs):
+        seen.extend(context.run(case.get) for _, context in jobs)
+        return [arg for arg, _ in jobs]
+
+    q.register_batch_handler("cxr", handler, pass_context=True)
+    futures = []
+    for name in ("case-1", "case-2", "case-3"):
+        token = case.set(name)
+        futures.append(q.submit(str, name, batch_key="cxr"))
+        case.reset(token)
+    gate.set()
+    assert [f.result(5) for f in futures] == ["case-1", "case-2", "case-3"]
+    q.stop()
+    assert seen == ["case-1", "case-2", "case-3"]
@@ -1,3 +1,4 @@
+from datetime import datetime
 from memory.memory_module import KnowledgeGraph
 
 def test_add_node_and_provenance():
@@ -16,3 +17,63 @@ def test_bfs_depth_limit():
     nodes = {r["dst"] for r in related}
     assert "child" in nodes
     assert "leaf" not in nodes
+
+def test_search_index_matches_scan():
+    indexed, scanned = KnowledgeGraph(), KnowledgeGraph(use_index=False)
+    for i in range(300):
+        for kg in (indexed, scanned):
+            kg.add_node("a", f"Agent {i % 7} finished task{i} ok", context=f"ctx {i % 11}")
+    for q in ("task1", "CTX 3", "finished", "ok", "k", "", "nothing here", "agent 6 fin"):
+        assert indexed.search(q) == scanned.search(q)
+    assert indexed.search("task1", top_k=3) == ["agent 1 finished task1 ok",
+                                                "agent 3 finished task10 ok",
+                                                "agent 4 finished task11 ok"]
+
+def test_provenance_is_bounded():
+    kg = KnowledgeGraph(provenance_sample=3)
+    for i in range(10):
+        kg.add_node("agent:o", "Task 'x' completed successfully", timestamp=f"2026-10-{i + 1:02d}T00:00:00+00:00")
+    node = kg.get_node("task 'x' completed successfully")
+    assert node["count"] == 10
+    assert node["first_seen"] == "2026-10-01T00:00:00+00:00"
+    assert node["last_seen"] == "2026-10-10T00:00:00+00:00"
+    assert node["timestamps"] == [f"2026-10-{d:02d}T00:00:00+00:00" for d in (8, 9, 10)]
+
+def test_prune_ttl_removes_stale_nodes_edges_and_index_entries():
+    kg = KnowledgeGraph(ttl_seconds=3600)
+    kg.add_node("a", "old result", context="old ctx", timestamp="2026-10-19T00:00:00+00:00")
+    kg.add_node("a", "new result", context="old ctx", timestamp="2026-10-19T05:00:00+00:00")
+    now = datetime.fromisoformat("2026-10-19T05:30:00+00:00").timestamp()
+    step = kg.prune(now=now)
+    assert step["pruned_nodes"] == 1 and step["pruned_edges"] == 1
+    assert "old result" not in kg.graph and "old ctx" in kg.graph
+    assert kg.search("result") == ["new result"]
+    kg.add_node("a", "old result", timestamp="2026-10-19T05:29:00+00:00")
+    assert kg.search("old result") == ["old result"]
+
+def test_prune_lru_is_incremental():
+    kg = KnowledgeGraph(max_nodes=10)
+    for i in range(50):
+        kg.add_node("a", f"note {i}")
+    assert kg.prune(budget_ms=0)["pruned_nodes"] == 1  # at least one node per step
+    while kg.prune(budget_ms=0.05)["pruned_nodes"]:
+        pass
+    assert list(kg.graph) == [f"note {i}" for i in range(40, 50)]
+    assert kg.prune_stats["pruned_nodes"] == 40
+
+def test_trigram_vacuum_is_resumable_and_preserves_results():
+    from memory.text_index import TrigramIndex
+    index = TrigramIndex(track_ids=True)
+    for i in range(40):
+        index.add(f"result {i} for ward {i % 3}")
+    for i in range(0, 40, 2):
+        index.remove(f"result {i} for ward {i % 3}")
+    before = index.search("result")
+    steps = 1
+    while not index.vacuum_step(max_ids=7):
+        index.add(f"late {steps}")  # appends between steps stay indexed
+        steps += 1
+    assert steps > 1 and index.dead == 0
+    assert all(index.nodes[i] is not None for posting in index.grams.values() for i in posting)
+    assert index.search("result") == before
+    assert index.search("late") == [f"late {i}" for i in range(1, steps)]
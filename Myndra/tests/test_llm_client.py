@@ -0,0 +1,75 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from orchestrator.planner import LLMPlanner, Planner
+from systems.llm_client import LLMClient, LLMDeadlineExceeded
+from systems.llm_stub import StubLLMServer
+
+
+def _client(server, **kwargs):
+    kwargs.setdefault("backoff_base_s", 0.01)
+    return LLMClient(base_url=server.base_url, api_key="stub", **kwargs)
+
+
+def test_retries_5xx_and_429_with_backoff():
+    faults = {0: 500, 1: 429}
+    with StubLLMServer(respond=lambda m, b: "ok", fault=lambda n, b: faults.get(n)) as server:
+        llm = _client(server, max_retries=3)
+        assert llm.complete([{"role": "user", "content": "hi"}], model="m") == "ok"
+        assert llm.stats["retries"] == 2 and llm.stats["ok"] == 1
+        llm.close()
+
+    with StubLLMServer(fault=lambda n, b: 500) as server:
+        llm = _client(server, max_retries=1)
+        with pytest.raises(Exception):
+            llm.complete([{"role": "user", "content": "hi"}], model="m")
+        assert len(server.requests) == 2 and llm.stats["errors"] == 1
+        llm.close()
+
+
+def test_deadline_covers_retries_and_planner_falls_back_to_rule_plan():
+    with StubLLMServer(latency_s=1.0) as server:
+        llm = _client(server)
+        start = time.perf_counter()
+        with pytest.raises(LLMDeadlineExceeded):
+            llm.complete([{"role": "user", "content": "hi"}], model="m", deadline_s=0.1)
+        assert time.perf_counter() - start < 0.5
+
+        planner = LLMPlanner(model="m", llm=llm, cache=False, deadline_s=0.1)
+        plan = planner.decompose("Analyze ward throughput")
+        steps = Planner().decompose("Analyze ward throughput")
+        assert [t["task"] for t in plan] == steps
+        assert plan[1]["depends_on"] == [steps[0]]
+        assert llm.stats["deadline_exceeded"] == 2
+        llm.close()
+
+
+def test_hedge_wins_over_slow_first_request():
+    slow_first = lambda n, b: 1.0 if n == 0 else 0.01
+    with StubLLMServer(respond=lambda m, b: "fast", latency_s=slow_first) as server:
+        llm = _client(server, hedge_after_s=0.05)
+        start = time.perf_counter()
+        assert llm.complete([{"role": "user", "content": "hi"}], model="m") == "fast"
+        assert time.perf_counter() - start < 0.5
+        assert llm.stats["hedges"] == 1 and llm.stats["hedge_wins"] == 1
+        llm.close()
+
+
+def test_concurrency_cap_is_shared_across_loops_and_threads():
+    with StubLLMServer(respond=lambda m, b: json.dumps(b["messages"][0]["content"]), latency_s=0.05) as server:
+        llm = _client(server, max_concurrent=2)
+
+        async def burst():
+            msgs = [[{"role": "user", "content": f"q{i}"}] for i in range(6)]
+            return await asyncio.gather(*(llm.acomplete(m, model="m") for m in msgs))
+
+        # Two separate event loops (plus a sync call) all go through one client
+        outs = asyncio.run(burst()) + asyncio.run(burst())
+        outs.append(llm.complete([{"role": "user", "content": "sync"}], model="m"))
+        assert outs[:6] == [f'"q{i}"' for i in range(6)] and outs[-1] == '"sync"'
+        assert server.peak_concurrency == 2
+        assert llm.stats["ok"] == 13
+        llm.close()
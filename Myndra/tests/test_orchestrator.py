@@ -0,0 +1,85 @@
+import asyncio
+import time
+
+import pytest
+
+from agents.agent_registry import AgentPool
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+
+
+class SlowAgent(BaseAgent):
+    def act(self, task):
+        time.sleep(0.01)
+        return f"{self.name} did {task}"
+
+
+def _orchestrator(max_concurrent=3):
+    memory = SharedMemory()
+    orch = Orchestrator(None, memory, max_concurrent=max_concurrent)
+    orch.agents = AgentPool(memory, size=8, factory=lambda name, mem: SlowAgent(name, "test", mem))
+    return orch
+
+
+def test_many_goals_share_one_loop_and_global_limit():
+    orch = _orchestrator(max_concurrent=3)
+
+    async def main():
+        return await asyncio.gather(*(orch.arun(f"analyze ward {i}") for i in range(6)))
+
+    reports = asyncio.run(main())
+    assert [r["goal"] for r in reports] == [f"analyze ward {i}" for i in range(6)]
+    assert all(res["status"] == "success" for r in reports for res in r["results"])
+    assert orch.runtime.peak_in_flight == 3
+    # One latency sample per goal and phase
+    assert len(orch.profiler.metrics["execute_latency"]) == 6
+
+
+def test_sync_wrappers_refuse_running_loop():
+    orch = _orchestrator()
+    assignments = orch.assign(orch.plan("analyze throughput"))
+    assert len(orch.execute(assignments)) == len(assignments)
+
+    async def main():
+        with pytest.raises(RuntimeError, match="a\\* variant"):
+            orch.execute(assignments)
+        return await orch.aexecute(assignments)
+
+    assert len(asyncio.run(main())) == len(assignments)
+
+
+def test_batch_dedupes_plans_and_streams_every_goal():
+    orch = _orchestrator(max_concurrent=4)
+    calls = []
+    decompose = orch.planner.decompose
+    orch.planner.decompose = lambda goal: calls.append(goal) or decompose(goal)
+
+    streamed = []
+    goals = ["Analyze ward 1", "analyze  WARD 1", "Analyze ward 2", "Analyze ward 3"]
+    batch = orch.run_batch(goals, on_result=lambda r: streamed.append(r["index"]))
+
+    # Case/space variants share one planner call; the rule planner gives one plan
+    assert len(calls) == 3
+    assert batch["stats"]["distinct_goals"] == 3 and batch["stats"]["distinct_plans"] == 1
+    assert sorted(streamed) == [0, 1, 2, 3]
+    assert [r["goal"] for r in batch["reports"]] == goals
+    stats = batch["stats"]
+    assert stats["failed"] == 0 and stats["goals_per_s"] > 0
+    assert stats["phases_ms"]["execute"]["count"] == 4
+    assert stats["runtime_peak_in_flight"] <= 4
+
+
+def test_batch_isolates_failing_goal():
+    orch = _orchestrator()
+    decompose = orch.planner.decompose
+
+    def flaky(goal):
+        if "bad" in goal:
+            raise RuntimeError("planner down")
+        return decompose(goal)
+
+    orch.planner.decompose = flaky
+    batch = orch.run_batch(["good goal", "bad goal"])
+    assert batch["reports"][1]["error"] == "planner down"
+    assert batch["stats"]["failed"] == 1 and "results" in batch["reports"][0]
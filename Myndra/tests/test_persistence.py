@@ -0,0 +1,105 @@
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults, EdgeType
+from memory.persistence import PersistentKnowledgeGraph, read_snapshot
+
+
+def _fill(kg, start, stop):
+    for i in range(start, stop):
+        kg.add_node(f"agent:{i % 3}", f"Result {i}", context=f"ctx {i % 4}",
+                    timestamp=f"2026-10-19T10:00:{i % 60:02d}+00:00", tags={f"t{i % 2}"})
+        kg.add_edge(f"Result {i}", "summary", edge_type=EdgeType.SUMMARIZED)
+
+
+def _state(kg):
+    return [(n, kg.get_node(n), kg.get_related(n)) for n in kg.nodes()]
+
+
+def test_reload_from_log_and_snapshot(tmp_path):
+    kg = PersistentKnowledgeGraph(str(tmp_path), snapshot_every=50)
+    _fill(kg, 0, 60)  # 120 records: two automatic snapshots, 20-record log tail
+    expected = _state(kg)
+    kg.close()
+    assert sorted(os.listdir(tmp_path)) == ["kg.2.log", "snapshot.bin"]
+
+    reloaded = PersistentKnowledgeGraph(str(tmp_path), snapshot_every=50)
+    assert reloaded.generation == 2 and reloaded.replayed == 20
+    assert _state(reloaded) == expected
+    assert reloaded.search("result 5", top_k=2) == ["result 5", "result 50"]
+    reloaded.close()
+
+
+def test_torn_log_tail_is_truncated(tmp_path):
+    kg = PersistentKnowledgeGraph(str(tmp_path), snapshot_every=0)
+    _fill(kg, 0, 5)
+    kg.close()
+    log = tmp_path / "kg.0.log"
+    intact = log.stat().st_size
+    with open(log, "ab") as f:
+        f.write(b"\x40\x00\x00\x00garbage")  # simulated crash mid-record
+
+    reloaded = PersistentKnowledgeGraph(str(tmp_path), snapshot_every=0)
+    assert reloaded.replayed == 10
+    assert log.stat().st_size == intact
+    assert "result 4" in reloaded
+    reloaded.close()
+
+
+def test_shared_memory_survives_restart(tmp_path):
+    class Policy(Defaults):
+        KG_PERSIST_DIR = str(tmp_path)
+
+    sm = SharedMemory(policy=Policy)
+    sm.write("alice", "Started task12", "Kickoff")
+    sm.close()
+    sm = SharedMemory(policy=Policy)
+    assert sm.long_term.get_related("started task12") == [
+        {"src": "started task12", "dst": "kickoff"},
+        {"src": "started task12", "dst": "task:12"},
+    ]
+    sm.close()
+
+
+def test_snapshot_columns_are_owned_and_truncation_is_detected(tmp_path):
+    kg = PersistentKnowledgeGraph(str(tmp_path), snapshot_every=0)
+    _fill(kg, 0, 5)
+    kg.snapshot()
+    kg.close()
+
+    snapshot = read_snapshot(str(tmp_path / "snapshot.bin"))[0]
+    snapshot.add_node("agent:0", "Result 99", timestamp="2026-10-19T10:01:00+00:00")
+    assert snapshot.get_node("result 99")["agent_ids"] == {"agent:0"}
+
+    data = (tmp_path / "snapshot.bin").read_bytes()
+    (tmp_path / "snapshot.bin").write_bytes(data[:-8])
+    with pytest.raises(ValueError, match="truncated"):
+        read_snapshot(str(tmp_path / "snapshot.bin"))
+
+
+def test_hard_exit_loses_no_logged_writes(tmp_path):
+    script = textwrap.dedent(f"""
+        import os
+        from memory.memory_module import SharedMemory
+        from memory.memory_types import Defaults
+
+        class Policy(Defaults):
+            KG_PERSIST_DIR = {str(tmp_path)!r}
+
+        sm = SharedMemory(policy=Policy)
+        for i in range(200):
+            sm.write("alice", f"note {{i}}")
+        os._exit(0)  # no close(), no flush, no atexit
+    """)
+    subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).resolve().parent.parent, check=True)
+
+    reloaded = PersistentKnowledgeGraph(str(tmp_path), snapshot_every=0)
+    assert reloaded.replayed == 200
+    assert all(f"note {i}" in reloaded for i in range(200))
+    reloaded.close()
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+import orchestrator.plan_cache as pc
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+from orchestrator.plan_cache import PlanCache
+from orchestrator.planner import LLMPlanner
+from systems.llm_client import LLMClient
+from systems.llm_stub import StubLLMServer
+
+PLAN = {"subtasks": [
+    {"task": "Collect metrics", "agent": "executor", "confidence": 0.9},
+    {"task": "Analyze metrics", "agent": "analyst", "confidence": 0.8},
+]}
+
+
+@pytest.fixture
+def server():
+    with StubLLMServer(respond=lambda messages, body: json.dumps(PLAN)) as s:
+        s.llm = LLMClient(base_url=s.base_url, api_key="stub")
+        yield s
+        s.llm.close()
+
+
+def _planner(server, cache, memory=None):
+    return LLMPlanner(memory=memory, model="stub-model", llm=server.llm, cache=cache)
+
+
+def test_plans_persist_across_processes(server, tmp_path):
+    path = str(tmp_path / "plans.sqlite")
+    first = _planner(server, PlanCache(path))
+    plan = first.decompose("Analyze performance metrics")
+    assert [t["task"] for t in plan] == ["Collect metrics", "Analyze metrics"]
+    assert first.decompose("  analyze PERFORMANCE metrics ") == plan
+    assert len(server.requests) == 1
+    first.cache.close()
+
+    # A new cache on the same file is what the next run sees
+    second = _planner(server, PlanCache(path))
+    assert second.decompose("Analyze performance metrics") == plan
+    assert len(server.requests) == 1
+    stats = second.cache_stats()
+    assert stats["hits"] == 1 and stats["saved_ms"] > 0
+
+
+def test_context_and_model_are_part_of_the_key(server):
+    cache = PlanCache()
+    memory = SharedMemory()
+    planner = _planner(server, cache, memory)
+    planner.decompose("Analyze performance metrics")
+    memory.write("orchestrator", "Execution results: ward 3 failed")
+    planner.decompose("Analyze performance metrics")
+    assert len(server.requests) == 2
+    assert cache.get("Analyze performance metrics", "other-model") is None
+
+
+def test_ttl_lru_and_fuzzy(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(pc.time, "time", lambda: clock[0])
+    cache = PlanCache(ttl_seconds=60, max_entries=2, fuzzy_threshold=0.85)
+    cache.put("goal a", "m", "", [{"task": "a"}])
+    cache.put("goal b", "m", "", [{"task": "b"}])
+    clock[0] += 1
+    assert cache.get("goal a", "m") == [{"task": "a"}]
+    clock[0] += 1
+    cache.put("goal c", "m", "", [{"task": "c"}])
+    # b was least recently used
+    assert cache.get("goal b", "m") is None and len(cache) == 2
+
+    assert cache.get("goal c!", "m") == [{"task": "c"}]
+    assert cache.stats["fuzzy_hits"] == 1
+    assert cache.get("something else", "m") is None
+
+    clock[0] += 61
+    assert cache.get("goal a", "m") is None
+    assert cache.stats["expired"] == 2 and cache.stats["evictions"] == 1
+
+
+def test_hit_rate_reaches_orchestrator_profile(server, tmp_path):
+    path = str(tmp_path / "plans.sqlite")
+    for _ in range(2):
+        # Fresh memory per run, so the prompt context matches across runs
+        memory = SharedMemory()
+        orch = Orchestrator(None, memory)
+        orch.planner.use_llm = True
+        orch.planner.llm_planner = _planner(server, PlanCache(path), memory)
+        orch.plan("Analyze performance metrics")
+    assert len(server.requests) == 1
+    assert orch.profiler.metrics["plan_cache_hit_rate"] == [1.0]
+    assert orch.profiler.metrics["plan_cache_saved_ms"][0] > 0
@@ -0,0 +1,78 @@
+import asyncio
+import os
+
+import pytest
+
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from systems.async_runtime import AsyncRuntime
+from systems.process_agents import ProcessAgentRunner
+
+
+class CrunchAgent(BaseAgent):
+    cpu_bound = True
+
+    def __init__(self, name, role, memory):
+        super().__init__(name, role, memory)
+        self.tasks_done = 0
+
+    def act(self, task):
+        if task == "bad":
+            self.reflect("about to fail")
+            raise ValueError("bad task")
+        total = sum(i * i for i in range(20000))
+        self.tasks_done += 1
+        self.reflect(f"crunched {task}")
+        return {"pid": os.getpid(), "n": self.tasks_done, "total": total, "inputs": dict(self.inputs)}
+
+
+class LightAgent(BaseAgent):
+    def act(self, task):
+        return {"pid": os.getpid(), "task": task}
+
+
+def factory(name, memory):
+    # Module level, so worker processes can unpickle it
+    return CrunchAgent(name, "cpu", memory) if name == "crunch" else LightAgent(name, "light", memory)
+
+
+@pytest.fixture
+def runner():
+    memory = SharedMemory()
+    runner = ProcessAgentRunner(["crunch"], memory, processes=1, factory=factory)
+    yield runner
+    runner.close()
+
+
+def test_cpu_agents_run_in_a_long_lived_worker_and_ship_writes_back(runner):
+    rt = AsyncRuntime(max_concurrent=2, processes=runner)
+    plan = [
+        {"task": "load", "agent": "light"},
+        {"task": "c1", "agent": "crunch", "depends_on": ["load"]},
+        {"task": "c2", "agent": "crunch", "depends_on": ["c1"]},
+        {"task": "bad", "agent": "crunch"},
+    ]
+    results = asyncio.run(rt.run_dag(plan, lambda name: factory(name, runner.memory)))
+    light, c1, c2, bad = results
+    assert light["result"]["pid"] == os.getpid()
+    assert c1["status"] == "success" and c1["result"]["pid"] != os.getpid()
+    assert c1["result"]["inputs"] == {"load": light["result"]}
+    # Same worker, same agent instance: state carries over between tasks
+    assert c2["result"]["pid"] == c1["result"]["pid"] and c2["result"]["n"] == 2
+    assert bad["status"] == "error" and "bad task" in bad["result"]["error"]
+
+    recent = [m["content"] for m in runner.memory.get_recent("crunch", 10)]
+    assert any("crunched c1" in c for c in recent) and any("crunched c2" in c for c in recent)
+    # The failed task's writes are dropped with it
+    assert not any("about to fail" in c for c in recent)
+    assert runner.stats["tasks"] == 3 and runner.stats["write_batches"] == 2
+
+
+def test_orchestrator_builds_runner_from_env(monkeypatch):
+    monkeypatch.setenv("MYNDRA_CPU_AGENTS", "analyst")
+    from orchestrator.orchestrator import Orchestrator
+    orch = Orchestrator(None, SharedMemory())
+    assert orch.runtime.processes.handles("AnalystAgent")
+    assert not orch.runtime.processes.handles("DataAgent")
+    monkeypatch.setenv("MYNDRA_AGENT_PROCESSES", "0")
+    assert Orchestrator(None, SharedMemory()).runtime.processes is None
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults
+from memory.query_cache import QueryCache
+
+
+def _policy(**overrides):
+    return type("Policy", (Defaults,), overrides)
+
+
+def test_cached_retrieve_matches_uncached_under_random_workload():
+    rng = random.Random(7)
+    cached = SharedMemory(policy=_policy(RETRIEVE_CACHE_VERIFY=True, RETRIEVE_CACHE_SIZE=16, SEM_RETRIEVAL=True))
+    plain = SharedMemory(policy=_policy(RETRIEVE_CACHE_SIZE=0, SEM_RETRIEVAL=True))
+    words = ["pneumonia", "xray", "task3", "ward", "flagged", "ok", "Chest"]
+    for _ in range(600):
+        agent = f"a{rng.randrange(4)}"
+        if rng.random() < 0.3:
+            text = " ".join(rng.choice(words) for _ in range(3))
+            context = rng.choice([None, "ctx 1", "ctx 2"])
+            for sm in (cached, plain):
+                sm.write(agent, text, context)
+        else:
+            q = rng.choice(words + ["agent", "x", "ward ok"])
+            # verify mode raises on any cached/fresh divergence
+            assert cached.retrieve(agent, q) == plain.retrieve(agent, q)
+    stats = cached.cache_stats()
+    assert stats["hits"] > 0 and stats["stale"] > 0 and stats["size"] <= 16
+
+
+def test_invalidation_is_per_agent_and_full_kg_buckets_survive_adds():
+    sm = SharedMemory()
+    for i in range(6):
+        sm.write("alice", f"scan {i} reviewed")
+    sm.retrieve("alice", "scan")
+    sm.retrieve("bob", "scan")
+    sm.write("bob", "unrelated note")
+    sm.retrieve("alice", "scan")  # alice untouched, KG bucket already full
+    assert sm.cache_stats()["hits"] == 1
+    sm.retrieve("bob", "scan")  # bob's own write invalidates his entry
+    assert sm.cache_stats()["stale"] == 1
+
+
+def test_entries_expire_at_day_boundaries(monkeypatch):
+    import memory.memory_module as mm
+    sm = SharedMemory()
+    sm.write("alice", "scan reviewed")
+    # Episodic search takes the stored (prefixed) id; its hit carries the age boundary
+    first = sm.retrieve("agent:alice", "scan")
+    real = mm.time.time
+    monkeypatch.setattr(mm.time, "time", lambda: real() + 86400 * 1.01)
+    assert sm.retrieve("agent:alice", "scan") == first
+    assert sm.cache_stats()["hits"] == 0 and sm.cache_stats()["stale"] == 1
+
+
+def test_query_cache_lru_eviction_and_hit_rate():
+    cache = QueryCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a", lambda v: True) == 1
+    cache.put("c", 3)  # evicts b, the least recently used
+    assert cache.get("b", lambda v: True) is None
+    assert cache.stats == {"hits": 1, "misses": 1, "stale": 0, "evictions": 1, "size": 2, "hit_rate": 0.5}
+    with pytest.raises(ValueError):
+        QueryCache(0)
@@ -0,0 +1,124 @@
+import asyncio
+import time
+
+import pytest
+
+from agents.agent_registry import get_agent
+from agents.radiology_agent import RadiologyAgent
+from backend.services.inference_queue import InferenceQueue
+from backend.services.orchestrated_runner import OrchestratedRunner
+from memory.memory_module import SharedMemory
+from systems.tracing import get_tracer
+
+
+def fake_model(diagnosis, probability, delay=0.0):
+    def predict(image_path):
+        time.sleep(delay)
+        if image_path == "corrupt.png":
+            raise ValueError("cannot decode image")
+        return {"diagnosis": diagnosis, "probability": probability, "steps": [], "image": image_path}
+    return predict
+
+
+def test_registered_agent_runs_the_given_pipeline():
+    memory = SharedMemory()
+    agent = get_agent("radiology", memory)
+    assert isinstance(agent, RadiologyAgent) and agent.role == "Radiologist"
+
+    agent = RadiologyAgent("RadiologyAgent", "Radiologist", memory,
+                           runners={"pneumonia": fake_model("Pneumonia", 0.91)})
+    report = agent.act({"analysis": "pneumonia", "image_path": "a.png"})
+    assert report["diagnosis"] == "Pneumonia" and report["image"] == "a.png"
+    assert "pneumonia: Pneumonia (p=0.91)" in memory.get_recent("RadiologyAgent")[-1]["content"]
+    with pytest.raises(ValueError, match="Unknown analysis"):
+        agent.act({"analysis": "fracture", "image_path": "a.png"})
+    with pytest.raises(ValueError, match="needs an"):
+        agent.act("Review the chest film")
+
+
+def test_orchestrated_dual_runs_both_models_at_once_and_surfaces_failures():
+    runner = OrchestratedRunner(runners={
+        "pneumonia": fake_model("Normal", 0.12, delay=0.1),
+        "cardiomegaly": fake_model("Cardiomegaly", 0.8, delay=0.1),
+    })
+    try:
+        start = time.perf_counter()
+        dual = runner.run_dual("a.png")
+        assert time.perf_counter() - start < 0.18
+        assert dual["orchestrated"]["summary"] == "Normal (p=0.12), Cardiomegaly (p=0.80)"
+
+        reports = runner.run_pneumonia_batch(["a.png", "b.png"])
+        assert [r["image"] for r in reports] == ["a.png", "b.png"]
+        with pytest.raises(RuntimeError, match="pneumonia task error: cannot decode image"):
+            runner.run_pneumonia("corrupt.png")
+    finally:
+        runner.close()
+
+
+def test_queued_orchestrated_run_joins_the_case_trace():
+    tracer = get_tracer()
+    runner = OrchestratedRunner(runners={"pneumonia": fake_model("Normal", 0.2)})
+    queue = InferenceQueue(workers=1)
+
+    async def analyze():
+        with tracer.span("inference", trace_id="case-42"):
+            return await queue.run(runner.run_pneumonia, "a.png")
+
+    try:
+        assert asyncio.run(analyze())["diagnosis"] == "Normal"
+    finally:
+        queue.stop()
+        runner.close()
+    spans = {e["name"]: e for e in tracer.events(trace_id="case-42") if e["kind"] == "span"}
+    assert spans["task"]["parent_id"] == spans["inference"]["span_id"]
+    assert spans["task"]["fields"]["agent"] == "RadiologyAgent"
+    assert spans["task"]["fields"]["status"] == "success"
+
+
+def test_batched_cases_each_get_their_own_task_span():
+    import threading
+    from functools import partial
+    tracer = get_tracer()
+    runner = OrchestratedRunner(runners={"pneumonia": fake_model("Normal", 0.2)})
+    queue = InferenceQueue(workers=1, max_batch=4)
+    queue.register_batch_handler("pneumonia", partial(runner.run_jobs, "pneumonia"), pass_context=True)
+    gate = threading.Event()
+    queue.submit(lambda _: gate.wait(5), None)  # park the worker so the cases batch up
+
+    async def analyze(case_id):
+        with tracer.span("inference", trace_id=case_id):
+            return await queue.run(runner.run_pneumonia, f"{case_id}.png", batch_key="pneumonia")
+
+    async def main():
+        cases = [asyncio.ensure_future(analyze(f"case-b{i}")) for i in range(3)]
+        await asyncio.sleep(0.05)
+        gate.set()
+        return await asyncio.gather(*cases)
+
+    try:
+        reports = asyncio.run(main())
+    finally:
+        queue.stop()
+        runner.close()
+    assert [r["image"] for r in reports] == ["case-b0.png", "case-b1.png", "case-b2.png"]
+    for i in range(3):
+        spans = {e["name"]: e for e in tracer.events(trace_id=f"case-b{i}") if e["kind"] == "span"}
+        assert spans["task"]["fields"]["task"]["image_path"] == f"case-b{i}.png"
+        assert spans["task"]["parent_id"] == spans["inference"]["span_id"]
+        assert len([e for e in tracer.events(trace_id=f"case-b{i}") if e["name"] == "task"]) == 1
+
+
+def test_orchestrated_run_gives_up_after_the_task_deadlines():
+    runner = OrchestratedRunner(runners={"pneumonia": fake_model("Normal", 0.2)}, task_timeout_s=0.05)
+    runner.wait_grace_s = 0.05
+    try:
+        assert runner.wait_timeout_s("dual", ["a.png", "b.png", "c.png"]) == pytest.approx(2 * 0.05 + 0.05)
+        # Wedge the loop thread so the plan cannot even start
+        loop = runner._ensure_loop()
+        loop.call_soon_threadsafe(time.sleep, 0.5)
+        start = time.perf_counter()
+        with pytest.raises(RuntimeError, match="did not finish within 0.1s"):
+            runner.run_pneumonia("a.png")
+        assert time.perf_counter() - start < 0.4
+    finally:
+        runner.close()
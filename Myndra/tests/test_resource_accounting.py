@@ -0,0 +1,26 @@
+from backend.services.resource_accounting import ResourceAccountant
+
+
+def _alloc(n):
+    blob = [bytearray(1024) for _ in range(n)]
+    return {"diagnosis": "Normal", "size": len(blob)}
+
+
+def test_disabled_is_passthrough():
+    acct = ResourceAccountant(enabled=False)
+    result = acct.measure("pneumonia", _alloc, 10)
+    assert "resources" not in result
+    acct.record("c0", "pneumonia", None)
+    assert acct.summary() == {"enabled": False}
+
+
+def test_enabled_records_usage_and_aggregates():
+    acct = ResourceAccountant(enabled=True, tracemalloc_rate=1.0)
+    result = acct.measure("pneumonia", _alloc, 2000)
+    usage = result["resources"]["pneumonia"]
+    assert usage["wall_ms"] >= 0.0
+    assert usage["tracemalloc_peak_kb"] >= 2000
+    acct.record("c0", "pneumonia", result.pop("resources"))
+    summary = acct.summary()["by_type"]["pneumonia"]
+    assert summary["count"] == 1 and summary["traced"] == 1
+    assert summary["heaviest_cases"][0]["case_id"] == "c0"
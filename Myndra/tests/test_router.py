@@ -0,0 +1,64 @@
+from agents.agent_registry import AgentPool
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+from orchestrator.router import AgentRouter
+from systems.async_runtime import AsyncRuntime
+
+
+def _legacy_rule(task):
+    task = task.lower()
+    if "data" in task or "gather" in task:
+        return "DataAgent"
+    if "analyze" in task or "pattern" in task:
+        return "AnalystAgent"
+    if "summarize" in task or "report" in task:
+        return "SummarizerAgent"
+    return "GeneralAgent"
+
+
+def test_cold_router_matches_keyword_rules():
+    router = AgentRouter(pool=AgentPool(SharedMemory(), size=4), runtime=AsyncRuntime(4))
+    tasks = ["Gather data", "Analyze patterns in the data", "Write REPORT", "Summarize; analyze",
+             "Plan the rollout", "databases"]
+    assert [router.route(t) for t in tasks] == [_legacy_rule(t) for t in tasks]
+    assert router.route("Analyze metrics", hint="executor") == "GeneralAgent"
+    assert router.route("anything", hint="nonexistent") == "nonexistent"
+    assert router.keyword_matches("summarize the data patterns") == ["DataAgent", "AnalystAgent", "SummarizerAgent"]
+
+
+def test_load_and_latency_shift_work_to_the_faster_candidate():
+    runtime = AsyncRuntime(8)
+    router = AgentRouter(pool=AgentPool(SharedMemory(), size=2), runtime=runtime)
+    router.observe([{"agent": "AnalystAgent", "status": "success", "duration_ms": 100.0},
+                    {"agent": "GeneralAgent", "status": "success", "duration_ms": 100.0}])
+
+    # Two analysts fill the pool; the third analysis would queue behind them
+    planned = {}
+    routed = [router.route(f"Analyze ward {i}", planned=planned) for i in range(3)]
+    assert routed == ["AnalystAgent", "AnalystAgent", "GeneralAgent"]
+
+    # Live runtime load counts as well
+    runtime.load["AnalystAgent"] = 2
+    assert router.route("Analyze ward 9") == "GeneralAgent"
+    runtime.load["AnalystAgent"] = 0
+
+    # A slow, failing type loses even without load
+    for _ in range(5):
+        router.observe([{"agent": "DataAgent", "status": "error", "duration_ms": 400.0}])
+    assert router.route("Gather data") == "GeneralAgent"
+    assert router.stats["DataAgent"]["success_rate"] < 0.5
+
+
+def test_keyword_mode_and_orchestrator_feedback(monkeypatch):
+    monkeypatch.setenv("MYNDRA_ROUTING", "keyword")
+    orch = Orchestrator(None, SharedMemory(), max_concurrent=2)
+    assert not orch.router.adaptive
+    orch.router.observe([{"agent": "AnalystAgent", "status": "success", "duration_ms": 1e6}])
+    plan = [{"task": f"Analyze ward {i}", "agent": "analyst"} for i in range(4)]
+    assert {a["agent"] for a in orch.assign(plan)} == {"AnalystAgent"}
+
+    monkeypatch.setenv("MYNDRA_ROUTING", "adaptive")
+    orch = Orchestrator(None, SharedMemory(), max_concurrent=2)
+    orch.execute(orch.assign([{"task": "Analyze ward 0"}]))
+    assert orch.router.stats["AnalystAgent"]["latency_ms"] is not None
+    assert orch.runtime.load == {"AnalystAgent": 0}
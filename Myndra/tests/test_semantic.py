@@ -0,0 +1,65 @@
+import numpy as np
+
+from memory.memory_module import SharedMemory
+from memory.memory_types import Defaults
+from memory.semantic import HashedNgramEncoder, SemanticIndex
+
+
+def test_encoder_is_deterministic_and_normalized():
+    enc = HashedNgramEncoder(dim=64)
+    a, b = enc.encode("Chest X-ray shows pneumonia"), HashedNgramEncoder(dim=64).encode("chest  x-ray SHOWS pneumonia")
+    assert a.dtype == np.float32 and np.allclose(a, b)
+    assert abs(np.linalg.norm(a) - 1.0) < 1e-5
+    assert not enc.encode("   ").any()
+
+
+def test_search_ranks_paraphrase_and_isolates_agents():
+    idx = SemanticIndex(dim=256, chunk=4, min_score=0.1)
+    for i, text in enumerate(["Reviewed pneumonia findings on chest xray",
+                              "Scheduled billing export for finance",
+                              "Cardiomegaly score computed for patient 7"]):
+        idx.add("agent:alice", text, created=1000.0 + i)
+    idx.add("agent:bob", "Reviewing chest x-ray pneumonia", created=1000.0)
+    hits = idx.search("agent:alice", "reviewing chest x-ray for pneumonia", top_k=2, now=1000.0 + 86400)
+    assert hits[0][0] == "Reviewed pneumonia findings on chest xray"
+    assert hits[0][2] > 0.99  # age in days
+    assert all(text != "Reviewing chest x-ray pneumonia" for text, _, _ in hits)
+
+
+def test_growth_keeps_rows_and_dedupes_text():
+    idx = SemanticIndex(dim=32, chunk=3, min_score=-1.0)
+    for i in range(10):
+        idx.add("agent:a", f"note {i}", created=float(i))
+    idx.add("agent:a", "note 4", created=99.0)
+    assert len(idx) == 10
+    top = idx.search("agent:a", "note 4", top_k=1, now=99.0)
+    assert top == [("note 4", top[0][1], 0.0)] and top[0][1] > 0.99
+
+
+def test_store_is_capped_and_evicts_least_recently_written():
+    idx = SemanticIndex(dim=32, chunk=2, min_score=-1.0, max_per_agent=3)
+    for i in range(3):
+        idx.add("agent:a", f"note {i}", created=float(i))
+    idx.add("agent:a", "note 0", created=10.0)  # refreshed, so note 1 is now the oldest
+    idx.add("agent:a", "note 3", created=11.0)
+    store = idx._stores["agent:a"]
+    assert len(idx) == 3 and len(store.mat) == 3 and store.evicted == 1
+    assert sorted(store.rows) == ["note 0", "note 2", "note 3"]
+    assert idx.search("agent:a", "note 3", top_k=1, now=11.0)[0][0] == "note 3"
+
+
+def test_semantic_retrieval_is_opt_in():
+    assert SharedMemory().semantic is None
+
+
+def test_retrieve_blends_semantic_hits():
+    class Policy(Defaults):
+        SEM_RETRIEVAL = True
+
+    sm = SharedMemory(policy=Policy)
+    sm.write("alice", "Reviewed pneumonia findings on chest xray")
+    sm.write("alice", "Exported the billing ledger")
+    texts = [r["content"] for r in sm.retrieve("alice", "reviewing x-ray pneumonia")]
+    # No substring match exists, so only the semantic layer can surface it
+    assert texts[0] == "Reviewed pneumonia findings on chest xray"
+    assert "Exported the billing ledger" not in texts
@@ -15,3 +15,117 @@ def test_get_recent_passthrough():
     sm.write("bob", "second", "ctx")
     recents = sm.get_recent("bob", n=1)
     assert recents[0]["content"] == "second"
+
+def _async_policy():
+    from memory.memory_types import Defaults
+
+    class Policy(Defaults):
+        WRITE_MODE = "async"
+    return Policy
+
+def test_async_writes_visible_after_barrier():
+    import threading
+    sm = SharedMemory(policy=_async_policy())
+    def worker(i):
+        for j in range(50):
+            sm.write(f"w{i}", f"step {j} of task{i}")
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # get_recent flushes first, so every write above is visible
+    assert sm.get_recent("w3", n=1)[0]["content"] == "step 49 of task3"
+    assert sm.writer_stats()["writes"] == 200
+    sm.close()
+
+def test_async_lazy_text_and_error_surfacing():
+    import pytest
+    from memory.memory_types import LazyText
+    calls = []
+    class Probe:
+        def __repr__(self):
+            calls.append(1)
+            return "<probe>"
+    sm = SharedMemory(policy=_async_policy())
+    sm.write("orchestrator", LazyText("Execution results: {}", [Probe()]))
+    sm.flush()
+    assert calls == [1]
+    assert sm.get_recent("orchestrator")[0]["content"] == "Execution results: [<probe>]"
+    sm.write("orchestrator", None)  # fails on the writer thread ...
+    with pytest.raises(TypeError):
+        sm.flush()                  # ... and is re-raised at the barrier
+    sm.close()
+
+def test_async_write_error_is_not_raised_to_readers():
+    import pytest
+    sm = SharedMemory(policy=_async_policy())
+    sm.write("bob", None)  # fails on the writer thread
+    sm.write("alice", "scan reviewed")
+    # Reads still see every applied write and never get bob's failure
+    assert sm.get_recent("alice")[0]["content"] == "scan reviewed"
+    assert sm.retrieve("agent:alice", "scan") == [{"content": "scan reviewed"}]
+    with pytest.raises(TypeError):
+        sm.flush()
+    sm.flush()  # reported once
+    sm.close()
+
+def test_async_lazy_text_snapshots_mutable_args():
+    from memory.memory_types import LazyText
+    sm = SharedMemory(policy=_async_policy())
+    results = [{"task": "task1", "status": "success"}]
+    sm.write("orchestrator", LazyText("Execution results: {}", results))
+    results[0]["status"] = "failed"  # caller keeps using its objects
+    results.append({"task": "task2"})
+    sm.flush()
+    assert sm.get_recent("orchestrator")[0]["content"] == (
+        "Execution results: [{'task': 'task1', 'status': 'success'}]"
+    )
+    sm.close()
+
+def test_concurrent_writes_and_reads_stay_consistent():
+    import threading
+    from memory.memory_types import Defaults
+
+    class Policy(Defaults):
+        EP_MAX_LENGTH = 20
+        LOCK_STRIPES = 4  # few stripes so agents share locks too
+
+    sm = SharedMemory(policy=Policy)
+    errors = []
+
+    def worker(i):
+        try:
+            for j in range(300):
+                sm.write(f"w{i % 6}", f"w{i} step {j} of task{j % 25}", f"run {j % 9}")
+                sm.retrieve(f"w{(i + 1) % 6}", "step")
+                sm.long_term.get_related(f"run {j % 9}")
+        except Exception as e:  # surfaced below; a thread exception would otherwise vanish
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    g = sm.long_term.graph
+    assert sorted(sm.long_term.index.nodes) == sorted(g)
+    assert all(g.has_edge(u, v) for v, preds in g.pred.items() for u in preds)
+    for ring in sm.short_term.memory.values():
+        assert len(ring) == 20 and ring.search("step") == ring.scan("step") == list(ring.seqs())
+
+def test_writes_trigger_incremental_kg_pruning():
+    from memory.memory_types import Defaults
+
+    class Policy(Defaults):
+        KG_MAX_NODES = 8
+        KG_PRUNE_EVERY = 4
+        KG_PRUNE_BUDGET_MS = 50.0
+
+    sm = SharedMemory(policy=Policy)
+    for i in range(40):
+        sm.write("carol", f"finding {i}", "ward")
+    assert sm.long_term.graph.number_of_nodes() <= 8 + 4 * 2
+    assert sm.long_term.prune_stats["steps"] == 10
+    assert "finding 39" in sm.long_term.graph
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import time
+
+from agents.agent_registry import AgentPool
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+from orchestrator.planner import LLMPlanner
+from orchestrator.stream_parser import SubtaskStreamParser
+from systems.async_runtime import AsyncRuntime
+from systems.llm_client import LLMClient
+from systems.llm_stub import StubLLMServer
+
+PLAN = {"subtasks": [
+    {"task": "Collect {ward} \"metrics\"", "agent": "executor", "confidence": 0.9, "depends_on": []},
+    {"task": "Analyze metrics", "agent": "analyst", "confidence": 0.8,
+     "depends_on": ["Collect {ward} \"metrics\""]},
+    {"task": "Review protocols", "agent": "general", "confidence": 0.7, "depends_on": []},
+]}
+
+
+class StampAgent(BaseAgent):
+    starts = []
+
+    def act(self, task):
+        StampAgent.starts.append((task, time.perf_counter()))
+        return f"done: {task}"
+
+
+def test_parser_emits_each_element_at_any_chunk_boundary():
+    text = "```json\n" + json.dumps(PLAN) + "\n```"
+    for cut in range(1, len(text)):
+        parser = SubtaskStreamParser()
+        assert parser.feed(text[:cut]) + parser.feed(text[cut:]) == PLAN["subtasks"]
+        assert parser.done
+
+    parser = SubtaskStreamParser()
+    items = [parser.feed(ch) for ch in '["a, [b]", {"task": "c\\"}"}]']
+    assert [i for chunk in items for i in chunk] == ["a, [b]", {"task": 'c"}'}]
+
+
+def test_client_streams_deltas():
+    with StubLLMServer(respond=lambda m, b: "x" * 50, chunk_chars=10) as server:
+        llm = LLMClient(base_url=server.base_url, api_key="stub")
+
+        async def collect():
+            return [d async for d in llm.astream([{"role": "user", "content": "hi"}], model="m")]
+
+        assert asyncio.run(collect()) == ["x" * 10] * 5
+        assert server.requests[0]["stream"] is True and llm.stats["ok"] == 1
+        llm.close()
+
+
+def test_streaming_run_starts_tasks_while_plan_is_generated():
+    with StubLLMServer(respond=lambda m, b: json.dumps(PLAN), chunk_chars=8, chunk_latency_s=0.01) as server:
+        llm = LLMClient(base_url=server.base_url, api_key="stub")
+        memory = SharedMemory()
+        orch = Orchestrator(None, memory, stream_plan=True)
+        orch.agents = AgentPool(memory, size=4, factory=lambda name, mem: StampAgent(name, "test", mem))
+        orch.planner.use_llm = True
+        orch.planner.llm_planner = LLMPlanner(memory=memory, model="m", llm=llm, cache=False)
+
+        StampAgent.starts = []
+        report = asyncio.run(orch.arun("Analyze ward metrics"))
+        stream_end = time.perf_counter()
+        llm.close()
+
+    tasks = [t["task"] for t in PLAN["subtasks"]]
+    assert [s["task"] for s in report["subtasks"]] == tasks
+    assert [r["status"] for r in report["results"]] == ["success"] * 3
+    # Upstream output still reaches the dependent task
+    assert report["results"][1]["inputs"] == {tasks[0]: f"done: {tasks[0]}"}
+    started = {task: t for task, t in StampAgent.starts if isinstance(task, str)}
+    # ~0.2s of generation: the first task runs long before the last chunk
+    assert stream_end - started[tasks[0]] > 0.1
+    metrics = orch.profiler.metrics
+    assert metrics["time_to_first_task_ms"][0] < metrics["plan_execute_latency"][0] / 2
+
+
+def test_stream_dependencies_only_resolve_backwards():
+    async def arrivals():
+        yield {"task": "a", "agent": "x", "depends_on": ["b"]}
+        yield {"task": "b", "agent": "x", "depends_on": ["a", 0]}
+
+    rt = AsyncRuntime(max_concurrent=2)
+    results = asyncio.run(rt.run_dag_stream(arrivals(), lambda name: StampAgent(name, "test", None)))
+    assert [r["status"] for r in results] == ["success", "success"]
+    assert rt.last_schedule["unresolved_deps"] == [("a", "b")]
+    assert rt.last_schedule["critical_path"] == ["a", "b"]
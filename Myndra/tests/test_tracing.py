@@ -0,0 +1,105 @@
+import asyncio
+import json
+
+from agents.agent_registry import AgentPool
+from agents.base_agent import BaseAgent
+from memory.memory_module import SharedMemory
+from orchestrator.orchestrator import Orchestrator
+from systems.tracing import Tracer
+
+
+class LoggingAgent(BaseAgent):
+    def act(self, task):
+        # Runs on a worker thread; the event should still land under its task span
+        self.tracer.log("{} did {}", self.name, task)
+        return task
+
+
+class Expensive:
+    formatted = 0
+
+    def __str__(self):
+        Expensive.formatted += 1
+        return "expensive"
+
+
+def test_spans_nest_across_tasks_and_ring_buffer_is_bounded(capsys):
+    tracer = Tracer(capacity=50, quiet=True)
+
+    async def child(i):
+        with tracer.span("child", i=i):
+            await asyncio.sleep(0.001)
+            tracer.log("child {} {}", i, Expensive())
+
+    async def main():
+        with tracer.span("root", trace_id="case-1") as root:
+            await asyncio.gather(child(0), child(1))
+            root["status"] = "done"
+
+    asyncio.run(main())
+    events = tracer.events(trace_id="case-1")
+    (root,) = [e for e in events if e["name"] == "root"]
+    children = [e for e in events if e["name"] == "child"]
+    logs = [e for e in events if e["kind"] == "log"]
+    assert root["fields"] == {"status": "done"}
+    assert {c["parent_id"] for c in children} == {root["span_id"]}
+    assert {l["parent_id"] for l in logs} == {c["span_id"] for c in children}
+    assert all(c["duration_ms"] >= 1 for c in children)
+    # Quiet: nothing printed, and the message was only built by events() above
+    assert capsys.readouterr().out == ""
+    assert Expensive.formatted == 2
+
+    for i in range(100):
+        tracer.log("filler {}", i)
+    assert len(tracer.events()) == 50 and tracer.events(trace_id="case-1") == []
+
+
+def test_exports_and_errors(tmp_path):
+    tracer = Tracer(quiet=True)
+    try:
+        with tracer.span("work", trace_id="t"):
+            tracer.log("about to fail", level="warning")
+            raise ValueError("boom")
+    except ValueError:
+        pass
+
+    tracer.save_jsonl(str(tmp_path / "trace.jsonl"), trace_id="t")
+    rows = [json.loads(line) for line in (tmp_path / "trace.jsonl").read_text().splitlines()]
+    assert [r["kind"] for r in rows] == ["log", "span"]
+    assert rows[1]["fields"] == {"status": "error", "error": "boom"}
+
+    tracer.save_chrome(str(tmp_path / "trace.json"))
+    chrome = json.loads((tmp_path / "trace.json").read_text())
+    phases = [e["ph"] for e in chrome["traceEvents"]]
+    assert phases == ["b", "i", "e"]
+    begin, _, end = chrome["traceEvents"]
+    assert begin["id"] == end["id"] == "t" and end["ts"] >= begin["ts"]
+
+
+def test_orchestrator_run_is_one_trace_and_quiet_mode_is_silent(capsys):
+    memory = SharedMemory()
+    orch = Orchestrator(None, memory, max_concurrent=2)
+    orch.tracer = orch.runtime.tracer = tracer = Tracer(quiet=True)
+
+    def factory(name, mem):
+        agent = LoggingAgent(name, "test", mem)
+        agent.tracer = tracer
+        return agent
+
+    orch.agents = AgentPool(memory, size=2, factory=factory)
+    capsys.readouterr()
+    report = orch.run("analyze ward 3")
+    assert capsys.readouterr().out == ""
+
+    events = tracer.events(trace_id=report["trace_id"])
+    spans = {e["span_id"]: e for e in events if e["kind"] == "span"}
+    names = [e["name"] for e in spans.values()]
+    for phase in ("goal", "total_run", "plan", "assign", "execute", "adapt", "summarize"):
+        assert phase in names
+    tasks = [e for e in spans.values() if e["name"] == "task"]
+    assert len(tasks) == len(report["results"])
+    assert all(spans[t["parent_id"]]["name"] == "execute" for t in tasks)
+    assert all(t["fields"]["status"] == "success" for t in tasks)
+    # Agent logs from worker threads nest under their task span (the summarizer's under its phase)
+    agent_logs = [e for e in events if e["kind"] == "log" and " did " in e["message"]]
+    assert {spans[l["parent_id"]]["name"] for l in agent_logs} == {"task", "summarize"}